@@ -0,0 +1,130 @@
+# synthetic BankDashboard pages served from a local HTTP server
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+LAYOUTS = ["homepage1", "homepage2"]
+
+_MERCHANTS = [
+    "Spotify Subscription", "Freepik Sales", "Mobile Service", "Emilly Wilson",
+    "Grocery Store", "Coffee Shop", "Rent", "Salary", "Electricity Bill", "Gym Membership",
+]
+_CATEGORIES = ["Subscription", "Sales", "Verizon", "Transfer", "Food", "Housing", "Income", "Utilities"]
+
+def _rows(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        sign = "+" if rng.random() < 0.3 else "-"
+        amount = f"{sign}${rng.randint(1, 5000):,}.{rng.randint(0, 99):02d}"
+        date = f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/20{rng.randint(19, 24)}"
+        yield i, rng.choice(_MERCHANTS), rng.choice(_CATEGORIES), amount, date
+
+def homepage1_html(count, seed=0):
+    """
+    homepage1-style dashboard: div rows with transaction-N-name/-date/-amount ids
+    inside a shadow-neumorphism container.
+    """
+    rows = "".join(
+        f'<div id="transaction-{i}" class="flex justify-between">'
+        f'<div id="transaction-{i}-name">{name}</div>'
+        f'<div id="transaction-{i}-date">{date}</div>'
+        f'<div id="transaction-{i}-amount">{amount}</div></div>'
+        for i, name, _, amount, date in _rows(count, seed)
+    )
+    return (
+        "<html><head><title>Dashboard</title></head><body>"
+        '<h1 class="text-2xl font-semibold">Dashboard</h1>'
+        f'<div class="shadow-neumorphism rounded-xl">{rows}</div>'
+        "</body></html>"
+    )
+
+def homepage2_html(count, seed=0):
+    """
+    homepage2-style dashboard: one ul li per transaction.
+    """
+    items = "".join(
+        f'<li><span class="font-bold">{name}</span> <span class="text-gray-400">{category}</span> '
+        f'<span class="text-right">{amount}</span></li>'
+        for _, name, category, amount, _ in _rows(count, seed)
+    )
+    return (
+        "<html><head><title>Dashboard</title></head><body>"
+        '<h1 class="text-2xl font-semibold">Dashboard</h1>'
+        f"<ul>{items}</ul>"
+        "</body></html>"
+    )
+
+_GENERATORS = {"homepage1": homepage1_html, "homepage2": homepage2_html}
+
+def dashboard_html(layout, count, seed=0):
+    return _GENERATORS[layout](count, seed)
+
+class FixtureServer:
+    """
+    Serves /<layout>?n=<count> dashboards on 127.0.0.1 from a background thread.
+    Generated pages are cached, so repeated loads measure the scraper, not the server.
+
+    Usage:
+        with FixtureServer() as server:
+            driver.get(server.url("homepage1", 1000))
+    """
+
+    def __init__(self, port=0):
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.port = self._server.server_address[1]
+        self._thread = None
+
+    def url(self, layout, count):
+        return f"http://127.0.0.1:{self.port}/{layout}?n={count}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def page(self, layout, count):
+        with self._lock:
+            key = (layout, count)
+            if key not in self._pages:
+                self._pages[key] = dashboard_html(layout, count).encode("utf-8")
+            return self._pages[key]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                layout = url.path.strip("/")
+                if layout not in _GENERATORS:
+                    self.send_error(404)
+                    return
+                try:
+                    count = int(parse_qs(url.query).get("n", ["10"])[0])
+                except ValueError:
+                    self.send_error(400)
+                    return
+                body = server.page(layout, count)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmarks against synthetic dashboards from the local fixture server.
+
+Every strategy in scraper/extract.py (card, table, list, generic) is run on
+homepage1- and homepage2-style pages of each size with each backend:
+
+    html       lxml over the page source (no browser needed)
+    snapshot   one execute_script call per strategy
+    webdriver  one WebDriver command per element
+
+Wall time, WebDriver command count and memory are appended to
+output/benchmarks/results.jsonl, tagged with the git commit, so runs before
+and after an optimization can be compared with --compare.
+
+    python -m benchmarks.run_benchmarks --sizes 10 1000 100000 --backends html
+    python -m benchmarks.run_benchmarks --compare
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from urllib.request import urlopen
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.fixtures import FixtureServer, LAYOUTS
+from scraper import trace
+from scraper.config import OUTPUT_DIR
+from scraper.extract import METHODS, _run_strategies
+
+RESULTS_PATH = os.path.join(OUTPUT_DIR, "benchmarks", "results.jsonl")
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+BACKENDS = ["html", "snapshot", "webdriver"]
+# One command per element: larger pages take minutes per strategy
+WEBDRIVER_MAX_SIZE = 1000
+
+class StaticPage:
+    """
+    Stands in for a driver with the html backend, which only reads page_source.
+    """
+
+    def __init__(self, html):
+        self.page_source = html
+
+def measure(driver, backend, method, track_memory=False):
+    """
+    Run one strategy once.
+
+    Returns:
+        dict: found, wall_seconds, webdriver_commands and peak_python_bytes
+        (None unless track_memory).
+    """
+    if track_memory:
+        tracemalloc.start()
+    tracer = trace.start_trace("benchmark")
+    started = time.perf_counter()
+    try:
+        # Strategy progress lines would dominate the output at large sizes
+        with contextlib.redirect_stdout(io.StringIO()):
+            transactions, _, _ = _run_strategies(driver, backend, [method])
+    finally:
+        wall_seconds = time.perf_counter() - started
+        trace.stop_trace()
+        peak = None
+        if track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return {
+        "found": len(transactions),
+        "wall_seconds": round(wall_seconds, 6),
+        "webdriver_commands": tracer.summary()["webdriver_commands"] if tracer else None,
+        "peak_python_bytes": peak,
+    }
+
+def run_benchmarks(sizes=DEFAULT_SIZES, backends=BACKENDS, layouts=LAYOUTS, methods=METHODS,
+                   repeat=1, results_path=RESULTS_PATH, headless=True):
+    """
+    Benchmark every layout x size x backend x method and append the results.
+
+    Returns:
+        list: The result records written.
+    """
+    run = {
+        "run_id": datetime.now().isoformat(timespec="milliseconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+    }
+    browser_backends = [backend for backend in backends if backend != "html"]
+    results = []
+
+    with FixtureServer() as server:
+        driver = _launch(headless) if browser_backends else None
+        try:
+            for layout in layouts:
+                for size in sizes:
+                    url = server.url(layout, size)
+                    if "html" in backends:
+                        with urlopen(url) as response:
+                            page = StaticPage(response.read().decode("utf-8"))
+                        results += _run_backend(page, "html", layout, size, methods, repeat, run)
+                    if driver is None:
+                        continue
+                    from scraper.wait import wait_for_page_settled
+                    driver.get(url)
+                    wait_for_page_settled(driver)
+                    for backend in browser_backends:
+                        if backend == "webdriver" and size > WEBDRIVER_MAX_SIZE:
+                            print(f"[bench] Skipping webdriver backend at {size} rows (> {WEBDRIVER_MAX_SIZE})")
+                            continue
+                        results += _run_backend(driver, backend, layout, size, methods, repeat, run)
+        finally:
+            if driver is not None:
+                from scraper.browser import close_browser
+                close_browser(driver)
+
+    os.makedirs(os.path.dirname(os.path.abspath(results_path)), exist_ok=True)
+    with open(results_path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(result) + "\n" for result in results))
+    print(f"[bench] Appended {len(results)} results to {results_path}")
+    return results
+
+def compare(results_path=RESULTS_PATH):
+    """
+    Print the latest run next to the previous one, per benchmark.
+    """
+    with open(results_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    run_ids = list(dict.fromkeys(record["run_id"] for record in records))
+    if len(run_ids) < 2:
+        print("[bench] Need at least two runs to compare")
+        return
+    previous, latest = run_ids[-2], run_ids[-1]
+    baseline = {_key(record): record for record in records if record["run_id"] == previous}
+
+    print(f"[bench] {previous} -> {latest}")
+    for record in records:
+        if record["run_id"] != latest or _key(record) not in baseline:
+            continue
+        before = baseline[_key(record)]
+        change = record["wall_seconds"] / before["wall_seconds"] if before["wall_seconds"] else float("inf")
+        print(
+            f"  {'/'.join(str(part) for part in _key(record)):<36} "
+            f"{before['wall_seconds']:>10.4f}s -> {record['wall_seconds']:>10.4f}s ({change:.2f}x)  "
+            f"commands {before['webdriver_commands']} -> {record['webdriver_commands']}"
+        )
+
+def _run_backend(driver, backend, layout, size, methods, repeat, run):
+    results = []
+    for method in methods:
+        timings = [measure(driver, backend, method) for _ in range(repeat)]
+        result = min(timings, key=lambda timing: timing["wall_seconds"])
+        if backend == "html":
+            # Parsing happens in this process, so its allocations are the memory cost
+            result["peak_python_bytes"] = measure(driver, backend, method, track_memory=True)["peak_python_bytes"]
+        else:
+            result["js_heap_bytes"] = driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+            )
+        result.update(run, layout=layout, size=size, backend=backend, method=method)
+        print(
+            f"[bench] {layout:<10} {size:>7} {backend:<9} {method:<8} "
+            f"{result['wall_seconds']:>9.4f}s  {result['found']:>7} found  "
+            f"{result['webdriver_commands']} commands"
+        )
+        results.append(result)
+    return results
+
+def _launch(headless):
+    from scraper.browser import launch_browser
+    try:
+        return launch_browser(headless=headless)
+    except Exception as e:
+        print(f"[bench] Browser unavailable, skipping snapshot/webdriver backends: {e}")
+        return None
+
+def _key(record):
+    return (record["layout"], record["size"], record["backend"], record["method"])
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction strategies on synthetic dashboards")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="transactions per page")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=LAYOUTS)
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=METHODS)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per benchmark; the fastest is kept")
+    parser.add_argument("--results", default=RESULTS_PATH, help="JSON lines file to append to")
+    parser.add_argument("--show-browser", action="store_true", help="run Chrome with a window")
+    parser.add_argument("--compare", action="store_true", help="compare the last two runs and exit")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.compare:
+        compare(args.results)
+    else:
+        run_benchmarks(
+            sizes=args.sizes, backends=args.backends, layouts=args.layouts, methods=args.methods,
+            repeat=args.repeat, results_path=args.results, headless=not args.show_browser
+        )
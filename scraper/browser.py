@@ -3,14 +3,37 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from contextlib import contextmanager
+from scraper.config import (
+    SCRAPE_PROFILE, BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERNS, RESOURCE_URL_PATTERNS,
+    PROFILE_DIR, PERSISTENT_PROFILES, BROWSER_SERVER_PORT, BROWSER_SERVER_MARKER, NETWORK_CAPTURE
+)
+from scraper.trace import span, instrument_driver
+from scraper.governor import DriverGovernor, process_alive
+import json
 import os
+import queue
+import re
+import shutil
+import socket
+import tempfile
+import threading
+import time
 
-def launch_browser(headless=True):
+def launch_browser(headless=True, user_data_dir=None, scrape_profile=SCRAPE_PROFILE,
+                   blocked_resources=None, blocked_urls=None, network_capture=NETWORK_CAPTURE):
     """
     Launches a Chrome browser instance with optional headless mode.
 
     Args:
         headless (bool): If True, runs Chrome in headless mode (no GUI).
+        user_data_dir (str): Chrome profile directory; a temporary one is used if None.
+        scrape_profile (bool): Lean page loads for scraping: "eager" load strategy,
+            no GPU/extensions, and blocked resource types / URL patterns.
+        blocked_resources (list): Resource types to block (default: config.BLOCKED_RESOURCE_TYPES).
+        blocked_urls (list): Extra URL patterns to block (default: config.BLOCKED_URL_PATTERNS).
+        network_capture (bool): Record network events in the performance log so API
+            responses can be read back (see scraper.network).
 
     Returns:
         webdriver.Chrome: An instance of Chrome WebDriver.
@@ -25,22 +48,395 @@ def launch_browser(headless=True):
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage") # Since Docker lacks enough shared memory
 
+    if user_data_dir:
+        # Keep cookies/cache separate from every other browser instance
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    if scrape_profile:
+        # Return from driver.get() at DOMContentLoaded; readiness waits cover the rest
+        options.page_load_strategy = "eager"
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        blocked_resources = BLOCKED_RESOURCE_TYPES if blocked_resources is None else blocked_resources
+        if "image" in blocked_resources:
+            # Skip image decoding entirely, not just the download
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    if network_capture:
+        # Network.* events go to driver.get_log("performance")
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
     # Construct the path to chromedriver.exe located in the current working directory
     chromedriver_path = os.path.join(os.getcwd(), "chromedriver.exe")
     
     # Set up the ChromeDriver service with the specified executable path
     service = Service(executable_path=chromedriver_path)
 
+    # A profile that already has data starts warm (disk cache, compiled code)
+    warm = bool(user_data_dir) and os.path.isdir(os.path.join(user_data_dir, "Default"))
+
     # Initialize the Chrome WebDriver with the defined options and service
-    driver = webdriver.Chrome(service=service, options=options)
+    kind = "warm profile" if warm else "cold start"
+    started = time.perf_counter()
+    with span("browser.launch", kind=kind):
+        driver = webdriver.Chrome(service=service, options=options)
+    _report_startup(driver, started, kind)
+    # Count and time every remote command in the run's trace
+    instrument_driver(driver)
+
+    if scrape_profile:
+        patterns = blocked_url_patterns(
+            blocked_resources, BLOCKED_URL_PATTERNS if blocked_urls is None else blocked_urls
+        )
+        if patterns:
+            # Requests matching these patterns fail immediately inside Chrome
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
     return driver
 
+def attach_browser(port=BROWSER_SERVER_PORT, network_capture=NETWORK_CAPTURE):
+    """
+    Attach a new WebDriver session to an already running Chrome (see start_browser_server).
+    No browser process is launched, so this skips Chrome's cold start.
+    network_capture is as for launch_browser.
+
+    Returns:
+        webdriver.Chrome: A driver controlling the existing browser.
+    """
+    options = Options()
+    options.debugger_address = f"127.0.0.1:{port}"
+    if network_capture:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    service = Service(executable_path=os.path.join(os.getcwd(), "chromedriver.exe"))
+
+    started = time.perf_counter()
+    with span("browser.attach", port=port):
+        driver = webdriver.Chrome(service=service, options=options)
+    _report_startup(driver, started, f"attached to :{port}")
+    return instrument_driver(driver)
+
+def start_browser_server(port=BROWSER_SERVER_PORT, headless=True, user_data_dir=None):
+    """
+    Launch a long-lived Chrome listening on a DevTools port for later runs to attach to.
+    Chrome keeps running after this returns; stop it with stop_browser_server().
+    The port and Chrome's pid are written to BROWSER_SERVER_MARKER, so runs
+    only attach to this browser and not to whatever else uses the port.
+    """
+    if port is None:
+        raise ValueError("No browser server port: set BROWSER_SERVER_PORT or pass --port")
+    if browser_server_running(port):
+        print(f"[browser] Browser server already running on port {port}")
+        return
+    if _port_open(port):
+        raise RuntimeError(f"Port {port} is already used by another process")
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"--remote-debugging-port={port}")
+    options.add_argument(f"--user-data-dir={user_data_dir or os.path.join(PROFILE_DIR, 'server')}")
+    # Keep Chrome alive when this chromedriver goes away
+    options.add_experimental_option("detach", True)
+    service = Service(executable_path=os.path.join(os.getcwd(), "chromedriver.exe"))
+
+    started = time.perf_counter()
+    driver = webdriver.Chrome(service=service, options=options)
+    _report_startup(driver, started, f"browser server on :{port}")
+    _write_server_marker(port, _browser_pid(driver))
+    driver.service.stop()
+
+def stop_browser_server(port=BROWSER_SERVER_PORT):
+    """
+    Shut down a Chrome started by start_browser_server.
+    """
+    if port is None or not browser_server_running(port):
+        print(f"[browser] No browser server on port {port}")
+        return
+    driver = attach_browser(port)
+    driver.execute_cdp_cmd("Browser.close", {})
+    driver.service.stop()
+    _remove_server_marker()
+    print(f"[browser] Browser server on port {port} stopped")
+
+def browser_server_running(port=BROWSER_SERVER_PORT):
+    """
+    True if the Chrome started by start_browser_server is up on port: the
+    marker file names this port and a live process, and the port accepts
+    connections.
+    """
+    try:
+        with open(BROWSER_SERVER_MARKER, encoding="utf-8") as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if marker.get("port") != port:
+        return False
+    if marker.get("pid") is not None and not process_alive(marker["pid"]):
+        return False
+    return _port_open(port)
+
+def _port_open(port):
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+def open_browser(username=None, headless=True, network_capture=NETWORK_CAPTURE):
+    """
+    Get a driver the cheapest available way: attach to a running browser
+    server, else launch Chrome with the account's persistent profile
+    (if PERSISTENT_PROFILES), else launch with a temporary profile.
+    network_capture is as for launch_browser.
+    """
+    if BROWSER_SERVER_PORT is not None and browser_server_running(BROWSER_SERVER_PORT):
+        return attach_browser(BROWSER_SERVER_PORT, network_capture=network_capture)
+    user_data_dir = profile_dir_for(username) if PERSISTENT_PROFILES and username else None
+    return launch_browser(headless=headless, user_data_dir=user_data_dir, network_capture=network_capture)
+
+def _browser_pid(driver):
+    """
+    PID of the Chrome browser process behind driver, or None if Chrome does not say.
+    """
+    try:
+        processes = driver.execute_cdp_cmd("SystemInfo.getProcessInfo", {})["processInfo"]
+    except Exception:
+        return None
+    return next((process["id"] for process in processes if process.get("type") == "browser"), None)
+
+def _write_server_marker(port, pid):
+    os.makedirs(os.path.dirname(BROWSER_SERVER_MARKER), exist_ok=True)
+    tmp_path = f"{BROWSER_SERVER_MARKER}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"port": port, "pid": pid}, f)
+    os.replace(tmp_path, BROWSER_SERVER_MARKER)
+
+def _remove_server_marker():
+    try:
+        os.remove(BROWSER_SERVER_MARKER)
+    except FileNotFoundError:
+        pass
+
+def profile_dir_for(name):
+    """
+    Persistent Chrome profile directory for an account (or pool slot).
+    """
+    return os.path.join(PROFILE_DIR, re.sub(r"[^A-Za-z0-9._-]", "_", name))
+
+def _report_startup(driver, started, kind):
+    driver.startup_seconds = time.perf_counter() - started
+    print(f"[browser] Chrome ready in {driver.startup_seconds:.2f}s ({kind})")
+
+def blocked_url_patterns(resource_types, url_patterns):
+    """
+    Expand resource types into URL wildcard patterns and add the extra patterns.
+    """
+    patterns = []
+    for resource_type in resource_types:
+        patterns.extend(RESOURCE_URL_PATTERNS.get(resource_type, []))
+    patterns.extend(url_patterns)
+    return patterns
+
 def close_browser(driver):
     """
     Properly closes and quits the given WebDriver instance.
+    For a driver from attach_browser only the WebDriver session ends;
+    the shared browser server keeps running.
 
     Args:
         driver (webdriver.Chrome): The Chrome WebDriver instance to close.
     """
     # shut down the browser and end the WebDriver session
-    driver.quit()
\ No newline at end of file
+    driver.quit()
+
+# Put on the idle queue when a recycle fails, so a waiting acquire() re-checks
+# whether it can launch into the freed slot
+_SLOT_FREED = object()
+
+class BrowserPool:
+    """
+    Bounded pool of Chrome drivers for concurrent scraping.
+
+    Drivers are launched lazily up to `size`, each with its own profile
+    directory, and handed out to one worker at a time. Profiles are temporary
+    unless persistent_profiles is set, in which case slot N reuses
+    PROFILE_DIR/pool-N across runs (warm disk cache). Persistent slots must
+    not be shared by two pools running at the same time.
+
+    A driver past the governor's page/age/memory limits is recycled when it
+    is released: quit and relaunched on the same profile directory, so its
+    cookies and web storage (the login) carry over and workers waiting in
+    acquire() simply get the fresh one.
+    """
+
+    def __init__(self, size, headless=True, persistent_profiles=False, governor=None):
+        self.size = size
+        self.headless = headless
+        self.persistent_profiles = persistent_profiles
+        self.governor = governor or DriverGovernor()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._profiles = {}  # driver -> profile directory
+        self._slots = {}  # driver -> slot number
+        self._free_slots = list(range(size))
+        self._closed = False
+
+    def acquire(self, timeout=None):
+        """
+        Get an idle driver, launching a new one if the pool is not full yet.
+        Blocks until a driver is released (or a slot freed) otherwise.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if self._closed:
+                        raise RuntimeError("BrowserPool is closed")
+                    slot = self._free_slots.pop(0) if self._free_slots else None
+                    if slot is not None:
+                        # Reserve the slot before the (slow) launch
+                        reservation = object()
+                        self._profiles[reservation] = None
+                if slot is not None:
+                    return self._launch(slot, reservation)
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                driver = self._idle.get(timeout=remaining)
+            if driver is not _SLOT_FREED:
+                return driver
+
+    def _launch(self, slot, reservation):
+        """
+        Launch a driver into a reserved slot.
+        """
+        if self.persistent_profiles:
+            profile_dir = profile_dir_for(f"pool-{slot}")
+        else:
+            profile_dir = tempfile.mkdtemp(prefix="scraper-profile-")
+        try:
+            driver = launch_browser(headless=self.headless, user_data_dir=profile_dir)
+        except Exception:
+            with self._lock:
+                self._profiles.pop(reservation, None)
+                self._free_slots.append(slot)
+            self._remove_profile(profile_dir)
+            self._idle.put(_SLOT_FREED)
+            raise
+
+        with self._lock:
+            self._profiles.pop(reservation, None)
+            closed = self._closed
+            if not closed:
+                self._profiles[driver] = profile_dir
+                self._slots[driver] = slot
+        if closed:
+            close_browser(driver)
+            self._remove_profile(profile_dir)
+            raise RuntimeError("BrowserPool is closed")
+        self.governor.track(driver)
+        print(f"[browser] Pool launched driver {len(self._profiles)}/{self.size}")
+        return driver
+
+    def release(self, driver):
+        """
+        Return a driver to the pool, recycling it first if the governor says so.
+        """
+        reason = self.governor.recycle_reason(driver)
+        if reason:
+            driver = self._recycle(driver, reason)
+            if driver is None:
+                return
+        self._idle.put(driver)
+
+    def _recycle(self, driver, reason):
+        """
+        Quit driver and launch its replacement on the same profile directory.
+
+        Returns:
+            The new driver, or None if the pool closed or the relaunch failed
+            (the slot is then freed for acquire() to launch into).
+        """
+        with self._lock:
+            profile_dir = self._profiles.pop(driver, None)
+            slot = self._slots.pop(driver, None)
+            if profile_dir is not None:
+                # Keep the slot taken while the replacement launches
+                reservation = object()
+                self._profiles[reservation] = None
+        self.governor.forget(driver)
+        print(f"[browser] Recycling pooled driver ({reason})")
+        try:
+            close_browser(driver)
+        except Exception as e:
+            print(f"[browser] Error closing pooled driver: {e}")
+        if profile_dir is None:
+            # Pool already closed
+            return None
+
+        try:
+            with span("browser.recycle", reason=reason):
+                new_driver = launch_browser(headless=self.headless, user_data_dir=profile_dir)
+        except Exception as e:
+            print(f"[browser] Relaunch failed, freeing the slot: {e}")
+            with self._lock:
+                self._profiles.pop(reservation, None)
+                if not self._closed:
+                    self._free_slots.append(slot)
+            self._remove_profile(profile_dir)
+            self._idle.put(_SLOT_FREED)
+            return None
+
+        with self._lock:
+            self._profiles.pop(reservation, None)
+            closed = self._closed
+            if not closed:
+                self._profiles[new_driver] = profile_dir
+                self._slots[new_driver] = slot
+        if closed:
+            close_browser(new_driver)
+            self._remove_profile(profile_dir)
+            return None
+        return self.governor.track(new_driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Context manager that acquires a driver and always releases it.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """
+        Quit every driver and delete their profile directories.
+        """
+        with self._lock:
+            self._closed = True
+            drivers = list(self._profiles.items())
+            self._profiles.clear()
+            self._slots.clear()
+
+        for driver, profile_dir in drivers:
+            if profile_dir is None:
+                continue
+            try:
+                close_browser(driver)
+            except Exception as e:
+                print(f"[browser] Error closing pooled driver: {e}")
+            self._remove_profile(profile_dir)
+
+    def _remove_profile(self, profile_dir):
+        if not self.persistent_profiles:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,649 @@
+# command-line subcommands; each one imports only the modules it needs
+import argparse
+import contextlib
+import json
+import sys
+from scraper.config import (
+    EXTRACT_MODE, HTML_DUMP_PATH, USE_LOCAL_HTML, TEST_USERS, POOL_SIZE, CSV_PATH, PARQUET_PATH,
+    DEFAULT_USERNAME, DEFAULT_PASSWORD, SCROLL_EXTRACTION, DASHBOARD_URL, BROWSER_SERVER_PORT, HTTP_DATA_URLS
+)
+
+# Selenium (scraper.browser/login/extract/wait/session), pandas/pyarrow
+# (scraper.export/normalize/pipeline) and lxml (scraper.parse) are imported
+# inside the commands, so cron runs and worker spawns only pay for what
+# their command uses. tests/test_cli.py guards this.
+
+def export_to_csv(transactions, append=False):
+    """
+    Export transactions to the CSV and Parquet outputs.
+    With append=True they are added to the existing files.
+    """
+    if not transactions:
+        print("No transactions to export")
+        return
+    from scraper.export import export_transactions
+
+    # Normalized into typed columns and streamed in chunks by the writer
+    export_transactions(transactions, CSV_PATH, append=append)
+    export_transactions(transactions, PARQUET_PATH, append=append)
+    print(f"Exported {len(transactions)} transactions to {CSV_PATH} and {PARQUET_PATH}")
+
+def export_new_transactions(transactions, index=None):
+    """
+    Append only transactions missing from the dedup index, then record them in it.
+    """
+    from scraper.dedup import TransactionIndex
+
+    index = index or TransactionIndex()
+    new_transactions = index.filter_new(transactions)
+    print(f"🆕 {len(new_transactions)} new of {len(transactions)} transactions")
+    try:
+        export_to_csv(new_transactions, append=True)
+    except Exception:
+        index.discard_pending()
+        raise
+    index.commit()
+
+def _export(transactions, incremental=False):
+    if incremental:
+        export_new_transactions(transactions)
+    else:
+        export_to_csv(transactions)
+
+def main_from_dump(paths=(HTML_DUMP_PATH,), json_path=None, incremental=False):
+    """
+    Extract transactions from saved page sources without a browser, then
+    export them, or with json_path write them as JSON ("-" for stdout) for a
+    later `export` run.
+    """
+    from scraper.parse import extract_transactions_from_dumps
+
+    transactions = []
+    # With --json - stdout carries the JSON, so progress goes to stderr
+    with contextlib.redirect_stdout(sys.stderr) if json_path == "-" else contextlib.nullcontext():
+        for path in paths:
+            print(f"📄 Extracting transactions from saved HTML: {path}")
+            for found in extract_transactions_from_dumps(path).values():
+                transactions.extend(found)
+        if not transactions:
+            print("❌ No transactions found in saved HTML")
+            return 1
+        print(f"✅ Found {len(transactions)} transactions")
+
+    if json_path:
+        _write_json(transactions, json_path)
+    else:
+        _export(transactions, incremental)
+    return 0
+
+def main_export(json_path, incremental=False):
+    """
+    Export transactions from a JSON list (as written by extract-from-dump --json).
+    """
+    if json_path == "-":
+        transactions = json.load(sys.stdin)
+    else:
+        with open(json_path, encoding="utf-8") as f:
+            transactions = json.load(f)
+    _export(transactions, incremental)
+    return 0
+
+def main_login(usernames=(DEFAULT_USERNAME,), headless=True):
+    """
+    Log in and cache each account's session, without extracting anything.
+    Later scrape/--http runs reuse the cached sessions.
+    """
+    from scraper.browser import open_browser, close_browser
+    from scraper.login import perform_login
+
+    failed = []
+    for username in usernames:
+        print(f"🔐 [{username}] Logging in...")
+        driver = open_browser(username, headless=headless)
+        try:
+            if perform_login(driver, username=username, password=TEST_USERS.get(username, DEFAULT_PASSWORD)):
+                print(f"✅ [{username}] Logged in, session cached")
+            else:
+                print(f"❌ [{username}] Login not confirmed")
+                failed.append(username)
+        finally:
+            close_browser(driver)
+    return 1 if failed else 0
+
+def scrape_account(pool, username, password, emit, route=None):
+    """
+    Log in and extract one account's transactions on a pooled driver,
+    handing them to emit() (the export pipeline) as soon as they are found.
+    With route (e.g. "homepage2") that dashboard page is scraped instead of
+    the one the login lands on.
+
+    Returns:
+        int: Number of transactions extracted.
+    """
+    from urllib.parse import urljoin
+    from scraper.login import perform_login
+    from scraper.extract import extract_transactions, iter_transaction_batches
+    from scraper.parse import extract_transactions_from_html
+    from scraper.wait import wait_for_page_settled
+    from scraper.trace import span
+    from scraper.debug import capture_artifacts
+
+    with span("scrape_account", account=username), pool.driver() as driver:
+        print(f"🔐 [{username}] Logging in...")
+        if not perform_login(driver, username=username, password=password):
+            print(f"⚠️  [{username}] Login not confirmed, extraction may find limited data")
+
+        html = None
+        count = 0
+        try:
+            if route:
+                driver.get(urljoin(DASHBOARD_URL, route))
+            if EXTRACT_MODE == "html":
+                wait_for_page_settled(driver)
+                html = driver.page_source
+            elif SCROLL_EXTRACTION:
+                # Hand over each scroll/page batch while the next one loads
+                for batch in iter_transaction_batches(driver):
+                    count += _emit_for_account(batch, username, emit)
+            else:
+                count = _emit_for_account(extract_transactions(driver), username, emit)
+        except Exception:
+            capture_artifacts(driver, f"extract-{username}", failure=True)
+            raise
+
+    # The driver is already back in the pool; a captured page needs no browser
+    if html is not None:
+        count = _emit_for_account(extract_transactions_from_html(html), username, emit)
+    return count
+
+def _emit_for_account(transactions, username, emit):
+    emit(_tag_account(transactions, username))
+    return len(transactions)
+
+def _tag_account(transactions, username):
+    # The account is part of the dedup key, so every mode must set it
+    for transaction in transactions:
+        transaction["account"] = username
+    return transactions
+
+def _stream_export(batches, incremental=False):
+    """
+    Normalize and export batches of transactions as they are yielded, so only
+    the batches in flight are held in memory. Nothing is written (and an
+    earlier export is left alone) if every batch is empty.
+
+    Returns:
+        int: Number of transactions extracted.
+    """
+    from scraper.export import TransactionWriter
+    from scraper.pipeline import Pipeline
+    from scraper.dedup import TransactionIndex
+
+    pipeline = None
+    count = 0
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            if pipeline is None:
+                writers = [
+                    TransactionWriter(CSV_PATH, append=incremental),
+                    TransactionWriter(PARQUET_PATH, append=incremental),
+                ]
+                pipeline = Pipeline(writers, index=TransactionIndex() if incremental else None)
+            pipeline.submit(batch)
+            count += len(batch)
+    except BaseException:
+        if pipeline is not None:
+            pipeline.abort()
+        raise
+
+    if pipeline is not None:
+        exported = pipeline.close()
+        print(f"Exported {exported} transactions to {CSV_PATH} and {PARQUET_PATH}")
+    return count
+
+def main_multi(usernames, workers=POOL_SIZE, headless=True, incremental=False):
+    """
+    Scrape several accounts concurrently on a bounded browser pool.
+    Extracted transactions stream through a Pipeline that normalizes and
+    exports them in the background, in the order accounts finish.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from scraper.browser import BrowserPool
+    from scraper.export import TransactionWriter
+    from scraper.pipeline import Pipeline
+    from scraper.dedup import TransactionIndex
+
+    workers = max(1, min(workers, len(usernames)))
+    print(f"🚀 Scraping {len(usernames)} accounts with {workers} browser(s)...")
+    print("=" * 60)
+
+    failed = []
+    writers = [
+        TransactionWriter(CSV_PATH, append=incremental),
+        TransactionWriter(PARQUET_PATH, append=incremental),
+    ]
+    pipeline = Pipeline(writers, index=TransactionIndex() if incremental else None)
+    try:
+        with BrowserPool(size=workers, headless=headless) as pool:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    (username, executor.submit(scrape_account, pool, username, TEST_USERS[username], pipeline.submit))
+                    for username in usernames
+                ]
+                for username, future in futures:
+                    try:
+                        count = future.result()
+                        print(f"✅ [{username}] Found {count} transactions")
+                    except Exception as e:
+                        print(f"❌ [{username}] Scrape failed: {e}")
+                        failed.append(username)
+    except BaseException:
+        pipeline.abort()
+        raise
+
+    exported = pipeline.close()
+    print(f"Exported {exported} transactions to {CSV_PATH} and {PARQUET_PATH}")
+    print("=" * 60)
+    print(f"🏁 Scraped {len(usernames) - len(failed)}/{len(usernames)} accounts")
+    return 1 if failed else 0
+
+def run_scrape_job(pool, job):
+    """
+    Job handler for scraper.jobs workers: the transactions become the job's result.
+    """
+    from scraper.transaction import as_dicts
+
+    transactions = []
+    scrape_account(pool, job.account, TEST_USERS.get(job.account, DEFAULT_PASSWORD), transactions.extend,
+                   route=job.route)
+    return {"transactions": as_dicts(transactions)}
+
+def main_enqueue(usernames, route=None):
+    """
+    Queue one scrape job per account for workers on any node.
+    """
+    from scraper.jobs import JobQueue
+
+    queue = JobQueue()
+    for username in usernames:
+        job_id = queue.enqueue(username, route)
+        print(f"📥 Queued job {job_id}: {username} {route or ''}")
+    print(f"   Queue: {queue.counts()}")
+    return 0
+
+def main_worker(workers=POOL_SIZE, headless=True, drain=False):
+    """
+    Run queued jobs on a browser pool with one job per browser.
+    With drain=True the worker exits once the queue is empty.
+    """
+    from scraper.browser import BrowserPool
+    from scraper.jobs import JobQueue, run_worker
+
+    queue = JobQueue()
+    print(f"🚀 Job worker with {workers} browser(s) on {queue.path}")
+    with BrowserPool(size=workers, headless=headless) as pool:
+        run_worker(queue, lambda job: run_scrape_job(pool, job), slots=workers, stop_when_idle=drain)
+    return 0
+
+def main_collect(incremental=False):
+    """
+    Export the transactions of all finished jobs and mark them collected.
+    """
+    from scraper.jobs import JobQueue
+
+    queue = JobQueue()
+    jobs = queue.jobs("done")
+    transactions = [transaction for job in jobs for transaction in job.result["transactions"]]
+    print(f"📦 Collecting {len(transactions)} transactions from {len(jobs)} job(s)")
+    _export(transactions, incremental)
+    queue.collect([job.id for job in jobs])
+    failed = queue.jobs("failed")
+    for job in failed:
+        print(f"❌ Job {job.id} ({job.account}) failed after {job.attempts} attempt(s): {job.error}")
+    return 0
+
+def main_http(usernames=(DEFAULT_USERNAME,), incremental=False):
+    """
+    Pull transactions over plain HTTP with each account's cached session and
+    export them once. Chrome is only launched to log in when an account has
+    no session or the server rejects it. An account that fails does not stop
+    the others from being exported.
+    """
+    print(f"🚀 Pulling transactions for {len(usernames)} account(s) over HTTP...")
+    print("=" * 60)
+
+    failed = []
+    all_transactions = []
+    for username in usernames:
+        try:
+            transactions = pull_account_over_http(username)
+        except Exception as e:
+            print(f"❌ [{username}] HTTP pull failed: {e}")
+            failed.append(username)
+            continue
+        print(f"✅ [{username}] Found {len(transactions)} transactions")
+        all_transactions.extend(transactions)
+
+    _export(all_transactions, incremental)
+    print("=" * 60)
+    print(f"🏁 Pulled {len(usernames) - len(failed)}/{len(usernames)} accounts")
+    return 1 if failed else 0
+
+def pull_account_over_http(username):
+    """
+    Fetch one account's transactions with SessionClient. When a browser login
+    is needed, its cookies/token are copied into the client and the browser
+    is closed before any data is fetched.
+
+    An empty result only counts when it came from an API endpoint. The
+    fallback pages (HTTP_DATA_URLS) coming back empty usually means the app
+    shell or a client-side redirect to the login page: the cached session
+    is then refreshed with a browser login, and if that still finds no
+    endpoint the pull fails.
+    """
+    from scraper.http_client import SessionClient, SessionExpired, fetch_transactions
+
+    transactions = None
+    client = SessionClient.from_session(username)
+    if client:
+        try:
+            transactions = fetch_transactions(client)
+        except SessionExpired as e:
+            print(f"⚠️  [{username}] Cached session rejected: {e}")
+        if transactions == [] and not client.api_urls:
+            print(f"⚠️  [{username}] No transactions in {', '.join(HTTP_DATA_URLS)}; the cached session may be stale")
+            transactions = None
+
+    if transactions is None:
+        from scraper.browser import open_browser, close_browser
+        from scraper.login import perform_login
+        from scraper.session import update_session
+
+        print(f"🔐 [{username}] Logging in with the browser to refresh the session...")
+        # The API endpoints the HTTP pull uses are read from the performance log,
+        # whatever EXTRACT_MODE says
+        driver = open_browser(username, network_capture=True)
+        try:
+            if not perform_login(driver, username=username, password=TEST_USERS.get(username, DEFAULT_PASSWORD)):
+                print(f"⚠️  [{username}] Login not confirmed, the HTTP pull may be rejected")
+            client = SessionClient.from_driver(driver)
+        finally:
+            close_browser(driver)
+        if client.api_urls:
+            # Later runs go straight to these endpoints
+            update_session(username, api_urls=client.api_urls)
+        transactions = fetch_transactions(client)
+        if not transactions and not client.api_urls:
+            raise RuntimeError(
+                f"no transactions in {', '.join(HTTP_DATA_URLS)} and no API endpoint seen during the login"
+            )
+
+    for transaction in transactions:
+        transaction["account"] = username
+    return transactions
+
+def main_single(incremental=False):
+    """
+    Main scraper function with aggressive login approach.
+    With incremental=True only transactions not exported by earlier runs are appended.
+    """
+    if USE_LOCAL_HTML:
+        return main_from_dump(incremental=incremental)
+
+    from scraper.browser import open_browser, close_browser
+    from scraper.login import perform_login, is_real_dashboard_content
+    from scraper.extract import extract_transactions, iter_transaction_batches
+    from scraper.parse import dump_page_source, extract_transactions_from_html
+    from scraper.wait import wait_for_page_settled
+    from scraper.debug import capture_artifacts
+
+    print("🚀 Starting BankDashboard Scraper with Aggressive Login...")
+    print("=" * 60)
+
+    driver = None
+    try:
+        # Create browser instance
+        print("📱 Creating browser instance...")
+        driver = open_browser(DEFAULT_USERNAME, headless=False)
+
+        # Perform aggressive login
+        print("🔐 Starting aggressive login process...")
+        print("   This will spam login attempts until successful!")
+        perform_login(driver)
+
+        # Verify we're actually logged in
+        current_url = driver.current_url
+        page_title = driver.title
+
+        print(f"✅ Login process completed!")
+        print(f"   Current URL: {current_url}")
+        print(f"   Page Title: {page_title}")
+
+        # Check if we have real dashboard content
+        if is_real_dashboard_content(driver):
+            print("🎉 SUCCESS: Real dashboard content detected!")
+        else:
+            print("⚠️  WARNING: May still be showing login form")
+            print("   Extraction may find limited data")
+
+        # Extract transactions
+        print("\n💰 Extracting transaction data...")
+        if EXTRACT_MODE == "html":
+            # Grab the page once and release the browser before parsing
+            wait_for_page_settled(driver)
+            html = dump_page_source(driver)
+            print("🔄 Closing browser...")
+            close_browser(driver)
+            driver = None
+            batches = [extract_transactions_from_html(html)]
+        elif SCROLL_EXTRACTION:
+            batches = iter_transaction_batches(driver)
+        else:
+            batches = [extract_transactions(driver)]
+
+        # Each batch is exported while the next one loads
+        print("📊 Exporting to CSV...")
+        batches = (_tag_account(batch, DEFAULT_USERNAME) for batch in batches)
+        count = _stream_export(batches, incremental)
+
+        if count:
+            print(f"✅ Found {count} transactions")
+            print("✅ Export completed successfully!")
+
+        else:
+            print("❌ No transactions found")
+            print("   This could mean:")
+            print("   - Login wasn't fully successful")
+            print("   - Page selectors need updating")
+            print("   - Dashboard is still loading")
+
+            # Screenshot + page source, written in the background
+            if driver:
+                capture_artifacts(driver, "no_transactions", failure=True)
+
+    except KeyboardInterrupt:
+        print("\n⏹️  Scraper interrupted by user")
+        return 1
+
+    except Exception as e:
+        print(f"❌ Scraper error: {e}")
+
+        # Screenshot + page source, written in the background
+        if driver:
+            capture_artifacts(driver, "error", failure=True)
+
+        return 1
+
+    finally:
+        if driver:
+            print("🔄 Closing browser...")
+            close_browser(driver)
+
+        print("=" * 60)
+        print("🏁 Scraper completed!")
+    return 0
+
+def main_scrape(args):
+    if args.http:
+        return main_http(args.accounts or [DEFAULT_USERNAME], incremental=args.incremental)
+    if args.accounts:
+        return main_multi(args.accounts, workers=args.workers, incremental=args.incremental)
+    return main_single(incremental=args.incremental)
+
+def main_browser_server(action, port=None):
+    from scraper.browser import start_browser_server, stop_browser_server
+
+    port = port or BROWSER_SERVER_PORT
+    if port is None:
+        print("❌ No browser server port: set BROWSER_SERVER_PORT in config or pass --port")
+        return 1
+    if action == "start":
+        start_browser_server(port)
+    else:
+        stop_browser_server(port)
+    return 0
+
+def _write_json(transactions, path):
+    from scraper.transaction import as_dicts
+
+    transactions = as_dicts(transactions)
+    if path == "-":
+        json.dump(transactions, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(transactions, f, ensure_ascii=False)
+    print(f"Wrote {len(transactions)} transactions to {path}")
+
+def _traced_command(name, command):
+    """
+    Run a browser command with spans and WebDriver command counts going to config.TRACE_DIR.
+    """
+    from scraper.trace import start_trace, finish_trace
+    from scraper.debug import flush_artifacts
+
+    start_trace(name)
+    try:
+        return command()
+    finally:
+        flush_artifacts()
+        finish_trace()
+
+# Pre-subcommand flags, still accepted so existing cron lines keep working
+_LEGACY_FLAGS = {
+    "--start-browser-server": ["browser-server", "start"],
+    "--stop-browser-server": ["browser-server", "stop"],
+    "--enqueue": ["enqueue"],
+    "--worker": ["worker"],
+    "--collect": ["collect"],
+}
+_COMMANDS = (
+    "scrape", "login", "extract-from-dump", "export", "enqueue", "worker", "collect", "browser-server"
+)
+
+def _normalize_argv(argv):
+    """
+    Map the old flag style onto subcommands; no subcommand means `scrape`.
+    """
+    argv = list(argv)
+    for flag, command in _LEGACY_FLAGS.items():
+        if flag in argv:
+            argv.remove(flag)
+            return command + argv
+    if not argv or (argv[0] not in _COMMANDS and argv[0] not in ("-h", "--help")):
+        return ["scrape"] + argv
+    return argv
+
+def _add_accounts(parser, help_text):
+    parser.add_argument("--accounts", nargs="+", metavar="USERNAME", help=f"{help_text} ('all' for every account)")
+
+def _add_incremental(parser):
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="append only transactions not exported before (tracked in config.DEDUP_INDEX_PATH)"
+    )
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="scraper.py", description="BankDashboard scraper (`scrape` when no command is given)"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    scrape = commands.add_parser("scrape", help="log in and extract transactions with Chrome")
+    _add_accounts(scrape, "scrape these config.TEST_USERS accounts concurrently")
+    scrape.add_argument("--workers", type=int, default=POOL_SIZE, help="number of concurrent browsers")
+    _add_incremental(scrape)
+    scrape.add_argument(
+        "--http", action="store_true",
+        help="pull data over HTTP with the cached session; Chrome only logs in when needed"
+    )
+
+    login = commands.add_parser("login", help="log in and cache sessions without extracting")
+    _add_accounts(login, "log in these config.TEST_USERS accounts")
+    login.add_argument("--show-browser", action="store_true", help="run Chrome with a window")
+
+    dump = commands.add_parser("extract-from-dump", help="extract transactions from saved HTML, no browser")
+    dump.add_argument("paths", nargs="*", default=[HTML_DUMP_PATH], metavar="PATH", help="files or glob patterns")
+    dump.add_argument("--json", metavar="FILE", help="write transactions as JSON ('-' for stdout) instead of exporting")
+    _add_incremental(dump)
+
+    export = commands.add_parser("export", help="export a JSON transaction list to CSV and Parquet")
+    export.add_argument("json_path", metavar="FILE", help="JSON file from extract-from-dump --json ('-' for stdin)")
+    _add_incremental(export)
+
+    enqueue = commands.add_parser("enqueue", help="queue a scrape job per account")
+    _add_accounts(enqueue, "queue these config.TEST_USERS accounts")
+    enqueue.add_argument("--route", help="dashboard route for the jobs, e.g. homepage2")
+
+    worker = commands.add_parser("worker", help="run queued jobs on a browser pool")
+    worker.add_argument("--workers", type=int, default=POOL_SIZE, help="number of concurrent browsers")
+    worker.add_argument("--drain", action="store_true", help="exit once the queue is empty")
+
+    collect = commands.add_parser("collect", help="export the results of finished jobs")
+    _add_incremental(collect)
+
+    server = commands.add_parser("browser-server", help="start or stop the long-lived Chrome that runs attach to")
+    server.add_argument("action", choices=["start", "stop"])
+    server.add_argument("--port", type=int, help="DevTools port (default: BROWSER_SERVER_PORT)")
+    return parser
+
+def parse_args(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(_normalize_argv(sys.argv[1:] if argv is None else argv))
+
+    accounts = getattr(args, "accounts", None)
+    if accounts == ["all"]:
+        args.accounts = accounts = list(TEST_USERS)
+    unknown = [username for username in accounts or [] if username not in TEST_USERS]
+    if unknown:
+        parser.error(f"unknown accounts (not in config.TEST_USERS): {', '.join(unknown)}")
+    return args
+
+def main(argv=None):
+    """
+    Run a subcommand.
+
+    Returns:
+        int: Process exit status.
+    """
+    args = parse_args(argv)
+    if args.command == "extract-from-dump":
+        return main_from_dump(args.paths, json_path=args.json, incremental=args.incremental)
+    if args.command == "export":
+        return main_export(args.json_path, incremental=args.incremental)
+    if args.command == "enqueue":
+        return main_enqueue(args.accounts or [DEFAULT_USERNAME], route=args.route)
+    if args.command == "collect":
+        return main_collect(incremental=args.incremental)
+    if args.command == "browser-server":
+        return main_browser_server(args.action, args.port)
+    if args.command == "login":
+        return _traced_command(
+            "login", lambda: main_login(args.accounts or [DEFAULT_USERNAME], headless=not args.show_browser)
+        )
+    if args.command == "worker":
+        return _traced_command("worker", lambda: main_worker(workers=args.workers, drain=args.drain))
+    name = "http" if args.http else "multi" if args.accounts else "main"
+    return _traced_command(name, lambda: main_scrape(args))
@@ -2,7 +2,10 @@ import os
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 CHROMEDRIVER_PATH = os.path.join(PROJECT_ROOT, "chromedriver.exe")
+# everything the scraper writes (exports, caches, profiles, debug captures) goes under here
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 
+# When True, scraper.py skips the browser and extracts from HTML_DUMP_PATH
 USE_LOCAL_HTML = False 
 
 # Target frontend URLs
@@ -20,6 +23,48 @@ TEST_USERS = {
 DEFAULT_USERNAME = "john.doe@email.com"
 DEFAULT_PASSWORD = TEST_USERS[DEFAULT_USERNAME]
 
+# Lean "scrape profile" for launch_browser: eager page loads, no GPU/extensions,
+# and requests for the resource types / URL patterns below blocked via DevTools.
+# Stylesheets are not blocked by default: element text depends on layout (hidden
+# elements read as empty), so unstyled pages can extract differently.
+SCRAPE_PROFILE = True
+BLOCKED_RESOURCE_TYPES = ["image", "font", "media"]
+RESOURCE_URL_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"],
+    "stylesheet": ["*.css"],
+}
+BLOCKED_URL_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*hotjar.com*",
+    "*segment.io*",
+]
+
+# Reusable Chrome profiles (--user-data-dir), one per account, so later runs
+# start with a warm disk cache instead of a brand-new temporary profile
+PROFILE_DIR = os.path.join(OUTPUT_DIR, "profiles")
+PERSISTENT_PROFILES = True
+# DevTools port (e.g. 9222) of a long-lived Chrome started with
+# `scraper.py browser-server start`; runs then attach to it instead of
+# launching Chrome. Opt-in: None launches Chrome every run.
+BROWSER_SERVER_PORT = None
+# Written by browser-server start (port and Chrome pid); runs only attach to
+# a port this file names, while that process is alive
+BROWSER_SERVER_MARKER = os.path.join(OUTPUT_DIR, "browser_server.json")
+
+# number of concurrent Chrome drivers for multi-account scraping
+POOL_SIZE = max(1, min(len(TEST_USERS), os.cpu_count() or 1))
+
+# Pooled drivers are recycled (quit and relaunched on the same profile, so
+# cookies and the login survive) once one limit is passed; None disables it.
+# RSS covers chromedriver and every Chrome process under it.
+DRIVER_MAX_PAGES = 200  # page loads (get/refresh)
+DRIVER_MAX_AGE = 30 * 60  # seconds since launch
+DRIVER_MAX_RSS_MB = 1500
+
 # Login form selectors (from React code)
 USERNAME_SELECTOR = 'input#email'
 PASSWORD_SELECTOR = 'input#password'
@@ -56,10 +101,113 @@ HOMEPAGE2_FIELD_CLASSES = {
     'amount': 'text-right',
 }
 
+# Readiness waits (scraper/wait.py): upper bound per wait in seconds, how long
+# the DOM must be free of mutations to count as rendered, and the poll interval
+READY_TIMEOUT = 10
+DOM_QUIET_MS = 300
+READY_POLL_INTERVAL = 0.1
+# Any of these being present means the dashboard has rendered
+DASHBOARD_READY_SELECTORS = [
+    POST_LOGIN_SUCCESS_SELECTOR,
+    HOMEPAGE1_ROW_SELECTOR,
+    HOMEPAGE2_ITEM_SELECTOR,
+]
+
+# "snapshot" reads all candidate rows with one execute_script call and parses
+# them locally; "html" grabs page_source once and parses it with lxml (the
+# browser can be released before parsing); "webdriver" queries every
+# element/cell with its own command; "network" reads the JSON API responses
+# the dashboard loaded (see API_URL_PATTERNS) and falls back to "snapshot"
+EXTRACT_MODE = "snapshot"
+# Keep each row's raw element text on extracted transactions and export it as
+# a last full_text column. Off by default: it mostly repeats the other fields.
+KEEP_RAW_TEXT = False
+
 
 # Output files
-OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 CSV_PATH = os.path.join(OUTPUT_DIR, "transactions.csv")
+# a single file, or a directory of part files once --incremental runs append to it
 PARQUET_PATH = os.path.join(OUTPUT_DIR, "transactions.parquet")
 SCREENSHOT_PATH = os.path.join(OUTPUT_DIR, "dashboard.png")
-HTML_DUMP_PATH = os.path.join(OUTPUT_DIR, "page_source.html")
\ No newline at end of file
+HTML_DUMP_PATH = os.path.join(OUTPUT_DIR, "page_source.html")
+EXPORT_CHUNK_SIZE = 5000  # rows per Parquet row group / CSV append
+# hashes of already-exported transactions, for --incremental runs; an index
+# from an older key format is rebuilt from CSV_PATH on first use
+DEDUP_INDEX_PATH = os.path.join(OUTPUT_DIR, "transaction_index.txt")
+# layout fingerprint -> extraction strategy that last worked
+LAYOUT_CACHE_PATH = os.path.join(OUTPUT_DIR, "layout_cache.json")
+
+# Cached login sessions (cookies + web storage), one file per user
+SESSION_DIR = os.path.join(OUTPUT_DIR, "sessions")
+SESSION_MAX_AGE = 12 * 60 * 60  # seconds before a cached session is discarded
+
+# Login strategies in scraper/login.py, in the order tried for a target with
+# no recorded runs yet. Afterwards the strategy with the best recorded
+# latency per success goes first (stats per login host in LOGIN_STATS_PATH).
+LOGIN_STRATEGY_ORDER = ["session", "form", "spam", "inject"]
+LOGIN_STATS_PATH = os.path.join(OUTPUT_DIR, "login_stats.json")
+LOGIN_STATS_ALPHA = 0.3  # weight of the latest run in the moving averages
+
+# Multi-account runs normalize and export on background threads while
+# browsers keep scraping; batches are bounded so memory stays flat
+PIPELINE_QUEUE_SIZE = 8  # batches buffered between stages
+PIPELINE_BATCH_SIZE = 500  # transactions per batch
+
+# Per-run Chrome trace (timed spans + WebDriver command counts)
+TRACE_ENABLED = True
+TRACE_DIR = os.path.join(OUTPUT_DIR, "traces")
+
+# Streaming extraction of dashboards that load more rows on scroll/pagination
+SCROLL_EXTRACTION = True
+SCROLL_STEP = 0.8  # fraction of the visible list height scrolled per round
+SCROLL_IDLE_ROUNDS = 3  # stop after this many rounds without new rows
+SCROLL_MAX_ROUNDS = 500
+# Next-page / load-more controls, clicked once the list cannot scroll further
+PAGINATION_SELECTORS = [
+    "a[rel='next']",
+    "button[aria-label*='next' i]",
+    "[class*='pagination'] [class*='next']",
+    "//button[contains(., 'Load more') or contains(., 'Show more')]",
+    "//a[normalize-space(.)='Next' or normalize-space(.)='Next page']",
+    "//button[normalize-space(.)='Next' or normalize-space(.)='Next page']",
+]
+
+# Debug artifacts (screenshot + gzipped page source) for diagnosing runs
+DEBUG_DIR = os.path.join(OUTPUT_DIR, "debug")
+DEBUG_SUCCESS_SAMPLE = 20  # capture a successful login with probability 1/N (0 = failures only)
+DEBUG_MAX_ARTIFACTS = 50  # newest captures (screenshot + page source) kept in DEBUG_DIR
+DEBUG_PAGE_SUMMARY = True  # print an element summary when extraction finds nothing
+
+# Network-payload extraction (EXTRACT_MODE = "network"): JSON API responses
+# are read from Chrome's performance log instead of the rendered page
+# Chrome's performance log costs memory and CPU on every response, so it is
+# only enabled when network extraction will read it
+NETWORK_CAPTURE = EXTRACT_MODE == "network"
+API_URL_PATTERNS = [r"/api/", r"transaction", r"\.json(\?|$)"]  # regexes, case-insensitive
+# JSON keys (case-insensitive) mapped to transaction fields, first match wins
+API_FIELD_ALIASES = {
+    "description": ["description", "name", "title", "merchant", "payee", "memo"],
+    "amount": ["amount", "transactionAmount", "amountValue"],
+    "date": ["date", "transactionDate", "postedAt", "createdAt", "timestamp"],
+    "category": ["category", "type"],
+    "currency": ["currency", "currencyCode"],
+}
+
+# Browserless HTTP fast path (scraper.py --http): Chrome only logs in, data is
+# pulled over keep-alive HTTP with the session's cookies/token
+HTTP_DATA_URLS = [DASHBOARD_URL]  # fetched when no API endpoint was discovered
+HTTP_TOKEN_KEYS = ["authToken", "token", "accessToken", "access_token"]  # storage keys sent as Bearer
+HTTP_TIMEOUT = 15  # seconds per request
+HTTP_RETRIES = 2
+HTTP_POOL_SIZE = POOL_SIZE  # kept-alive connections per host
+
+# Scrape job queue (scraper.py --enqueue / --worker / --collect)
+JOB_DB_PATH = os.path.join(OUTPUT_DIR, "jobs.sqlite3")
+# True when workers on other machines open JOB_DB_PATH over shared storage:
+# WAL mode (the default) only works for processes on one host
+JOB_DB_SHARED = False
+JOB_LEASE_SECONDS = 300  # a job is re-leased if its worker stops heartbeating this long
+JOB_HEARTBEAT_SECONDS = 60
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30  # seconds before the first retry, doubled per attempt
+JOB_POLL_INTERVAL = 5  # seconds an idle worker waits before polling again
@@ -0,0 +1,150 @@
+# sampled debug artifacts (screenshot + page source), written in the background
+import gzip
+import os
+import queue
+import random
+import re
+import threading
+from datetime import datetime
+from scraper.config import DEBUG_DIR, DEBUG_SUCCESS_SAMPLE, DEBUG_MAX_ARTIFACTS
+
+class ArtifactCollector:
+    """
+    Captures a screenshot and the page source for later diagnosis.
+
+    Grabbing the screenshot and page source, gzipping, writing and pruning
+    old files all run on a background thread. A sampled success does not
+    wait for any of it; a failure waits until its page has been grabbed, so
+    the artifacts show the failing page and not whatever the caller loads
+    next.
+
+    Failures are always captured, successes with probability
+    1/success_sample (0 turns them off). The draw is random rather than
+    counted, so the rate holds when every run is its own process (one cron
+    job per account logs in once). Only the newest max_artifacts captures
+    (a .png and a .html.gz each) are kept.
+    """
+
+    def __init__(self, directory=DEBUG_DIR, success_sample=DEBUG_SUCCESS_SAMPLE,
+                 max_artifacts=DEBUG_MAX_ARTIFACTS, rng=None):
+        self.directory = directory
+        self.success_sample = success_sample
+        self.max_artifacts = max_artifacts
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def should_capture(self, failure=False):
+        """
+        Sampling decision: every failure, a success with probability 1/success_sample.
+        """
+        if failure:
+            return True
+        if self.success_sample <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < 1 / self.success_sample
+
+    def capture(self, driver, name, failure=False):
+        """
+        Capture artifacts for this page if sampled.
+
+        Returns:
+            str: Path prefix of the artifacts being written, or None if skipped.
+        """
+        if not self.should_capture(failure):
+            return None
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        prefix = os.path.join(self.directory, f"{stamp}-{'failure' if failure else 'sample'}-{_safe_name(name)}")
+        grabbed = threading.Event()
+        self._queue.put((prefix, driver, grabbed))
+        self._ensure_worker()
+        print(f"[debug] Capturing {prefix}.png / .html.gz in the background")
+        if failure:
+            grabbed.wait()
+        return prefix
+
+    def flush(self):
+        """
+        Block until every queued artifact has been written.
+        """
+        self._queue.join()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="debug-artifacts", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            prefix, driver, grabbed = self._queue.get()
+            try:
+                try:
+                    screenshot = driver.get_screenshot_as_png()
+                    page_source = driver.page_source
+                finally:
+                    grabbed.set()
+                self._write(prefix, screenshot, page_source)
+            except Exception as e:
+                print(f"[debug] Could not capture {prefix}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, prefix, screenshot, page_source):
+        os.makedirs(self.directory, exist_ok=True)
+        # PNG is already compressed; the page source shrinks ~10x with gzip
+        with open(f"{prefix}.png", "wb") as f:
+            f.write(screenshot)
+        with gzip.open(f"{prefix}.html.gz", "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(page_source)
+        self._prune()
+
+    def _prune(self):
+        if self.max_artifacts <= 0:
+            return
+        # A capture's .png and .html.gz are kept or removed together
+        captures = {}
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                stem = name[:-len(".html.gz")] if name.endswith(".html.gz") else os.path.splitext(name)[0]
+                captures.setdefault(stem, []).append(path)
+        # Names start with a timestamp, which breaks mtime ties between quick captures
+        stems = sorted(
+            captures, key=lambda stem: (max(os.path.getmtime(path) for path in captures[stem]), stem), reverse=True
+        )
+        for stem in stems[self.max_artifacts:]:
+            for path in captures[stem]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+_collector = None
+_collector_lock = threading.Lock()
+
+def get_collector():
+    """
+    Shared collector used by login/extraction/main.
+    """
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = ArtifactCollector()
+        return _collector
+
+def capture_artifacts(driver, name, failure=False):
+    return get_collector().capture(driver, name, failure)
+
+def flush_artifacts():
+    """
+    Wait for background writes; call before the process exits.
+    """
+    if _collector is not None:
+        _collector.flush()
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
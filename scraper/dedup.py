@@ -0,0 +1,170 @@
+# persisted content-hash index of transactions that were already exported
+import csv
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+from scraper.config import DEDUP_INDEX_PATH, CSV_PATH
+from scraper.strategies import MONEY_TOKEN_PATTERN, DATE_FORMATS
+
+# Fields that identify a transaction across runs
+KEY_FIELDS = ("date", "description", "amount", "account")
+# First line of an index file. Files without it hold keys of the raw
+# rendered strings (before amounts and dates were normalized) and are rebuilt.
+INDEX_HEADER = "# transaction-index v2"
+
+_MONEY_TOKEN = re.compile(MONEY_TOKEN_PATTERN)
+
+def transaction_key(transaction, occurrence=0):
+    """
+    Stable hash of a transaction's (date, description, amount, account).
+    Whitespace and case are normalized so re-rendered text hashes the same,
+    and the amount and date are hashed as the values normalization gives
+    them ("-$150" and "-150.0" are the same amount, "25 Jan 2021" and
+    "2021-01-25" the same date), so extraction changes and rows read back
+    from the export keep their keys.
+    occurrence tells identical rows of one account apart (two equal coffees on the same day).
+    """
+    parts = []
+    for field in KEY_FIELDS:
+        value = " ".join(str(transaction.get(field) or "").split()).lower()
+        if field == "amount":
+            value = _key_amount(value)
+        elif field == "date":
+            value = _key_date(value)
+        parts.append(value)
+    parts.append(str(occurrence))
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+@lru_cache(maxsize=4096)
+def _key_amount(text):
+    # Same reading as scraper.normalize: first money token, sign or parentheses make it negative
+    match = _MONEY_TOKEN.search(text)
+    if not match:
+        return text
+    amount = float(match["number"].replace(",", ""))
+    if match["paren"] or match["sign"] in ("-", "−") or match["sign_after"] in ("-", "−"):
+        amount = -amount
+    return repr(amount)
+
+@lru_cache(maxsize=4096)
+def _key_date(text):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return text
+
+def _keyed(transactions, occurrences=None):
+    """
+    Yield (transaction, key); repeats of a row get their occurrence in the key.
+    Counting starts afresh unless an occurrences dict from earlier calls is
+    passed in, which carries it over.
+    """
+    occurrences = {} if occurrences is None else occurrences
+    for transaction in transactions:
+        base = transaction_key(transaction)
+        occurrence = occurrences.get(base, 0)
+        occurrences[base] = occurrence + 1
+        yield transaction, transaction_key(transaction, occurrence) if occurrence else base
+
+class TransactionIndex:
+    """
+    Set of transaction keys stored one per line in an append-only file, so a
+    run costs in proportion to the new transactions it finds.
+
+    An index written with an older key format is rebuilt once from the rows
+    already in the CSV export (export_path), so upgrading does not re-append
+    the history.
+    """
+
+    def __init__(self, path=DEDUP_INDEX_PATH, export_path=CSV_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = set()
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = [line.strip() for line in f]
+        except FileNotFoundError:
+            lines = []
+        if lines and lines[0] != INDEX_HEADER:
+            self._keys = self._rebuild(export_path)
+        else:
+            self._keys = {line for line in lines[1:] if line}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def filter_new(self, transactions, occurrences=None):
+        """
+        Return only the transactions not seen in earlier runs (or earlier in
+        this run). Their keys are held as pending until commit().
+
+        Args:
+            transactions (list): Transaction dicts.
+            occurrences (dict): Occurrence counts shared by every batch of a
+                run, so a row repeated in a later batch (the same coffee one
+                scroll window further down) is numbered after the earlier one
+                instead of taken for it. Omitted, the batch is numbered alone.
+        """
+        new = []
+        with self._lock:
+            for transaction, key in _keyed(transactions, occurrences):
+                if key in self._keys or key in self._pending:
+                    continue
+                self._pending.add(key)
+                new.append(transaction)
+        return new
+
+    def commit(self):
+        """
+        Persist pending keys. Call after the export of those transactions is
+        finalized, so a failed run is re-exported rather than lost.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if f.tell() == 0:
+                    f.write(f"{INDEX_HEADER}\n")
+                f.write("".join(f"{key}\n" for key in sorted(self._pending)))
+                f.flush()
+                os.fsync(f.fileno())
+            self._keys |= self._pending
+            print(f"[dedup] Indexed {len(self._pending)} new transactions ({len(self._keys)} total)")
+            self._pending = set()
+
+    def discard_pending(self):
+        """
+        Forget keys from a run whose export failed.
+        """
+        with self._lock:
+            self._pending = set()
+
+    def _rebuild(self, export_path):
+        """
+        Replace an old-format index with the keys of the exported rows.
+
+        Returns:
+            set: The new keys.
+        """
+        keys = set()
+        try:
+            with open(export_path, encoding="utf-8", newline="") as f:
+                keys = {key for _, key in _keyed(csv.DictReader(f))}
+        except FileNotFoundError:
+            print(f"[dedup] No export at {export_path} to rebuild the index from; starting empty")
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{INDEX_HEADER}\n")
+            f.write("".join(f"{key}\n" for key in sorted(keys)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        print(f"[dedup] Rebuilt {self.path} from {export_path} ({len(keys)} transactions)")
+        return keys
@@ -1 +1,258 @@
-# csv/parquet export, screenshot, HTML save
+# streaming csv/parquet export of normalized transactions
+import os
+import shutil
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scraper.config import CSV_PATH, PARQUET_PATH, EXPORT_CHUNK_SIZE, KEEP_RAW_TEXT
+from scraper.normalize import normalize_transactions
+from scraper.trace import traced
+
+# Every export has the same columns, so chunks and appended runs line up
+TRANSACTION_SCHEMA = pa.schema([
+    ("account", pa.string()),
+    ("date", pa.timestamp("ns")),
+    ("description", pa.string()),
+    ("amount", pa.float64()),
+    ("currency", pa.string()),
+    ("category", pa.string()),
+])
+COLUMNS = TRANSACTION_SCHEMA.names
+# Raw element text, exported as a last column with keep_raw (config.KEEP_RAW_TEXT)
+RAW_TEXT_FIELD = pa.field("full_text", pa.string())
+
+def transaction_schema(keep_raw=False):
+    """
+    The export schema: TRANSACTION_SCHEMA, plus full_text when keep_raw.
+    """
+    return TRANSACTION_SCHEMA.append(RAW_TEXT_FIELD) if keep_raw else TRANSACTION_SCHEMA
+
+class TransactionWriter:
+    """
+    Streaming transaction writer.
+
+    Transactions are buffered up to chunk_size rows, normalized per chunk and
+    written as a Parquet row group or appended to a CSV, so memory stays flat
+    however long the history is. Output goes to a temporary file that
+    finalize() atomically moves into place.
+
+    With append=True only the new rows are written, so a run costs the same
+    however long the history is: a CSV gets them appended in place, and a
+    Parquet path becomes a dataset directory that gets them as a new part
+    file (an existing single file is moved into it as the first part).
+    pq.read_table() and pd.read_parquet() read the directory as one table.
+    An existing export with other columns is moved aside rather than appended to.
+
+    With keep_raw=True each row's raw element text is kept as a full_text column.
+    """
+
+    def __init__(self, path, file_format=None, append=False, chunk_size=EXPORT_CHUNK_SIZE, keep_raw=KEEP_RAW_TEXT):
+        self.path = path
+        self.file_format = file_format or ("parquet" if path.endswith(".parquet") else "csv")
+        self.append = append
+        self.chunk_size = chunk_size
+        self.keep_raw = keep_raw
+        self.schema = transaction_schema(keep_raw)
+        self.rows_written = 0
+        self._buffer = []
+        self._frames = []
+        self._frame_rows = 0
+        self._tmp_path = f"{path}.{os.getpid()}.{id(self)}.tmp"
+        self._parquet_writer = None
+        self._csv_has_header = False
+        self._closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if append and os.path.exists(path):
+            self._check_existing()
+
+    def write(self, transactions):
+        """
+        Add a chunk of transaction dicts; full chunks are flushed to disk.
+        """
+        self._buffer.extend(transactions)
+        while len(self._buffer) >= self.chunk_size:
+            chunk = self._buffer[:self.chunk_size]
+            del self._buffer[:self.chunk_size]
+            self._write_frame(normalize_transactions(chunk, keep_raw=self.keep_raw))
+
+    def write_frame(self, df):
+        """
+        Add an already-normalized DataFrame (see scraper.normalize); frames are
+        combined until a full chunk is buffered.
+        """
+        self._frames.append(df)
+        self._frame_rows += len(df)
+        if self._frame_rows >= self.chunk_size:
+            self._flush_frames()
+
+    def finalize(self):
+        """
+        Flush buffered rows and atomically replace the target file.
+
+        Returns:
+            int: Number of rows written by this writer (excluding appended-to rows).
+        """
+        if self._buffer:
+            self._write_frame(normalize_transactions(self._buffer, keep_raw=self.keep_raw))
+            self._buffer = []
+        self._flush_frames()
+        if self.file_format == "parquet" and self._parquet_writer is None and not self.append:
+            # Still produce a valid (empty) file with the schema
+            self._parquet_writer = pq.ParquetWriter(self._tmp_path, self.schema)
+        self._close()
+        if os.path.exists(self._tmp_path):
+            if self.append and self.file_format == "parquet":
+                self._add_part()
+            elif self.append and os.path.exists(self.path):
+                self._append_csv()
+            else:
+                if os.path.isdir(self.path):
+                    # Replacing an appended-to dataset with a single file
+                    shutil.rmtree(self.path)
+                os.replace(self._tmp_path, self.path)
+        print(f"[export] Wrote {self.rows_written} transactions to {self.path}")
+        return self.rows_written
+
+    def abort(self):
+        """
+        Discard everything written so far; the target file is left untouched.
+        """
+        self._close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
+
+    def _flush_frames(self):
+        if self._frames:
+            frames = [_conform(frame, self.schema.names) for frame in self._frames]
+            self._frames = []
+            self._frame_rows = 0
+            self._write_frame(pd.concat(frames, ignore_index=True))
+
+    def _write_frame(self, df):
+        df = _conform(df, self.schema.names)
+        if self.file_format == "parquet":
+            table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self._tmp_path, self.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            with open(self._tmp_path, "a", encoding="utf-8", newline="") as f:
+                df.to_csv(f, header=not self._csv_has_header, index=False)
+            self._csv_has_header = True
+        self.rows_written += len(df)
+
+    def _check_existing(self):
+        """
+        Make sure appended rows line up with the existing export. One written
+        with other columns (an older version, or another keep_raw setting) is
+        moved aside and a new file is started in its place.
+        """
+        if self.file_format == "parquet":
+            parts = _parquet_parts(self.path)
+            if parts and pq.read_schema(parts[-1]) != self.schema:
+                self._rotate(pq.read_schema(parts[-1]).names)
+        else:
+            with open(self.path, encoding="utf-8") as f:
+                header = f.readline().strip()
+            if header and header != ",".join(self.schema.names):
+                self._rotate(header.split(","))
+                header = ""
+            self._csv_has_header = bool(header)
+
+    def _rotate(self, columns):
+        stem, ext = os.path.splitext(self.path)
+        rotated = f"{stem}.{time.strftime('%Y%m%d-%H%M%S')}.old{ext}"
+        os.replace(self.path, rotated)
+        print(f"[export] {self.path} has columns {columns}, not {self.schema.names}; "
+              f"moved it to {rotated} and starting a new export")
+
+    def _append_csv(self):
+        """
+        Append the temporary file's rows to the target, truncating back to
+        the previous size if that fails halfway.
+        """
+        size = os.path.getsize(self.path)
+        try:
+            with open(self._tmp_path, "rb") as src, open(self.path, "ab") as dst:
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+        except BaseException:
+            with open(self.path, "r+b") as dst:
+                dst.truncate(size)
+            raise
+        finally:
+            os.remove(self._tmp_path)
+
+    def _add_part(self):
+        """
+        Move the temporary file into the dataset directory as its newest part.
+        """
+        if os.path.isfile(self.path):
+            # First append to a single-file export: it becomes the first part
+            first_part = _part_name(os.stat(self.path).st_mtime_ns, 0)
+            moved = f"{self._tmp_path}.{first_part}"
+            os.replace(self.path, moved)
+            os.makedirs(self.path)
+            os.replace(moved, os.path.join(self.path, first_part))
+        os.makedirs(self.path, exist_ok=True)
+        os.replace(self._tmp_path, os.path.join(self.path, _part_name(time.time_ns(), os.getpid())))
+
+    def _close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+@traced("export")
+def export_transactions(transactions, path=CSV_PATH, append=False):
+    """
+    Write a list of transactions to CSV or Parquet (chosen by extension).
+
+    Returns:
+        int: Number of rows written.
+    """
+    with TransactionWriter(path, append=append) as writer:
+        writer.write(transactions)
+    return writer.rows_written
+
+def _part_name(timestamp_ns, pid):
+    # Zero-padded so parts sort (and read back) in the order they were written
+    return f"part-{timestamp_ns:020d}-{pid}.parquet"
+
+def _parquet_parts(path):
+    """
+    Part files of a Parquet export, oldest first (the path itself if it is a single file).
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.startswith("part-") and name.endswith(".parquet")
+    )
+
+def _conform(df, names=COLUMNS):
+    """
+    Reorder/fill normalized columns to names with plain (non-categorical) dtypes.
+    """
+    columns = {}
+    for name in names:
+        if name not in df:
+            columns[name] = None
+        elif name in ("date", "amount"):
+            columns[name] = df[name]
+        else:
+            columns[name] = df[name].astype("string")
+    return df.assign(**columns)[names]
@@ -1,67 +1,371 @@
 # handles data scraping logic
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
+from scraper.config import (
+    EXTRACT_MODE, SCROLL_MAX_ROUNDS, SCROLL_IDLE_ROUNDS, SCROLL_STEP, PAGINATION_SELECTORS,
+    DEBUG_PAGE_SUMMARY
+)
+from scraper.dedup import transaction_key
+from scraper.layout import fingerprint_page, get_layout_cache
+from scraper.wait import wait_for_page_settled
+from scraper.trace import span, traced
+from scraper.strategies import (
+    CARD_SELECTORS, TABLE_ROW_SELECTOR, LIST_ITEM_SELECTOR, METHODS, MONEY_XPATH, MONEY_PARENT_XPATH,
+    extract_from_snapshot, match_snapshot, transactions_from_parent_texts, transaction_from_text,
+    transaction_from_cells, is_valid_transaction
+)
 
-def extract_transactions(driver, timeout=10):
+# Collects the raw text of every candidate row for all strategies in a single
+# round trip. Text is read the way WebElement.text reads it: trimmed innerText,
+# empty for elements that are not rendered.
+_SNAPSHOT_SCRIPT = """
+var cardSelectors = arguments[0], tableSelector = arguments[1],
+    listSelector = arguments[2], moneyXPath = arguments[3], methods = arguments[4];
+
+function textOf(el) {
+    if (!el || !el.getClientRects().length) { return ''; }
+    return (el.innerText || '').trim();
+}
+
+var snapshot = {};
+
+if (methods.indexOf('card') >= 0) {
+    snapshot.cards = cardSelectors.map(function (selector) {
+        var texts = [];
+        try {
+            document.querySelectorAll(selector).forEach(function (el) { texts.push(textOf(el)); });
+        } catch (e) {}
+        return {selector: selector, texts: texts};
+    });
+}
+
+if (methods.indexOf('table') >= 0) {
+    snapshot.table = Array.prototype.map.call(document.querySelectorAll(tableSelector), function (row) {
+        return Array.prototype.map.call(row.querySelectorAll('td'), textOf);
+    });
+}
+
+if (methods.indexOf('list') >= 0) {
+    snapshot.list = Array.prototype.map.call(document.querySelectorAll(listSelector), textOf);
+}
+
+if (methods.indexOf('generic') >= 0) {
+    snapshot.generic = [];
+    var matches = document.evaluate(moneyXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var parents = new Set();
+    for (var i = 0; i < matches.snapshotLength; i++) {
+        var parent = matches.snapshotItem(i).parentElement;
+        if (parent && !parents.has(parent)) {
+            parents.add(parent);
+            snapshot.generic.push(textOf(parent));
+        }
+    }
+}
+
+return snapshot;
+"""
+
+# Rendered text of each element, read the way WebElement.text reads it
+_TEXTS_SCRIPT = """
+return arguments[0].map(function (el) {
+    return el.getClientRects().length ? (el.innerText || '').trim() : '';
+});
+"""
+
+# Common elements counted by _debug_page_content
+_DEBUG_ELEMENTS = [
+    ["divs", "div"],
+    ["spans", "span"],
+    ["paragraphs", "p"],
+    ["lists", "ul, ol"],
+    ["tables", "table"],
+    ["cards", "[class*='card']"],
+    ["transactions", "[class*='transaction']"],
+]
+
+# Counts and the first three texts per selector, for the debug printout
+_PAGE_SUMMARY_SCRIPT = """
+return {
+    url: window.location.href,
+    title: document.title,
+    elements: arguments[0].map(function (entry) {
+        var found = document.querySelectorAll(entry[1]), texts = [];
+        for (var i = 0; i < Math.min(found.length, 3); i++) {
+            texts.push(found[i].getClientRects().length ? (found[i].innerText || '').trim().slice(0, 100) : '');
+        }
+        return {name: entry[0], count: found.length, texts: texts};
+    })
+};
+"""
+
+# Scrolls the nearest scrollable ancestor of the last matched row (or the
+# page) by a fraction of its height, so virtualized lists are stepped through
+# without skipping rows. At the end of the list, clicks the first enabled
+# pagination / load-more control instead.
+_ADVANCE_SCRIPT = """
+var rowSelector = arguments[0], paginationSelectors = arguments[1], step = arguments[2];
+
+function query(selector) {
+    try {
+        if (selector.indexOf('//') === 0) {
+            var found = [], result = document.evaluate(
+                selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < result.snapshotLength; i++) { found.push(result.snapshotItem(i)); }
+            return found;
+        }
+        return Array.prototype.slice.call(document.querySelectorAll(selector));
+    } catch (e) {
+        return [];
+    }
+}
+
+function scrollerOf(el) {
+    for (; el && el !== document.body && el !== document.documentElement; el = el.parentElement) {
+        var overflow = getComputedStyle(el).overflowY;
+        if (el.scrollHeight > el.clientHeight + 1 && /(auto|scroll|overlay)/.test(overflow)) { return el; }
+    }
+    return document.scrollingElement || document.documentElement;
+}
+
+var rows = query(rowSelector);
+var scroller = scrollerOf(rows.length ? rows[rows.length - 1] : null);
+var isPage = scroller === document.scrollingElement || scroller === document.documentElement;
+var before = scroller.scrollTop;
+scroller.scrollTop = before + Math.max(1, (isPage ? window.innerHeight : scroller.clientHeight) * step);
+if (scroller.scrollTop !== before) { return 'scroll'; }
+
+for (var i = 0; i < paginationSelectors.length; i++) {
+    var controls = query(paginationSelectors[i]);
+    for (var j = 0; j < controls.length; j++) {
+        var control = controls[j];
+        if (control.getClientRects().length && !control.disabled &&
+                control.getAttribute('aria-disabled') !== 'true') {
+            control.click();
+            return 'click';
+        }
+    }
+}
+return null;
+"""
+
+@traced("extract")
+def extract_transactions(driver, timeout=10, mode=None, layout_cache=None):
     """
     Extract transactions from the BankDashboard application.
     This function tries multiple approaches to find transaction data.
+
+    In "snapshot" mode the page is read with a single script call and the
+    strategies run locally on the result; "html" mode parses
+    driver.page_source with lxml instead; "webdriver" mode queries each
+    element through its own WebDriver command.
+
+    The page layout is fingerprinted first; if an earlier run recorded the
+    strategy that worked for this layout, only that one is tried before
+    falling back to the full sequence.
     """
-    print("[extract] Starting transaction extraction...")
+    transactions, _, _ = _extract_current(driver, timeout, mode, layout_cache)
+    if transactions:
+        return transactions
     
-    # Wait a moment for any dynamic content to load
-    time.sleep(2)
+    print("[extract] No transactions found with any method")
+    _debug_page_content(driver)
+    raise Exception("No known transaction layout found.")
+
+def iter_transaction_batches(driver, timeout=10, mode=None, layout_cache=None,
+                             max_rounds=SCROLL_MAX_ROUNDS, idle_rounds=SCROLL_IDLE_ROUNDS):
+    """
+    Extract transactions from a dashboard that loads more rows on scroll or
+    through pagination, yielding each batch of newly seen rows.
+
+    The first round works like extract_transactions(); later rounds scroll
+    the transaction list by most of a viewport (or click a next-page /
+    load-more control once it cannot scroll further), wait for the page to
+    settle and rerun only the strategy that matched. After a scroll, the rows
+    that were already in the previous window (its tail lines up with the
+    head of the new one) are skipped, so virtualized lists that recycle
+    their rows are read completely, and identical purchases further down
+    are kept. After a click, the new rows count as new unless the page
+    still starts with the previous rows (load-more). Only the previous
+    window's row hashes stay in memory. Stops after idle_rounds rounds
+    without new rows, or when there is nothing left to scroll or click.
+
+    Yields:
+        list: Transactions not seen in earlier batches.
+    """
+    mode = mode or EXTRACT_MODE
+    transactions, method, selector = _extract_current(driver, timeout, mode, layout_cache)
+    if not transactions:
+        print("[extract] No transactions found with any method")
+        _debug_page_content(driver)
+        raise Exception("No known transaction layout found.")
     
-    # Try different extraction methods based on the BankDashboard structure
-    transactions = []
+    previous = []
+    action = None
+    idle = 0
+    total = 0
+    for round_number in range(1, max_rounds + 1):
+        if round_number > 1:
+            with span("extract.wait_settled"):
+                wait_for_page_settled(driver, timeout=timeout)
+            transactions, _, _ = _run_strategies(driver, mode, [method], selector)
+        
+        new, keys = _new_rows(transactions, previous, action)
+        if keys:
+            previous = keys
+        if new:
+            idle = 0
+            total += len(new)
+            yield new
+        else:
+            idle += 1
+            if idle >= idle_rounds:
+                break
+        
+        action = _advance(driver, method, selector)
+        if action is None and not new:
+            break
     
-    # Method 1: Look for transaction cards/items
-    transactions = _extract_transaction_cards(driver)
-    if transactions:
-        print(f"[extract] Found {len(transactions)} transactions using card method")
-        return transactions
+    print(f"[extract] Streamed {total} transactions over {round_number} round(s)")
+
+def _extract_current(driver, timeout, mode, layout_cache):
+    """
+    Settle, fingerprint and run the cached or full strategy sequence once.
+
+    Returns:
+        tuple: (transactions, method, card selector or None)
+    """
+    mode = mode or EXTRACT_MODE
+    layout_cache = layout_cache or get_layout_cache()
+    print(f"[extract] Starting transaction extraction ({mode} mode)...")
     
-    # Method 2: Look for table-based transactions
-    transactions = _extract_transaction_table(driver)
-    if transactions:
-        print(f"[extract] Found {len(transactions)} transactions using table method")
-        return transactions
+    # Wait until dynamic content has stopped rendering (bounded by timeout)
+    with span("extract.wait_settled"):
+        wait_for_page_settled(driver, timeout=timeout)
     
-    # Method 3: Look for list-based transactions
-    transactions = _extract_transaction_list(driver)
-    if transactions:
-        print(f"[extract] Found {len(transactions)} transactions using list method")
-        return transactions
+    fingerprint = fingerprint_page(driver)
+    cached = layout_cache.get(fingerprint)
+    if cached:
+        print(f"[extract] Known layout {fingerprint}, trying {cached['strategy']} method first")
+        transactions, method, selector = _run_strategies(driver, mode, [cached["strategy"]], cached.get("selector"))
+        if transactions:
+            print(f"[extract] Found {len(transactions)} transactions using {method} method")
+            return transactions, method, selector
+        print("[extract] Cached method found nothing, trying all methods")
     
-    # Method 4: Generic approach - look for any elements with transaction-like content
-    transactions = _extract_generic_transactions(driver)
+    # Try different extraction methods based on the BankDashboard structure
+    transactions, method, selector = _run_strategies(driver, mode)
     if transactions:
-        print(f"[extract] Found {len(transactions)} transactions using generic method")
-        return transactions
+        print(f"[extract] Found {len(transactions)} transactions using {method} method")
+        if method in METHODS:
+            # Only DOM strategies describe the page layout
+            layout_cache.record(fingerprint, method, selector)
+    return transactions, method, selector
+
+def _new_rows(transactions, previous, action):
+    """
+    Rows of this round that were not in the previous round's window.
+
+    Args:
+        previous (list): Row hashes of the previous window, in order.
+        action (str): How the page moved since then ("scroll", "click" or None).
+
+    Returns:
+        tuple: (new transactions, row hashes of this window)
+    """
+    keys = [transaction_key(transaction) for transaction in transactions]
+    if action == "click":
+        # Load-more keeps the earlier rows on top; a next page starts over
+        overlap = len(previous) if keys[:len(previous)] == previous else 0
+    else:
+        overlap = _window_overlap(previous, keys)
+    return transactions[overlap:], keys
+
+def _window_overlap(previous, keys):
+    """
+    Length of the longest tail of previous that the new window starts with.
+    """
+    for size in range(min(len(previous), len(keys)), 0, -1):
+        if previous[-size:] == keys[:size]:
+            return size
+    return 0
+
+def _advance(driver, method, card_selector=None):
+    """
+    Scroll the transaction list, or click through to more rows when it is
+    already at the end.
+
+    Returns:
+        str: "scroll", "click", or None if there was nothing to do.
+    """
+    row_selector = card_selector if method == "card" else _ROW_SELECTORS.get(method, MONEY_XPATH)
+    return driver.execute_script(_ADVANCE_SCRIPT, row_selector, PAGINATION_SELECTORS, SCROLL_STEP)
+
+def _run_strategies(driver, mode, methods=METHODS, card_selector=None):
+    """
+    Run the given strategies in order with the chosen backend.
+
+    Returns:
+        tuple: (transactions, method, card selector or None)
+    """
+    card_selectors = [card_selector] if card_selector else CARD_SELECTORS
     
-    print("[extract] No transactions found with any method")
-    _debug_page_content(driver)
-    raise Exception("No known transaction layout found.")
+    if mode == "network":
+        from scraper.network import extract_from_network
+        with span("extract.network"):
+            transactions = extract_from_network(driver)
+        if transactions:
+            return transactions, "network", None
+        # No API response held transactions: read the rendered page instead
+        print("[extract] No transactions in captured API responses, using DOM strategies")
+        mode = "snapshot"
+        methods = [method for method in methods if method != "network"] or METHODS
+    
+    if mode == "html":
+        from scraper.parse import snapshot_html
+        with span("extract.html", methods=methods):
+            return match_snapshot(snapshot_html(driver.page_source, methods, card_selectors))
+    if mode == "snapshot":
+        with span("extract.snapshot", methods=methods):
+            return match_snapshot(snapshot_page(driver, methods, card_selectors))
+    
+    for method in methods:
+        selector = None
+        with span(f"extract.{method}"):
+            if method == "card":
+                transactions, selector = _extract_cards_by_selector(driver, card_selectors)
+            else:
+                transactions = _WEBDRIVER_STRATEGIES[method](driver)
+        if transactions:
+            return transactions, method, selector
+    return [], None, None
+
+def snapshot_page(driver, methods=METHODS, card_selectors=CARD_SELECTORS):
+    """
+    Collect the text of all candidate transaction rows in one script call.
+    Only the sections for the given methods are collected.
+
+    Returns:
+        dict: {"cards": [{"selector", "texts"}], "table": [[cell, ...]],
+               "list": [text], "generic": [text]}
+    """
+    return driver.execute_script(
+        _SNAPSHOT_SCRIPT, list(card_selectors), TABLE_ROW_SELECTOR, LIST_ITEM_SELECTOR,
+        MONEY_XPATH, list(methods)
+    )
 
 def _extract_transaction_cards(driver):
     """
     Extract transactions from card-based layout (common in modern dashboards).
     """
+    transactions, _ = _extract_cards_by_selector(driver, CARD_SELECTORS)
+    return transactions
+
+def _extract_cards_by_selector(driver, selectors):
+    """
+    Try card selectors in order; returns (transactions, winning selector).
+    """
     transactions = []
     
-    # Look for transaction cards - prioritize transaction-specific selectors
-    card_selectors = [
-        'div[class*="transaction"]',
-        'div[data-testid*="transaction"]',
-        '.transaction-card',
-        '.transaction-item',
-        'div[class*="card"]:not([class*="login"])',  # Exclude login cards
-        'div[class*="item"]:not([class*="login"])'   # Exclude login items
-    ]
-    
-    for selector in card_selectors:
+    for selector in selectors:
         try:
             cards = driver.find_elements(By.CSS_SELECTOR, selector)
             if cards:
@@ -69,16 +373,16 @@ def _extract_transaction_cards(driver):
                 
                 for card in cards:
                     transaction = _extract_from_element(card)
-                    if transaction and _is_valid_transaction(transaction):
+                    if transaction:
                         transactions.append(transaction)
                 
                 if transactions:
-                    return transactions
+                    return transactions, selector
         except Exception as e:
             print(f"[extract] Error with selector {selector}: {e}")
             continue
     
-    return transactions
+    return transactions, None
 
 def _extract_transaction_table(driver):
     """
@@ -88,22 +392,15 @@ def _extract_transaction_table(driver):
     
     try:
         # Look for table rows
-        rows = driver.find_elements(By.CSS_SELECTOR, "table tr, tbody tr")
+        rows = driver.find_elements(By.CSS_SELECTOR, TABLE_ROW_SELECTOR)
         if len(rows) > 1:  # Skip header row
             print(f"[extract] Found {len(rows)} table rows")
             
             for row in rows[1:]:  # Skip header
                 cells = row.find_elements(By.CSS_SELECTOR, "td")
-                if len(cells) >= 2:
-                    transaction = {
-                        "description": cells[0].text.strip() if len(cells) > 0 else "",
-                        "amount": cells[1].text.strip() if len(cells) > 1 else "",
-                        "date": cells[2].text.strip() if len(cells) > 2 else "",
-                        "category": cells[3].text.strip() if len(cells) > 3 else ""
-                    }
-                    
-                    if _is_valid_transaction(transaction):
-                        transactions.append(transaction)
+                transaction = transaction_from_cells([cell.text for cell in cells])
+                if transaction and is_valid_transaction(transaction):
+                    transactions.append(transaction)
     except Exception as e:
         print(f"[extract] Error extracting table: {e}")
     
@@ -117,13 +414,13 @@ def _extract_transaction_list(driver):
     
     try:
         # Look for list items that might contain transactions
-        items = driver.find_elements(By.CSS_SELECTOR, "ul li, ol li")
+        items = driver.find_elements(By.CSS_SELECTOR, LIST_ITEM_SELECTOR)
         if items:
             print(f"[extract] Found {len(items)} list items")
             
             for item in items:
                 transaction = _extract_from_element(item)
-                if transaction and _is_valid_transaction(transaction):
+                if transaction:
                     transactions.append(transaction)
     except Exception as e:
         print(f"[extract] Error extracting list: {e}")
@@ -133,132 +430,71 @@ def _extract_transaction_list(driver):
 def _extract_generic_transactions(driver):
     """
     Generic extraction method that looks for any elements containing transaction-like data.
+
+    The unique parents of all money-symbol elements are resolved by one
+    XPath query and their texts read with one script call, so the cost does
+    not grow with round trips per match.
     """
-    transactions = []
-    
     try:
-        # Look for any elements containing money amounts
-        money_elements = driver.find_elements(By.XPATH, "//*[contains(text(), '$') or contains(text(), '€') or contains(text(), '£') or contains(text(), 'USD') or contains(text(), 'EUR')]")
-        
-        print(f"[extract] Found {len(money_elements)} elements with money symbols")
-        
-        for element in money_elements:
-            # Try to find the parent container that might have the full transaction
-            try:
-                parent = element.find_element(By.XPATH, "..")
-                transaction = _extract_from_element(parent)
-                
-                if transaction and _is_valid_transaction(transaction) and transaction not in transactions:
-                    transactions.append(transaction)
-            except:
-                continue
-                
+        # "/.." yields each parent once, however many of its children match
+        parents = driver.find_elements(By.XPATH, MONEY_PARENT_XPATH)
+        print(f"[extract] Found {len(parents)} parents of elements with money symbols")
+        if not parents:
+            return []
+        return transactions_from_parent_texts(driver.execute_script(_TEXTS_SCRIPT, parents))
     except Exception as e:
         print(f"[extract] Error in generic extraction: {e}")
-    
-    return transactions
+        return []
 
 def _extract_from_element(element):
     """
-    Extract transaction data from a single element.
+    Extract a valid transaction from a single element, or None.
     """
     try:
-        text = element.text.strip()
-        if not text:
-            return None
-        
-        # Look for amount patterns (more comprehensive)
-        import re
-        amount_pattern = r'[\$€£]?\s*[\d,]+\.?\d*|[\d,]+\.?\d*\s*[\$€£USD EUR]'
-        amounts = re.findall(amount_pattern, text)
-        
-        # Look for date patterns
-        date_pattern = r'\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}|\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2}|\w{3}\s+\d{1,2},?\s+\d{4}'
-        dates = re.findall(date_pattern, text)
-        
-        # Extract the first line as description
-        lines = text.split('\n')
-        description = lines[0] if lines else text
-        
-        transaction = {
-            "description": description,
-            "amount": amounts[0] if amounts else "",
-            "date": dates[0] if dates else "",
-            "full_text": text
-        }
-        
-        # Only return if we have meaningful data
-        if transaction["description"] and len(transaction["description"]) > 2:
+        text = element.text
+        transaction = transaction_from_text(text)
+        if transaction and is_valid_transaction(transaction, text):
             return transaction
-            
     except Exception as e:
         print(f"[extract] Error extracting from element: {e}")
     
     return None
 
-def _is_valid_transaction(transaction):
-    """
-    Check if the extracted transaction is valid and not a login form element.
-    """
-    if not transaction or not transaction.get("description"):
-        return False
-    
-    description = transaction["description"].lower()
-    full_text = transaction.get("full_text", "").lower()
-    
-    # Filter out login form elements
-    login_keywords = [
-        "remember me", "forgot password", "login", "sign in", "email", "password",
-        "username", "submit", "welcome back", "securbank", "dashboard"
-    ]
-    
-    # Check if this looks like a login form element
-    for keyword in login_keywords:
-        if keyword in description or keyword in full_text:
-            return False
-    
-    # Must have some meaningful content
-    if len(description) < 3:
-        return False
-    
-    # Prefer transactions with amounts or dates
-    has_amount = transaction.get("amount") and len(transaction["amount"]) > 0
-    has_date = transaction.get("date") and len(transaction["date"]) > 0
-    has_money_symbol = any(symbol in full_text for symbol in ['$', '€', '£', 'USD', 'EUR'])
-    
-    # Accept if it has financial indicators or is substantial content
-    return has_amount or has_date or has_money_symbol or len(description) > 10
-
 def _debug_page_content(driver):
     """
     Debug function to print page content when no transactions are found.
+    Everything is gathered by one script call; config.DEBUG_PAGE_SUMMARY turns it off.
     """
+    if not DEBUG_PAGE_SUMMARY:
+        return
     print("\n[extract] DEBUG: Page content analysis")
-    print(f"Current URL: {driver.current_url}")
-    print(f"Page title: {driver.title}")
+    try:
+        summary = driver.execute_script(_PAGE_SUMMARY_SCRIPT, _DEBUG_ELEMENTS)
+    except Exception as e:
+        print(f"[extract] Could not summarize page: {e}")
+        return
+    print(f"Current URL: {summary['url']}")
+    print(f"Page title: {summary['title']}")
     
-    # Check for common elements
-    elements_to_check = [
-        ("divs", "div"),
-        ("spans", "span"),
-        ("paragraphs", "p"),
-        ("lists", "ul, ol"),
-        ("tables", "table"),
-        ("cards", "[class*='card']"),
-        ("transactions", "[class*='transaction']")
-    ]
-    
-    for name, selector in elements_to_check:
-        try:
-            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            print(f"  {name}: {len(elements)} found")
-            
-            # Show first few elements with text
-            for i, elem in enumerate(elements[:3]):
-                text = elem.text.strip()[:100]
-                if text:
-                    print(f"    [{i}] {text}...")
-        except:
-            pass
+    for entry in summary["elements"]:
+        print(f"  {entry['name']}: {entry['count']} found")
+        # Show first few elements with text
+        for i, text in enumerate(entry["texts"]):
+            if text:
+                print(f"    [{i}] {text}...")
     
     print("=" * 50)
+
+# Elements whose scroll container is advanced, per strategy
+_ROW_SELECTORS = {
+    "table": TABLE_ROW_SELECTOR,
+    "list": LIST_ITEM_SELECTOR,
+    "generic": MONEY_XPATH,
+}
+
+_WEBDRIVER_STRATEGIES = {
+    "card": _extract_transaction_cards,
+    "table": _extract_transaction_table,
+    "list": _extract_transaction_list,
+    "generic": _extract_generic_transactions,
+}
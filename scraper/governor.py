@@ -0,0 +1,157 @@
+# per-driver resource accounting (page loads, age, process-tree RSS) and recycle decisions
+import os
+import threading
+import time
+from scraper.config import DRIVER_MAX_PAGES, DRIVER_MAX_AGE, DRIVER_MAX_RSS_MB
+
+try:
+    import psutil
+except ImportError:
+    # /proc is read directly instead (Linux only)
+    psutil = None
+
+class DriverGovernor:
+    """
+    Tracks how many pages each driver has loaded, how long ago it was
+    launched and the resident memory of its process tree (chromedriver plus
+    the Chrome processes it started), and says when a driver should be
+    recycled. BrowserPool asks on every release, between two jobs, so no
+    work in progress is lost.
+    """
+
+    def __init__(self, max_pages=DRIVER_MAX_PAGES, max_age=DRIVER_MAX_AGE, max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.max_rss_mb = max_rss_mb
+        self._lock = threading.Lock()
+        self._drivers = {}  # id(driver) -> {"launched", "pages"}
+
+    def track(self, driver):
+        """
+        Start accounting for a freshly launched driver; get() and refresh()
+        are wrapped to count page loads.
+        """
+        stats = {"launched": time.monotonic(), "pages": 0}
+        with self._lock:
+            self._drivers[id(driver)] = stats
+
+        for name in ("get", "refresh"):
+            method = getattr(driver, name, None)
+            if method is None:
+                continue
+
+            def counted(*args, _method=method, **kwargs):
+                with self._lock:
+                    stats["pages"] += 1
+                return _method(*args, **kwargs)
+
+            setattr(driver, name, counted)
+        return driver
+
+    def forget(self, driver):
+        with self._lock:
+            self._drivers.pop(id(driver), None)
+
+    def usage(self, driver):
+        """
+        Returns:
+            dict: {"pages", "age" (seconds), "rss_mb" (None if unknown)}
+        """
+        with self._lock:
+            stats = dict(self._drivers.get(id(driver)) or {"launched": time.monotonic(), "pages": 0})
+        rss = process_tree_rss(driver_pid(driver)) if self.max_rss_mb is not None else None
+        return {
+            "pages": stats["pages"],
+            "age": time.monotonic() - stats["launched"],
+            "rss_mb": None if rss is None else rss / (1024 * 1024),
+        }
+
+    def recycle_reason(self, driver):
+        """
+        Why driver should be recycled, or None while it is within every limit.
+        """
+        usage = self.usage(driver)
+        if self.max_pages is not None and usage["pages"] >= self.max_pages:
+            return f"{usage['pages']} pages loaded"
+        if self.max_age is not None and usage["age"] >= self.max_age:
+            return f"{usage['age'] / 60:.0f} min old"
+        if self.max_rss_mb is not None and usage["rss_mb"] is not None and usage["rss_mb"] >= self.max_rss_mb:
+            return f"{usage['rss_mb']:.0f} MB resident"
+        return None
+
+def driver_pid(driver):
+    """
+    PID of the chromedriver process behind driver (None for fakes/remote drivers).
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+def process_alive(pid):
+    """
+    True if a process with this pid exists.
+    """
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name != "posix":
+        # os.kill() would terminate it on Windows; assume it is alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def process_tree_rss(pid):
+    """
+    Resident set size in bytes of pid and all its descendants, or None if
+    it cannot be read on this platform.
+    """
+    if pid is None:
+        return None
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    return _proc_tree_rss(pid)
+
+def _proc_tree_rss(pid, proc="/proc"):
+    try:
+        entries = [entry for entry in os.listdir(proc) if entry.isdigit()]
+    except OSError:
+        return None
+
+    children = {}
+    for entry in entries:
+        try:
+            with open(os.path.join(proc, entry, "stat"), encoding="utf-8") as f:
+                # The command name may contain spaces; fields resume after its ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    found = False
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(os.path.join(proc, str(current), "statm"), encoding="utf-8") as f:
+                total += int(f.read().split()[1]) * page_size
+            found = True
+        except (OSError, IndexError, ValueError):
+            pass
+        pending.extend(children.get(current, []))
+    return total if found else None
@@ -0,0 +1,175 @@
+# browserless data pulls over keep-alive HTTP, reusing a logged-in session
+import json
+import threading
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, urljoin
+import urllib3
+from scraper.config import (
+    LOGIN_URL, HTTP_DATA_URLS, HTTP_TIMEOUT, HTTP_RETRIES, HTTP_POOL_SIZE, HTTP_TOKEN_KEYS
+)
+from scraper.session import session_snapshot, load_session
+from scraper.trace import span
+
+class SessionExpired(Exception):
+    """
+    The server rejected the copied session (401/403 or a redirect to the login page).
+    """
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool_manager():
+    """
+    Shared urllib3 PoolManager: connections are kept alive across clients and requests.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = urllib3.PoolManager(
+                maxsize=HTTP_POOL_SIZE,
+                retries=urllib3.Retry(total=HTTP_RETRIES, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+                timeout=urllib3.Timeout(total=HTTP_TIMEOUT),
+            )
+        return _pool
+
+class SessionClient:
+    """
+    HTTP client carrying the cookies and bearer token of a browser session.
+
+    Built from a logged-in driver (from_driver) or from a cached session file
+    (from_session), so data can be pulled without Chrome once authenticated.
+    """
+
+    def __init__(self, cookies=None, token=None, user_agent=None, api_urls=None, pool_manager=None):
+        self.cookies = [cookie for cookie in cookies or [] if not _expired(cookie)]
+        self.token = token
+        self.user_agent = user_agent
+        # Data endpoints the page was seen loading (see scraper.network)
+        self.api_urls = list(api_urls or [])
+        self.pool = pool_manager or get_pool_manager()
+
+    @classmethod
+    def from_session_data(cls, data, user_agent=None, api_urls=None):
+        storage = {**(data.get("session_storage") or {}), **(data.get("local_storage") or {})}
+        token = next((storage[key] for key in HTTP_TOKEN_KEYS if storage.get(key)), None)
+        return cls(data.get("cookies"), token, user_agent, api_urls)
+
+    @classmethod
+    def from_driver(cls, driver):
+        """
+        Copy the session out of a logged-in driver, along with the API
+        endpoints it loaded transactions from.
+        """
+        from scraper.network import collect_api_payloads, transactions_from_payload
+
+        api_urls = [url for url, payload in collect_api_payloads(driver) if transactions_from_payload(payload)]
+        user_agent = driver.execute_script("return navigator.userAgent;")
+        return cls.from_session_data(session_snapshot(driver), user_agent, api_urls)
+
+    @classmethod
+    def from_session(cls, username):
+        """
+        Client for a cached session file, or None if there is no usable one.
+        """
+        data = load_session(username)
+        return cls.from_session_data(data, api_urls=data.get("api_urls")) if data else None
+
+    def get(self, url, redirects=5):
+        """
+        GET url with the session's cookies and token (following at most `redirects` redirects).
+
+        Returns:
+            tuple: (content type, body text)
+
+        Raises:
+            SessionExpired: If the server no longer accepts the session.
+        """
+        headers = {"Accept": "application/json, text/html;q=0.9"}
+        cookie_header = self.cookie_header(url)
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if self.user_agent:
+            headers["User-Agent"] = self.user_agent
+
+        with span("http.get", url=url):
+            response = self.pool.request("GET", url, headers=headers, redirect=False)
+        location = response.headers.get("Location")
+        if response.status in (301, 302, 303, 307, 308) and location and redirects > 0:
+            target = urljoin(url, location)
+            if urlsplit(target).path == urlsplit(LOGIN_URL).path:
+                raise SessionExpired(f"{url} redirected to the login page")
+            self._store_cookies(response, url)
+            return self.get(target, redirects - 1)
+        if response.status in (401, 403):
+            raise SessionExpired(f"{url} answered {response.status}")
+        if response.status >= 400:
+            raise Exception(f"GET {url} failed with HTTP {response.status}")
+        self._store_cookies(response, url)
+        return response.headers.get("Content-Type", ""), response.data.decode("utf-8", errors="replace")
+
+    def cookie_header(self, url):
+        """
+        Cookie header value for url (domain, path and secure flag honoured).
+        """
+        parts = urlsplit(url)
+        host, path = parts.hostname or "", parts.path or "/"
+        pairs = []
+        for cookie in self.cookies:
+            domain = (cookie.get("domain") or host).lstrip(".")
+            if host != domain and not host.endswith("." + domain):
+                continue
+            if not path.startswith(cookie.get("path") or "/"):
+                continue
+            if cookie.get("secure") and parts.scheme != "https":
+                continue
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+        return "; ".join(pairs)
+
+    def _store_cookies(self, response, url):
+        headers = response.headers.getlist("Set-Cookie") if hasattr(response.headers, "getlist") else []
+        for header in headers:
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies = [cookie for cookie in self.cookies if cookie["name"] != name]
+                self.cookies.append({
+                    "name": name,
+                    "value": morsel.value,
+                    "domain": morsel["domain"] or urlsplit(url).hostname,
+                    "path": morsel["path"] or "/",
+                    "secure": bool(morsel["secure"]),
+                })
+
+def fetch_transactions(client, urls=None):
+    """
+    Pull transactions over HTTP: JSON responses go through the network
+    payload walker, HTML pages through the lxml strategies.
+
+    Args:
+        urls (list): Pages or endpoints to fetch; defaults to the endpoints the
+            browser used (client.api_urls), then config.HTTP_DATA_URLS.
+
+    Returns:
+        list: Transactions from every URL.
+
+    Raises:
+        SessionExpired: If the session was rejected.
+    """
+    from scraper.network import transactions_from_payload
+    from scraper.parse import extract_transactions_from_html
+
+    transactions = []
+    for url in urls or client.api_urls or HTTP_DATA_URLS:
+        content_type, body = client.get(url)
+        if "json" in content_type:
+            found = transactions_from_payload(json.loads(body))
+        else:
+            found = extract_transactions_from_html(body)
+        print(f"[http] {len(found)} transactions from {url}")
+        transactions.extend(found)
+    return transactions
+
+def _expired(cookie):
+    expiry = cookie.get("expiry")
+    return expiry is not None and expiry < time.time()
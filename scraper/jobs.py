@@ -0,0 +1,324 @@
+# leased scrape-job queue shared by worker processes (SQLite backend)
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from scraper.config import (
+    JOB_DB_PATH, JOB_LEASE_SECONDS, JOB_HEARTBEAT_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_DELAY,
+    JOB_POLL_INTERVAL, JOB_DB_SHARED
+)
+
+# One account to scrape on a dashboard route, with free-form options
+Job = namedtuple("Job", "id account route options status attempts max_attempts worker error result")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    route TEXT,
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at);
+"""
+_COLUMNS = "id, account, route, options, status, attempts, max_attempts, worker, error, result"
+
+class JobQueue:
+    """
+    Scrape jobs in a SQLite database that any number of worker processes lease from.
+
+    A job moves queued -> leased -> done (or back to queued for a retry, or
+    failed after max_attempts). Leases expire unless the worker heartbeats,
+    so jobs of a crashed worker are picked up again by others. Finished
+    results stay in the table until collect() marks them collected.
+
+    By default the database is in WAL mode, whose shared-memory index only
+    works for processes on one host. With shared=True (config.JOB_DB_SHARED)
+    it uses a rollback journal instead, which relies on file locks alone, so
+    workers on other machines can open it from a network filesystem with
+    working byte-range locks (many NFS and SMB mounts do not provide them).
+    Without those, use another backend exposing the same methods.
+    """
+
+    def __init__(self, path=JOB_DB_PATH, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS,
+                 retry_delay=JOB_RETRY_DELAY, shared=JOB_DB_SHARED):
+        self.path = path
+        self.journal_mode = "DELETE" if shared else "WAL"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as db:
+            db.executescript(_SCHEMA)
+
+    def enqueue(self, account, route=None, options=None, max_attempts=None, delay=0):
+        """
+        Add a job.
+
+        Returns:
+            int: The job id.
+        """
+        now = time.time()
+        with self._connection() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (account, route, options, max_attempts, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (account, route, json.dumps(options or {}), max_attempts or self.max_attempts,
+                 now + delay, now, now)
+            )
+            return cursor.lastrowid
+
+    def lease(self, worker):
+        """
+        Take the oldest available job (including ones whose lease expired).
+
+        Returns:
+            Job: The leased job, or None if nothing is available.
+        """
+        now = time.time()
+        with self._connection() as db:
+            # Take the write lock first so two workers cannot lease the same row
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases of jobs with no attempts left are not retried
+                db.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'lease expired', worker = NULL, updated_at = ?"
+                    " WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                    (now, now)
+                )
+                row = db.execute(
+                    "SELECT id FROM jobs"
+                    " WHERE (status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?)"
+                    " ORDER BY available_at, id LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1,"
+                        " lease_expires = ?, updated_at = ? WHERE id = ?",
+                        (worker, now + self.lease_seconds, now, row[0])
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def heartbeat(self, job_id, worker):
+        """
+        Extend the lease of a job this worker holds.
+
+        Returns:
+            bool: False if the lease was lost (expired and taken by another worker).
+        """
+        now = time.time()
+        return self._update_owned(
+            job_id, worker, "lease_expires = ?, updated_at = ?", (now + self.lease_seconds, now)
+        )
+
+    def complete(self, job_id, worker, result=None):
+        """
+        Store a job's result and mark it done.
+        """
+        return self._update_owned(
+            job_id, worker, "status = 'done', result = ?, error = NULL, lease_expires = NULL, updated_at = ?",
+            (json.dumps(result), time.time())
+        )
+
+    def fail(self, job_id, worker, error, retry_delay=None):
+        """
+        Record a failed attempt: the job is queued again after a backoff
+        (retry_delay, default the queue's, doubled per attempt) until
+        max_attempts is reached.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        if retry_delay is None:
+            retry_delay = self.retry_delay
+        now = time.time()
+        if job.attempts < job.max_attempts:
+            delay = retry_delay * 2 ** (job.attempts - 1)
+            return self._update_owned(
+                job_id, worker,
+                "status = 'queued', worker = NULL, lease_expires = NULL, available_at = ?, error = ?, updated_at = ?",
+                (now + delay, str(error), now)
+            )
+        return self._update_owned(
+            job_id, worker, "status = 'failed', lease_expires = NULL, error = ?, updated_at = ?", (str(error), now)
+        )
+
+    def get(self, job_id):
+        with self._connection() as db:
+            row = db.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def jobs(self, status=None):
+        """
+        All jobs, or those with the given status, oldest first.
+        """
+        query = f"SELECT {_COLUMNS} FROM jobs"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._connection() as db:
+            return [_job(row) for row in db.execute(query + " ORDER BY id", params)]
+
+    def collect(self, job_ids):
+        """
+        Mark done jobs as collected once their results have been exported.
+        """
+        with self._connection() as db:
+            db.executemany(
+                "UPDATE jobs SET status = 'collected', updated_at = ? WHERE id = ? AND status = 'done'",
+                [(time.time(), job_id) for job_id in job_ids]
+            )
+
+    def next_available_at(self):
+        """
+        Earliest time a queued job (after its retry backoff) or a running
+        job's expired lease can be leased.
+
+        Returns:
+            float: Unix time, or None once no job is queued or leased.
+        """
+        with self._connection() as db:
+            row = db.execute(
+                "SELECT MIN(CASE status WHEN 'queued' THEN available_at ELSE lease_expires END)"
+                " FROM jobs WHERE status IN ('queued', 'leased')"
+            ).fetchone()
+        return row[0]
+
+    def counts(self):
+        """
+        Number of jobs per status.
+        """
+        with self._connection() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def _update_owned(self, job_id, worker, assignments, params):
+        with self._connection() as db:
+            cursor = db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ? AND status = 'leased'",
+                (*params, job_id, worker)
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def _connection(self):
+        # Autocommit; lease() opens its own write transaction
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            db.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            db.execute("PRAGMA busy_timeout=30000")
+            yield db
+        finally:
+            db.close()
+
+def _job(row):
+    job = Job(*row)
+    return job._replace(
+        options=json.loads(job.options or "{}"),
+        result=json.loads(job.result) if job.result else None,
+    )
+
+def worker_name():
+    """
+    Default worker id: host and process, so nodes can be told apart.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def run_worker(queue, handler, slots=1, worker=None, stop_when_idle=False,
+               poll_interval=JOB_POLL_INTERVAL, heartbeat_interval=JOB_HEARTBEAT_SECONDS):
+    """
+    Lease and run jobs on slots threads (one per pooled browser) until
+    stopped, or until the queue is drained with stop_when_idle=True: no job
+    left queued (retries waiting out their backoff included) or leased.
+
+    handler(job) does the work and returns a JSON-serializable result; an
+    exception fails the attempt. Leases are renewed in the background while
+    the handler runs.
+
+    Returns:
+        int: Number of jobs completed by this worker.
+    """
+    worker = worker or worker_name()
+    completed = [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+    # Notified when a slot finishes a job, so idle slots re-check the queue
+    changed = threading.Condition()
+
+    def slot(index):
+        name = f"{worker}/{index}"
+        while not stop.is_set():
+            job = queue.lease(name)
+            if job is None:
+                with changed:
+                    wait = poll_interval
+                    if stop_when_idle:
+                        available_at = queue.next_available_at()
+                        if available_at is None:
+                            return
+                        wait = min(poll_interval, max(0, available_at - time.time()))
+                    changed.wait(wait)
+                continue
+            print(f"[jobs] {name} leased job {job.id} ({job.account} {job.route or ''}, attempt {job.attempts})")
+            if _run_job(queue, handler, job, name, heartbeat_interval):
+                with lock:
+                    completed[0] += 1
+            with changed:
+                changed.notify_all()
+
+    with ThreadPoolExecutor(max_workers=slots) as executor:
+        futures = [executor.submit(slot, index) for index in range(slots)]
+        try:
+            for future in futures:
+                future.result()
+        except KeyboardInterrupt:
+            stop.set()
+            with changed:
+                changed.notify_all()
+            raise
+    print(f"[jobs] {worker} completed {completed[0]} job(s)")
+    return completed[0]
+
+def _run_job(queue, handler, job, worker, heartbeat_interval):
+    done = threading.Event()
+
+    def keep_leased():
+        while not done.wait(heartbeat_interval):
+            if not queue.heartbeat(job.id, worker):
+                print(f"[jobs] {worker} lost the lease on job {job.id}")
+                return
+
+    heartbeat = threading.Thread(target=keep_leased, daemon=True)
+    heartbeat.start()
+    try:
+        result = handler(job)
+    except Exception as e:
+        print(f"[jobs] Job {job.id} failed: {e}")
+        queue.fail(job.id, worker, e)
+        return False
+    finally:
+        done.set()
+        heartbeat.join()
+    if not queue.complete(job.id, worker, result):
+        print(f"[jobs] Job {job.id} finished after its lease was lost; result dropped")
+        return False
+    return True
@@ -0,0 +1,89 @@
+# page layout fingerprinting and the persisted layout -> winning strategy cache
+import json
+import os
+import threading
+from scraper.config import (
+    LAYOUT_CACHE_PATH, HOMEPAGE1_CONTAINER_SELECTOR, HOMEPAGE1_ROW_SELECTOR, HOMEPAGE2_ITEM_SELECTOR
+)
+
+# Structural markers; which of them are present (not how often) identifies a layout
+LAYOUT_MARKERS = {
+    "homepage1_container": HOMEPAGE1_CONTAINER_SELECTOR,
+    "homepage1_rows": HOMEPAGE1_ROW_SELECTOR,
+    "homepage2_items": HOMEPAGE2_ITEM_SELECTOR,
+    "transaction_cards": 'div[class*="transaction"], div[data-testid*="transaction"]',
+    "table_rows": "table tr",
+    "login_form": "input#email",
+}
+
+_FINGERPRINT_SCRIPT = """
+var markers = arguments[0], present = [];
+Object.keys(markers).forEach(function (name) {
+    try { if (document.querySelector(markers[name])) { present.push(name); } } catch (e) {}
+});
+return {path: window.location.pathname, present: present};
+"""
+
+def fingerprint_page(driver):
+    """
+    Fingerprint the current page by route and structural markers in one script call.
+
+    Returns:
+        str: e.g. "/homepage2|homepage2_items"
+    """
+    result = driver.execute_script(_FINGERPRINT_SCRIPT, LAYOUT_MARKERS)
+    return f"{result['path']}|{','.join(sorted(result['present']))}"
+
+class LayoutCache:
+    """
+    Persisted mapping of layout fingerprint -> {"strategy", "selector"} that last worked.
+    """
+
+    def __init__(self, path=LAYOUT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, fingerprint):
+        with self._lock:
+            return self._entries.get(fingerprint)
+
+    def record(self, fingerprint, strategy, selector=None):
+        """
+        Remember the strategy (and card selector) that worked for a layout.
+        """
+        entry = {"strategy": strategy, "selector": selector}
+        with self._lock:
+            if self._entries.get(fingerprint) == entry:
+                return
+            self._entries[fingerprint] = entry
+            self._save()
+
+    def forget(self, fingerprint):
+        with self._lock:
+            if self._entries.pop(fingerprint, None) is not None:
+                self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_layout_cache():
+    """
+    Shared LayoutCache for LAYOUT_CACHE_PATH, loaded on first use.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LayoutCache()
+        return _default_cache
@@ -0,0 +1,115 @@
+# persisted per-target success rates and latencies of the login strategies
+import json
+import os
+import threading
+from contextlib import contextmanager
+from scraper.config import LOGIN_STATS_PATH, LOGIN_STATS_ALPHA
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process lock (Windows): concurrent workers may lose some runs
+    fcntl = None
+
+class LoginStats:
+    """
+    Persisted mapping of target -> strategy -> {"attempts", "successes",
+    "rate", "latency"}, where rate is a moving average of outcomes (1/0) and
+    latency a moving average of successful runs in seconds, so the ranking
+    follows a site that changes its login behaviour.
+
+    Several worker processes can share the file: record() re-reads it and
+    applies its run under a file lock, so no process overwrites the runs
+    another one recorded.
+    """
+
+    def __init__(self, path=LOGIN_STATS_PATH, alpha=LOGIN_STATS_ALPHA):
+        self.path = path
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._targets = self._load()
+
+    def get(self, target, strategy):
+        with self._lock:
+            entry = self._targets.get(target, {}).get(strategy)
+            return dict(entry) if entry else None
+
+    def record(self, target, strategy, success, seconds):
+        """
+        Add one run of a strategy against target.
+        """
+        with self._lock, self._file_lock():
+            # Start from what other processes have recorded since
+            self._targets = self._load()
+            entry = self._targets.setdefault(target, {}).get(strategy)
+            if entry is None:
+                entry = self._targets[target][strategy] = {
+                    "attempts": 0, "successes": 0, "rate": float(success), "latency": None,
+                }
+            entry["attempts"] += 1
+            entry["rate"] += self.alpha * (float(success) - entry["rate"])
+            if success:
+                entry["successes"] += 1
+                latency = entry["latency"]
+                entry["latency"] = seconds if latency is None else latency + self.alpha * (seconds - latency)
+            self._save()
+
+    def order(self, target, strategies):
+        """
+        Strategies by expected time to a successful login (latency / rate)
+        for those that have succeeded, then untried ones, then ones that
+        never succeeded; ties keep the given order.
+        """
+        with self._lock:
+            entries = self._targets.get(target, {})
+
+            def rank(indexed):
+                index, strategy = indexed
+                entry = entries.get(strategy)
+                if not entry or not entry["attempts"]:
+                    return (1, 0.0, index)
+                if not entry["successes"] or entry["rate"] <= 0:
+                    return (2, 0.0, index)
+                return (0, entry["latency"] / entry["rate"], index)
+
+            return [strategy for _, strategy in sorted(enumerate(strategies), key=rank)]
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._targets, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+_default_stats = None
+_default_stats_lock = threading.Lock()
+
+def get_login_stats():
+    """
+    Shared LoginStats for LOGIN_STATS_PATH, loaded on first use.
+    """
+    global _default_stats
+    with _default_stats_lock:
+        if _default_stats is None:
+            _default_stats = LoginStats()
+        return _default_stats
@@ -0,0 +1,150 @@
+# transactions read straight from the dashboard's captured API responses
+import base64
+import json
+import re
+from datetime import datetime, timezone
+from scraper.config import API_URL_PATTERNS, API_FIELD_ALIASES
+from scraper.transaction import Transaction
+
+_API_URL_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in API_URL_PATTERNS]
+# Codes scraper.normalize recognizes after a number
+_CURRENCY_CODES = {"USD", "EUR", "GBP"}
+
+def extract_from_network(driver):
+    """
+    Transactions from JSON API responses captured since the last
+    reset_network_capture(). Needs the performance log enabled in
+    launch_browser (config.NETWORK_CAPTURE).
+
+    Returns:
+        list: Transactions (description/amount/date[/category]), or []
+        if no captured response contained transactions.
+    """
+    transactions = []
+    for url, payload in collect_api_payloads(driver):
+        found = transactions_from_payload(payload)
+        if found:
+            print(f"[network] {len(found)} transactions in {url}")
+            transactions.extend(found)
+    return transactions
+
+def collect_api_payloads(driver):
+    """
+    Drain the performance log, fetch the bodies of new JSON responses whose
+    URL matches config.API_URL_PATTERNS, and return every payload captured
+    so far as (url, parsed JSON) pairs.
+    """
+    state = _capture_state(driver)
+    for entry in _performance_log(driver):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params", {})
+        response = params.get("response", {})
+        url = response.get("url", "")
+        request_id = params.get("requestId")
+        if request_id in state or "json" not in response.get("mimeType", ""):
+            continue
+        if not any(pattern.search(url) for pattern in _API_URL_PATTERNS):
+            continue
+        state[request_id] = (url, _response_json(driver, request_id, url))
+    return [(url, payload) for url, payload in state.values() if payload is not None]
+
+def reset_network_capture(driver):
+    """
+    Forget captured responses (and drain pending log entries), e.g. before
+    another account logs in on a reused driver.
+    """
+    _performance_log(driver)
+    driver._scraper_api_payloads = {}
+
+def transactions_from_payload(payload):
+    """
+    Walk a JSON document for transaction-like objects inside lists (an amount
+    plus a description or date) and map their fields, in document order.
+    """
+    transactions = []
+    _walk(payload, transactions)
+    return transactions
+
+def _walk(node, transactions):
+    if isinstance(node, dict):
+        for value in node.values():
+            _walk(value, transactions)
+    elif isinstance(node, list):
+        for item in node:
+            transaction = _map_record(item) if isinstance(item, dict) else None
+            if transaction:
+                transactions.append(transaction)
+            else:
+                _walk(item, transactions)
+
+def _map_record(record):
+    fields = {}
+    lowered = {key.lower(): value for key, value in record.items()}
+    for field, aliases in API_FIELD_ALIASES.items():
+        for alias in aliases:
+            value = lowered.get(alias.lower())
+            if value not in (None, "") and not isinstance(value, (dict, list)):
+                fields[field] = value
+                break
+    if "amount" not in fields or not ("description" in fields or "date" in fields):
+        return None
+
+    amount = fields["amount"]
+    if isinstance(amount, float):
+        amount = format(amount, "f").rstrip("0").rstrip(".")
+    amount = str(amount)
+    currency = str(fields.get("currency", "")).upper()
+    if currency in _CURRENCY_CODES and not re.search(r"[A-Za-z$€£]", amount):
+        amount = f"{amount} {currency}"
+
+    return Transaction(
+        description=str(fields.get("description", "")),
+        amount=amount,
+        date=_date_text(fields.get("date")),
+        category=str(fields["category"]) if "category" in fields else None,
+    )
+
+def _date_text(value):
+    """
+    API dates as text scraper.normalize can parse (ISO timestamps and epochs to YYYY-MM-DD).
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Epoch seconds or milliseconds
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%d")
+    text = str(value)
+    if re.match(r"\d{4}-\d{2}-\d{2}T", text):
+        return text[:10]
+    return text
+
+def _capture_state(driver):
+    state = getattr(driver, "_scraper_api_payloads", None)
+    if state is None:
+        state = driver._scraper_api_payloads = {}
+    return state
+
+def _performance_log(driver):
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        # Performance logging not enabled for this driver
+        return []
+
+def _response_json(driver, request_id, url):
+    try:
+        body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8")
+        return json.loads(text)
+    except Exception as e:
+        # Evicted from Chrome's buffer, or not JSON after all
+        print(f"[network] Could not read response from {url}: {e}")
+        return None
@@ -0,0 +1,95 @@
+# batch normalization of extracted transactions into typed columns (vectorized pandas)
+import pandas as pd
+from scraper.strategies import MONEY_TOKEN_PATTERN, DATE_TOKEN_PATTERN, DATE_FORMATS
+from scraper.transaction import to_columns
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+# Token patterns shared with the extraction side (scraper.strategies)
+_MONEY_PATTERN = MONEY_TOKEN_PATTERN
+_DATE_PATTERN = DATE_TOKEN_PATTERN
+
+def normalize_transactions(transactions, keep_raw=False):
+    """
+    Turn a batch of extracted transactions into a typed DataFrame.
+
+    Args:
+        transactions (list): Transaction records (scraper.transaction) or dicts.
+        keep_raw (bool): Keep the raw "full_text" column.
+
+    Returns:
+        pd.DataFrame: account/category (category), date (datetime64),
+        description (string), amount (float64, signed), currency (category).
+    """
+    return normalize_frame(pd.DataFrame(to_columns(transactions)), keep_raw=keep_raw)
+
+def normalize_frame(df, keep_raw=False):
+    """
+    Normalize a DataFrame of raw transaction strings column-wise.
+    """
+    full_text = _text_column(df, "full_text")
+    raw_amount = _text_column(df, "amount")
+    raw_date = _text_column(df, "date")
+
+    # Amount: the extracted amount field first, then the first token in the
+    # row text that carries a currency (the field regex can pick up bare digits)
+    amount, currency = _parse_money(raw_amount)
+    text_amount, text_currency = _parse_money(full_text, require_currency=True)
+    use_text = currency.isna() & text_amount.notna()
+    amount = amount.mask(use_text, text_amount)
+    currency = currency.mask(use_text, text_currency)
+
+    date_text = raw_date.mask(raw_date.eq(""), full_text.str.extract(_DATE_PATTERN, expand=False))
+    dates = _parse_dates(date_text.fillna(""))
+
+    columns = {}
+    if "account" in df:
+        columns["account"] = _text_column(df, "account").astype("category")
+    columns["date"] = dates
+    columns["description"] = _text_column(df, "description")
+    columns["amount"] = amount.astype("float64")
+    columns["currency"] = currency.astype("category")
+    if "category" in df:
+        columns["category"] = _text_column(df, "category").replace("", pd.NA).astype("category")
+    if keep_raw:
+        columns["full_text"] = full_text
+    return pd.DataFrame(columns, index=df.index)
+
+def _text_column(df, name):
+    if name not in df:
+        return pd.Series("", index=df.index, dtype="string")
+    return df[name].astype("string").fillna("").str.strip()
+
+def _parse_money(text, require_currency=False):
+    """
+    Extract a signed float amount and ISO currency per row.
+    """
+    if require_currency:
+        # First token per row that has a symbol or code
+        matches = text.str.extractall(_MONEY_PATTERN)
+        matches = matches[matches["symbol"].notna() | matches["code"].notna()]
+        parts = matches.groupby(level=0).head(1).droplevel("match").reindex(text.index)
+    else:
+        parts = text.str.extract(_MONEY_PATTERN)
+
+    number = pd.to_numeric(parts["number"].str.replace(",", "", regex=False), errors="coerce")
+    negative = (
+        parts["paren"].notna()
+        | parts["sign"].isin(["-", "−"])
+        | parts["sign_after"].isin(["-", "−"])
+    )
+    amount = number.mask(negative, -number)
+    currency = parts["symbol"].map(CURRENCY_SYMBOLS).fillna(parts["code"])
+    return amount, currency
+
+def _parse_dates(text):
+    dates = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    pending = text.ne("")
+    # Each pass is a vectorized parse of the rows still unparsed
+    for date_format in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(text[pending], format=date_format, errors="coerce")
+        dates.loc[parsed.index] = dates.loc[parsed.index].fillna(parsed)
+        pending &= dates.isna()
+    return dates
@@ -0,0 +1,148 @@
+# offline transaction extraction from saved or captured page HTML (lxml)
+import glob
+import os
+import re
+import lxml.html
+from lxml.cssselect import CSSSelector
+from scraper.config import HTML_DUMP_PATH
+from scraper.strategies import (
+    CARD_SELECTORS, TABLE_ROW_SELECTOR, LIST_ITEM_SELECTOR, MONEY_PARENT_XPATH, METHODS, extract_from_snapshot
+)
+
+# Compile the strategy selectors once; lxml evaluates them as XPath in C
+_CARD_MATCHERS = {selector: CSSSelector(selector, translator="html") for selector in CARD_SELECTORS}
+_TABLE_ROW_MATCHER = CSSSelector(TABLE_ROW_SELECTOR, translator="html")
+_LIST_ITEM_MATCHER = CSSSelector(LIST_ITEM_SELECTOR, translator="html")
+
+# Elements that start and end their own line in innerText
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5",
+    "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "summary",
+    "table", "tbody", "tfoot", "thead", "tr", "ul",
+}
+# Elements whose content is never rendered
+_SKIP_TAGS = {"head", "noscript", "script", "style", "template", "title"}
+_WHITESPACE = re.compile(r"\s+")
+
+def snapshot_html(html, methods=METHODS, card_selectors=CARD_SELECTORS):
+    """
+    Build the same snapshot that extract.snapshot_page collects in the browser,
+    but from an HTML string.
+
+    Args:
+        html (str): Full page source.
+        methods (list): Strategies whose sections should be collected.
+        card_selectors (list): Card selectors to evaluate for the "card" method.
+
+    Returns:
+        dict: Snapshot accepted by strategies.extract_from_snapshot.
+    """
+    root = lxml.html.document_fromstring(html)
+    snapshot = {}
+    if "card" in methods:
+        snapshot["cards"] = [
+            {"selector": selector, "texts": [_inner_text(el) for el in _card_matcher(selector)(root)]}
+            for selector in card_selectors
+        ]
+    if "table" in methods:
+        snapshot["table"] = [
+            [_inner_text(cell) for cell in row.iter("td")] for row in _TABLE_ROW_MATCHER(root)
+        ]
+    if "list" in methods:
+        snapshot["list"] = [_inner_text(item) for item in _LIST_ITEM_MATCHER(root)]
+    if "generic" in methods:
+        # "/.." yields each matching parent once, in document order
+        snapshot["generic"] = [_inner_text(parent) for parent in root.xpath(MONEY_PARENT_XPATH)]
+    return snapshot
+
+def extract_transactions_from_html(html):
+    """
+    Run the card/table/list/generic strategies against page HTML without a browser.
+
+    Returns:
+        list: Extracted transactions (empty if no layout matched).
+    """
+    transactions, method = extract_from_snapshot(snapshot_html(html))
+    if transactions:
+        print(f"[parse] Found {len(transactions)} transactions using {method} method")
+    else:
+        print("[parse] No transactions found with any method")
+    return transactions
+
+def extract_transactions_from_dumps(paths):
+    """
+    Re-extract transactions from archived HTML dumps in bulk.
+
+    Args:
+        paths (str | list): A glob pattern or a list of file paths.
+
+    Returns:
+        dict: Mapping of file path to its extracted transactions.
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+
+    results = {}
+    for path in paths:
+        print(f"[parse] Parsing {path}")
+        results[path] = extract_transactions_from_html(load_html_dump(path))
+    return results
+
+def load_html_dump(path=HTML_DUMP_PATH):
+    """
+    Read a saved page source from disk.
+    """
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def dump_page_source(driver, path=HTML_DUMP_PATH):
+    """
+    Save the driver's current page source so it can be parsed after the browser is gone.
+
+    Returns:
+        str: The captured HTML.
+    """
+    html = driver.page_source
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"[parse] Saved page source ({len(html)} chars) to {path}")
+    return html
+
+def _card_matcher(selector):
+    matcher = _CARD_MATCHERS.get(selector)
+    if matcher is None:
+        matcher = _CARD_MATCHERS[selector] = CSSSelector(selector, translator="html")
+    return matcher
+
+def _inner_text(element):
+    """
+    Approximate the browser's innerText: block elements on their own lines,
+    whitespace collapsed, non-rendered elements skipped.
+    """
+    parts = []
+    _collect_text(element, parts)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def _collect_text(element, parts):
+    tag = element.tag
+    # Comments and processing instructions have non-string tags
+    if not isinstance(tag, str) or tag in _SKIP_TAGS or element.get("hidden") is not None:
+        return
+
+    block = tag in _BLOCK_TAGS
+    if block or tag == "br":
+        parts.append("\n")
+    # Source newlines are just whitespace; line breaks come from the markup
+    if element.text:
+        parts.append(_WHITESPACE.sub(" ", element.text))
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(_WHITESPACE.sub(" ", child.tail))
+    if block:
+        parts.append("\n")
+    elif tag in ("td", "th"):
+        parts.append(" ")
@@ -0,0 +1,150 @@
+# staged extract -> normalize -> export pipeline over bounded queues
+import queue
+import threading
+from scraper.config import PIPELINE_QUEUE_SIZE, PIPELINE_BATCH_SIZE, KEEP_RAW_TEXT
+from scraper.normalize import normalize_transactions
+from scraper.trace import span
+
+_DONE = object()
+_POLL_SECONDS = 0.5
+
+class Pipeline:
+    """
+    Normalization and export stages, each on its own thread, fed through
+    bounded queues.
+
+    Browser workers call submit() with extracted batches and go straight
+    back to the next page or account while earlier batches are normalized
+    and written. submit() blocks when the stages fall behind, which caps the
+    number of rows held in memory at about queue_size * batch_size per queue.
+    """
+
+    def __init__(self, writers, index=None, queue_size=PIPELINE_QUEUE_SIZE, batch_size=PIPELINE_BATCH_SIZE):
+        self.writers = writers
+        self.index = index
+        self.batch_size = batch_size
+        self.rows_exported = 0
+        # Keys include the account, so one map numbers each account's rows apart
+        self._occurrences = {}
+        self._raw = queue.Queue(maxsize=queue_size)
+        self._normalized = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run_stage, args=(self._normalize_stage,), name="pipeline-normalize", daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._export_stage,), name="pipeline-export", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, transactions):
+        """
+        Queue extracted transactions (split into batch_size pieces). Thread-safe.
+        """
+        if self.index is not None:
+            # Occurrences run on across batches, so identical rows keep their numbering
+            transactions = self.index.filter_new(transactions, self._occurrences)
+        for start in range(0, len(transactions), self.batch_size):
+            self._put(self._raw, transactions[start:start + self.batch_size])
+
+    def close(self):
+        """
+        Drain the stages and finalize the writers (and commit the dedup index).
+
+        Returns:
+            int: Number of rows exported.
+        """
+        if self._closed:
+            return self.rows_exported
+        self._closed = True
+        try:
+            self._put(self._raw, _DONE)
+        except RuntimeError:
+            pass
+        for thread in self._threads:
+            thread.join()
+
+        if self._error is not None:
+            self._abort_outputs()
+            raise RuntimeError(f"Pipeline failed: {self._error}") from self._error
+
+        with span("pipeline.finalize"):
+            for writer in self.writers:
+                writer.finalize()
+        if self.index is not None:
+            self.index.commit()
+        return self.rows_exported
+
+    def abort(self):
+        """
+        Stop the stages and discard all output.
+        """
+        if self._error is None:
+            self._error = RuntimeError("Pipeline aborted")
+        self._closed = True
+        for thread in self._threads:
+            thread.join()
+        self._abort_outputs()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _normalize_stage(self):
+        while True:
+            batch = self._get(self._raw)
+            if batch is _DONE:
+                self._put(self._normalized, _DONE)
+                return
+            with span("pipeline.normalize", rows=len(batch)):
+                df = normalize_transactions(batch, keep_raw=KEEP_RAW_TEXT)
+            self._put(self._normalized, df)
+
+    def _export_stage(self):
+        while True:
+            df = self._get(self._normalized)
+            if df is _DONE:
+                return
+            with span("pipeline.export", rows=len(df)):
+                for writer in self.writers:
+                    writer.write_frame(df)
+            self.rows_exported += len(df)
+
+    def _run_stage(self, stage):
+        try:
+            stage()
+        except Exception as e:
+            if self._error is None:
+                print(f"[pipeline] {threading.current_thread().name} failed: {e}")
+                self._error = e
+
+    # put/get poll so that a failure in any stage unblocks everyone else
+    def _put(self, q, item):
+        while True:
+            if self._error is not None:
+                raise RuntimeError(f"Pipeline failed: {self._error}")
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q):
+        while True:
+            if self._error is not None:
+                raise RuntimeError(f"Pipeline failed: {self._error}")
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _abort_outputs(self):
+        for writer in self.writers:
+            writer.abort()
+        if self.index is not None:
+            self.index.discard_pending()
@@ -0,0 +1,171 @@
+# persisted authenticated sessions (cookies + web storage), keyed by username
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlsplit
+from scraper.config import SESSION_DIR, SESSION_MAX_AGE, LOGIN_URL, DASHBOARD_URL
+from scraper.wait import wait_for_page_settled
+from scraper.trace import traced
+from scraper.network import reset_network_capture
+
+_STORAGE_DUMP_SCRIPT = """
+function dump(storage) {
+    var out = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        out[key] = storage.getItem(key);
+    }
+    return out;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_STORAGE_RESTORE_SCRIPT = """
+var local = arguments[0] || {}, session = arguments[1] || {};
+Object.keys(local).forEach(function (key) { window.localStorage.setItem(key, local[key]); });
+Object.keys(session).forEach(function (key) { window.sessionStorage.setItem(key, session[key]); });
+"""
+
+def session_path(username):
+    """
+    Path of the cached session file for a username (hashed, so emails are not file names).
+    """
+    digest = hashlib.sha256(username.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SESSION_DIR, f"{digest}.json")
+
+def session_snapshot(driver, username=None):
+    """
+    The driver's cookies, localStorage and sessionStorage, in the saved-session format.
+    """
+    storage = driver.execute_script(_STORAGE_DUMP_SCRIPT)
+    return {
+        "username": username,
+        "saved_at": time.time(),
+        "url": driver.current_url,
+        "cookies": driver.get_cookies(),
+        "local_storage": storage.get("local", {}),
+        "session_storage": storage.get("session", {}),
+    }
+
+def save_session(driver, username):
+    """
+    Save the driver's cookies, localStorage and sessionStorage for username.
+    """
+    data = session_snapshot(driver, username)
+
+    path = session_path(username)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    print(f"[session] Saved session for {username} ({len(data['cookies'])} cookies)")
+
+def load_session(username, max_age=SESSION_MAX_AGE):
+    """
+    Load the cached session for username.
+
+    Returns:
+        dict or None: The session data, or None if missing, unreadable or older than max_age.
+    """
+    path = session_path(username)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - data.get("saved_at", 0) > max_age:
+        print(f"[session] Cached session for {username} expired")
+        clear_session(username)
+        return None
+    return data
+
+def update_session(username, **fields):
+    """
+    Add fields (e.g. api_urls) to the cached session of username, if there is one.
+    """
+    path = session_path(username)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return
+    data.update(fields)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def clear_session(username):
+    """
+    Delete the cached session for username, if any.
+    """
+    try:
+        os.remove(session_path(username))
+    except FileNotFoundError:
+        pass
+
+@traced("login.session_restore")
+def restore_session(driver, username, max_age=SESSION_MAX_AGE):
+    """
+    Restore a cached session into the driver and open the dashboard.
+    The caller is responsible for checking that the dashboard is real.
+
+    Returns:
+        bool: True if a session was restored, False if there was none to restore.
+    """
+    data = load_session(username, max_age)
+    if not data:
+        return False
+
+    # Cookies and storage can only be set for the origin that is currently loaded;
+    # start from a clean slate so a reused driver never mixes two accounts
+    load_clean(driver, LOGIN_URL)
+    now = time.time()
+    for cookie in data.get("cookies", []):
+        if cookie.get("expiry") and cookie["expiry"] < now:
+            continue
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"[session] Could not restore cookie {cookie.get('name')}: {e}")
+    driver.execute_script(_STORAGE_RESTORE_SCRIPT, data.get("local_storage"), data.get("session_storage"))
+
+    driver.get(DASHBOARD_URL)
+    wait_for_page_settled(driver)
+    print(f"[session] Restored cached session for {username}")
+    return True
+
+def clear_browser_state(driver):
+    """
+    Remove cookies and web storage for the current origin, and API responses
+    captured for the previous account.
+    """
+    driver.delete_all_cookies()
+    driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    reset_network_capture(driver)
+
+def load_clean(driver, url):
+    """
+    Load url without the cookies and web storage a previous account left.
+
+    The state is cleared before the page loads, so the app never starts up
+    with the other account's session: in place when the driver is already
+    on url's origin, otherwise through CDP (Storage.clearDataForOrigin).
+    Without CDP the page is loaded, cleared and loaded again.
+    """
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    current = urlsplit(driver.current_url)
+    if f"{current.scheme}://{current.netloc}" == origin:
+        clear_browser_state(driver)
+    else:
+        try:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            reset_network_capture(driver)
+        except Exception:
+            driver.get(url)
+            clear_browser_state(driver)
+    driver.get(url)
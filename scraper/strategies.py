@@ -0,0 +1,221 @@
+# transaction strategies over row texts, shared by browser and offline extraction
+# (no Selenium here, so parsing saved HTML does not import it)
+import re
+from scraper.transaction import Transaction, make_transaction
+
+# Card selectors, tried in order - prioritize transaction-specific selectors
+CARD_SELECTORS = [
+    'div[class*="transaction"]',
+    'div[data-testid*="transaction"]',
+    '.transaction-card',
+    '.transaction-item',
+    'div[class*="card"]:not([class*="login"])',  # Exclude login cards
+    'div[class*="item"]:not([class*="login"])'   # Exclude login items
+]
+TABLE_ROW_SELECTOR = "table tr, tbody tr"
+LIST_ITEM_SELECTOR = "ul li, ol li"
+# Strategy names in the order they are tried
+METHODS = ["card", "table", "list", "generic"]
+MONEY_XPATH = "//*[contains(text(), '$') or contains(text(), '€') or contains(text(), '£') or contains(text(), 'USD') or contains(text(), 'EUR')]"
+MONEY_PARENT_XPATH = MONEY_XPATH + "/.."
+
+# Look for amount patterns (more comprehensive)
+AMOUNT_PATTERN = re.compile(r'[\$€£]?\s*[\d,]+\.?\d*|[\d,]+\.?\d*\s*[\$€£USD EUR]')
+# Look for date patterns
+DATE_PATTERN = re.compile(r'\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}|\d{4}[\/\-]\d{1,2}[\/\-]\d{1,2}|\w{3}\s+\d{1,2},?\s+\d{4}')
+
+# One money token: optional "(" or sign, optional symbol, digits, optional ISO code.
+# Matches "-$150", "$ 1,234.50", "(£20.00)", "+$750", "99.90 EUR". Shared with scraper.normalize.
+MONEY_TOKEN_PATTERN = (
+    r"(?P<paren>\()?(?P<sign>[-+−])?\s?(?P<symbol>[$€£])?\s?(?P<sign_after>[-+−])?"
+    r"(?P<number>\d[\d,]*(?:\.\d+)?)(?:\s?(?P<code>USD|EUR|GBP))?"
+)
+# Date tokens in the formats the dashboards render. Shared with scraper.normalize.
+DATE_TOKEN_PATTERN = (
+    r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}"
+    r"|[A-Z][a-z]{2}\s+\d{1,2},?\s+\d{4}|\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})"
+)
+# strptime formats of those tokens, tried in order. Shared with scraper.normalize and scraper.dedup.
+DATE_FORMATS = [
+    "%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%Y/%m/%d", "%m-%d-%Y",
+    "%b %d, %Y", "%b %d %Y", "%d %b %Y",
+]
+_MONEY_TOKEN = re.compile(MONEY_TOKEN_PATTERN)
+_DATE_TOKEN = re.compile(DATE_TOKEN_PATTERN)
+
+def extract_from_snapshot(snapshot):
+    """
+    Run the card, table, list and generic strategies against a page snapshot.
+
+    Returns:
+        tuple: (transactions, method name) or ([], None) if nothing matched.
+    """
+    transactions, method, _ = match_snapshot(snapshot)
+    return transactions, method
+
+def match_snapshot(snapshot):
+    """
+    Strategy sequence over a snapshot; also reports the winning card selector.
+    """
+    # Method 1: Look for transaction cards/items
+    for entry in snapshot.get("cards", []):
+        texts = entry.get("texts", [])
+        if texts:
+            print(f"[extract] Found {len(texts)} cards with selector: {entry['selector']}")
+            transactions = transactions_from_texts(texts)
+            if transactions:
+                return transactions, "card", entry["selector"]
+    
+    # Method 2: Look for table-based transactions
+    rows = snapshot.get("table", [])
+    if len(rows) > 1:  # Skip header row
+        print(f"[extract] Found {len(rows)} table rows")
+        transactions = []
+        for cells in rows[1:]:
+            transaction = transaction_from_cells(cells)
+            if transaction and is_valid_transaction(transaction):
+                transactions.append(transaction)
+        if transactions:
+            return transactions, "table", None
+    
+    # Method 3: Look for list-based transactions
+    items = snapshot.get("list", [])
+    if items:
+        print(f"[extract] Found {len(items)} list items")
+        transactions = transactions_from_texts(items)
+        if transactions:
+            return transactions, "list", None
+    
+    # Method 4: Generic approach - parents of elements with money symbols
+    transactions = transactions_from_parent_texts(snapshot.get("generic", []))
+    if transactions:
+        return transactions, "generic", None
+    
+    return [], None, None
+
+def transactions_from_texts(texts):
+    """
+    Parse and validate a list of element texts.
+    """
+    transactions = []
+    for text in texts:
+        transaction = transaction_from_text(text)
+        if transaction and is_valid_transaction(transaction, text):
+            transactions.append(transaction)
+    return transactions
+
+def transactions_from_parent_texts(texts):
+    """
+    Generic strategy over parent texts. Repeated texts (the same row rendered
+    twice) are parsed once, using a set instead of comparing transactions.
+    """
+    transactions = []
+    seen = set()
+    for text in texts:
+        text = (text or "").strip()
+        if text in seen:
+            continue
+        seen.add(text)
+        transaction = transaction_from_text(text)
+        if transaction and is_valid_transaction(transaction, text):
+            transactions.append(transaction)
+    return transactions
+
+def transaction_from_text(text):
+    """
+    Build a transaction from the visible text of a row element.
+
+    The amount and date are resolved here, from the whole text where the
+    first regex match is not usable, so the text itself need not be kept
+    (config.KEEP_RAW_TEXT).
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    
+    amounts = AMOUNT_PATTERN.findall(text)
+    dates = DATE_PATTERN.findall(text)
+    
+    # Extract the first line as description
+    lines = text.split('\n')
+    description = lines[0] if lines else text
+    
+    # Only return if we have meaningful data
+    if description and len(description) > 2:
+        return make_transaction(
+            text,
+            description=description,
+            amount=_amount_from_text(text, amounts),
+            date=dates[0] if dates else _first_match(_DATE_TOKEN, text),
+        )
+    
+    return None
+
+def _amount_from_text(text, amounts):
+    """
+    The first amount match, unless it has no currency (e.g. a day number):
+    then the first money token in the text with a symbol or code, sign included.
+    """
+    amount = amounts[0] if amounts else ""
+    if _has_currency(_MONEY_TOKEN.search(amount)):
+        return amount
+    for match in _MONEY_TOKEN.finditer(text):
+        if _has_currency(match):
+            return match.group(0).strip()
+    return amount
+
+def _has_currency(match):
+    return bool(match and (match.group("symbol") or match.group("code")))
+
+def _first_match(pattern, text):
+    match = pattern.search(text)
+    return match.group(0) if match else ""
+
+def transaction_from_cells(cells):
+    """
+    Build a transaction from the texts of a table row's cells.
+    """
+    if len(cells) < 2:
+        return None
+    
+    cells = [(cell or "").strip() for cell in cells]
+    return Transaction(
+        description=cells[0],
+        amount=cells[1],
+        date=cells[2] if len(cells) > 2 else "",
+        category=cells[3] if len(cells) > 3 else "",
+    )
+
+def is_valid_transaction(transaction, text=None):
+    """
+    Check if the extracted transaction is valid and not a login form element.
+    text is the element text it was built from (default: its full_text, if kept).
+    """
+    if not transaction or not transaction.get("description"):
+        return False
+    
+    description = transaction["description"].lower()
+    full_text = (text if text is not None else transaction.get("full_text", "")).lower()
+    
+    # Filter out login form elements
+    login_keywords = [
+        "remember me", "forgot password", "login", "sign in", "email", "password",
+        "username", "submit", "welcome back", "securbank", "dashboard"
+    ]
+    
+    # Check if this looks like a login form element
+    for keyword in login_keywords:
+        if keyword in description or keyword in full_text:
+            return False
+    
+    # Must have some meaningful content
+    if len(description) < 3:
+        return False
+    
+    # Prefer transactions with amounts or dates
+    has_amount = transaction.get("amount") and len(transaction["amount"]) > 0
+    has_date = transaction.get("date") and len(transaction["date"]) > 0
+    has_money_symbol = any(symbol in full_text for symbol in ['$', '€', '£', 'USD', 'EUR'])
+    
+    # Accept if it has financial indicators or is substantial content
+    return has_amount or has_date or has_money_symbol or len(description) > 10
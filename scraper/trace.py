@@ -0,0 +1,201 @@
+# timed spans and WebDriver command counts, written as a Chrome trace per run
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from scraper.config import TRACE_DIR, TRACE_ENABLED
+
+class Tracer:
+    """
+    Collects timed spans (launch, login attempts, extraction strategies,
+    export) and every remote WebDriver command of one run.
+
+    write() produces a Chrome trace ("traceEvents" JSON), which opens in
+    chrome://tracing or https://ui.perfetto.dev, plus a "summary" object
+    with per-span and per-command totals for scripts and regression checks.
+    """
+
+    def __init__(self, name="run"):
+        self.name = name
+        self.events = []
+        self.commands = {}  # command name -> [count, total seconds]
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, category="phase", **args):
+        """
+        Time the enclosed block as one trace event. Exceptions are recorded
+        in the event's args and re-raised.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._add_event(name, category, started, time.perf_counter(), args)
+
+    def record_command(self, command, started, finished):
+        """
+        Record one remote WebDriver command (called by instrument_driver).
+        """
+        with self._lock:
+            stats = self.commands.setdefault(command, [0, 0.0])
+            stats[0] += 1
+            stats[1] += finished - started
+        self._add_event(command, "webdriver", started, finished, {})
+
+    def summary(self):
+        """
+        Totals per span name and per WebDriver command, slowest first.
+        """
+        spans = {}
+        with self._lock:
+            for event in self.events:
+                if event["cat"] == "webdriver":
+                    continue
+                stats = spans.setdefault(event["name"], {"count": 0, "seconds": 0.0})
+                stats["count"] += 1
+                stats["seconds"] += event["dur"] / 1e6
+            commands = {
+                name: {"count": count, "seconds": seconds}
+                for name, (count, seconds) in self.commands.items()
+            }
+        by_time = lambda item: -item[1]["seconds"]
+        return {
+            "wall_seconds": time.perf_counter() - self._origin,
+            "webdriver_commands": sum(stats["count"] for stats in commands.values()),
+            "spans": dict(sorted(spans.items(), key=by_time)),
+            "commands": dict(sorted(commands.items(), key=by_time)),
+        }
+
+    def write(self, path=None):
+        """
+        Write the trace to path (default: TRACE_DIR/<name>-<timestamp>.json).
+
+        Returns:
+            str: The trace file path.
+        """
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(TRACE_DIR, f"{self.name}-{stamp}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        trace = {"traceEvents": events, "displayTimeUnit": "ms", "summary": self.summary()}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def _add_event(self, name, category, started, finished, args):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((started - self._origin) * 1e6),
+            "dur": round((finished - started) * 1e6),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+# The tracer of the run in progress; None when tracing is off
+_current = None
+
+def start_trace(name="run"):
+    """
+    Begin tracing a run. Spans and driver commands are recorded until finish_trace().
+    """
+    global _current
+    _current = Tracer(name) if TRACE_ENABLED else None
+    return _current
+
+def finish_trace(path=None):
+    """
+    Write the current run's trace (to path, or a timestamped file in
+    TRACE_DIR), print its hot spots and stop tracing.
+
+    Returns:
+        str: The trace file path, or None if tracing was off.
+    """
+    tracer = stop_trace()
+    if tracer is None:
+        return None
+    path = tracer.write(path)
+    summary = tracer.summary()
+    print(f"[trace] {summary['wall_seconds']:.2f}s, {summary['webdriver_commands']} WebDriver commands -> {path}")
+    for name, stats in list(summary["spans"].items())[:5]:
+        print(f"[trace]   {name}: {stats['seconds']:.2f}s over {stats['count']} call(s)")
+    return path
+
+def stop_trace():
+    """
+    Stop tracing without writing a file.
+
+    Returns:
+        Tracer: The finished tracer, or None if tracing was off.
+    """
+    global _current
+    tracer, _current = _current, None
+    return tracer
+
+def get_tracer():
+    return _current
+
+def span(name, category="phase", **args):
+    """
+    Time a block on the current tracer; a no-op when no run is being traced.
+    """
+    tracer = _current
+    if tracer is None:
+        return _null_span()
+    return tracer.span(name, category, **args)
+
+def traced(name):
+    """
+    Decorator form of span() for whole functions.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def instrument_driver(driver):
+    """
+    Route every remote command of driver (including WebElement calls, which
+    go through driver.execute) to the current tracer. Safe to call twice;
+    pooled drivers report to whichever run is being traced.
+    """
+    execute = getattr(driver, "execute", None)
+    if execute is None or getattr(driver, "_scraper_instrumented", False):
+        return driver
+
+    def timed_execute(driver_command, params=None):
+        tracer = _current
+        if tracer is None:
+            return execute(driver_command, params)
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            tracer.record_command(driver_command, started, time.perf_counter())
+
+    driver.execute = timed_execute
+    driver._scraper_instrumented = True
+    return driver
+
+@contextmanager
+def _null_span():
+    yield
@@ -0,0 +1,90 @@
+# compact transaction records produced by extraction and consumed by export
+from scraper.config import KEEP_RAW_TEXT
+
+# Record fields in export column order; full_text is the row's raw element text
+FIELDS = ("account", "date", "description", "amount", "category", "full_text")
+
+class Transaction:
+    """
+    One extracted transaction.
+
+    Slotted, so a long history or a multi-account batch costs a fixed few
+    pointers per row instead of a dict, and the element text (full_text) is
+    only kept when asked for (config.KEEP_RAW_TEXT). Unset fields are None
+    and count as absent.
+
+    Reads like the dicts it replaces: t["amount"], t.get("category"),
+    "category" in t, t["account"] = ..., dict(t), == with a dict.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, description="", amount="", date="", category=None, account=None, full_text=None):
+        self.description = description
+        self.amount = amount
+        self.date = date
+        self.category = category
+        self.account = account
+        self.full_text = full_text
+
+    def __getitem__(self, field):
+        value = getattr(self, field, None) if field in FIELDS else None
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __setitem__(self, field, value):
+        if field not in FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __contains__(self, field):
+        return field in FIELDS and getattr(self, field) is not None
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None) if field in FIELDS else None
+        return default if value is None else value
+
+    def keys(self):
+        return [field for field in FIELDS if getattr(self, field) is not None]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, Transaction):
+            return all(getattr(self, field) == getattr(other, field) for field in FIELDS)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Transaction({', '.join(f'{field}={getattr(self, field)!r}' for field in self.keys())})"
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.keys()}
+
+def make_transaction(text=None, **fields):
+    """
+    Build a Transaction, keeping the raw element text only with config.KEEP_RAW_TEXT.
+    """
+    return Transaction(full_text=text if KEEP_RAW_TEXT else None, **fields)
+
+def as_dicts(transactions):
+    """
+    Plain dicts for JSON (job results, extract-from-dump --json).
+    """
+    return [t.to_dict() if isinstance(t, Transaction) else dict(t) for t in transactions]
+
+def to_columns(transactions):
+    """
+    Column lists for a DataFrame, built in one pass over records or dicts.
+    Fields no row has are left out, as pandas does for a list of dicts.
+    """
+    transactions = list(transactions)
+    present = set()
+    for transaction in transactions:
+        present.update(transaction.keys())
+    extra = sorted(present.difference(FIELDS))
+    names = [field for field in FIELDS if field in present] + extra
+    return {name: [transaction.get(name) for transaction in transactions] for name in names}
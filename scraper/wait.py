@@ -0,0 +1,115 @@
+# event-driven readiness waits used instead of fixed sleeps
+import time
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from scraper.config import (
+    READY_TIMEOUT, READY_POLL_INTERVAL, DOM_QUIET_MS, USERNAME_SELECTOR, DASHBOARD_READY_SELECTORS
+)
+
+# Installs (once per document) a MutationObserver that counts DOM changes and
+# records when the last one happened. Shared by every script that needs to
+# know whether the DOM has changed since it last looked. Showing or hiding an
+# element by class/style/hidden counts as a change too (a spinner going away
+# changes what the dashboard probe sees without touching the tree).
+OBSERVER_INSTALL_JS = """
+if (!window.__scraperObserver) {
+    window.__scraperMutations = 0;
+    window.__scraperLastMutation = performance.now();
+    window.__scraperObserver = new MutationObserver(function () {
+        window.__scraperMutations++;
+        window.__scraperLastMutation = performance.now();
+    });
+    window.__scraperObserver.observe(document.documentElement, {
+        childList: true, subtree: true, characterData: true,
+        attributes: true, attributeFilter: ["class", "style", "hidden"]
+    });
+}
+"""
+
+# Reports load state, quiet time and which of the given selectors are
+# present. One round trip per poll.
+_READINESS_SCRIPT = OBSERVER_INSTALL_JS + """
+var selectors = arguments[0] || [];
+var matched = selectors.filter(function (selector) {
+    try { return document.querySelector(selector) !== null; } catch (e) { return false; }
+});
+return {
+    state: document.readyState,
+    url: window.location.href,
+    quietFor: performance.now() - window.__scraperLastMutation,
+    mutations: window.__scraperMutations,
+    matched: matched
+};
+"""
+
+def probe(driver, selectors=None):
+    """
+    Read the page's readiness state in a single script call.
+
+    Returns:
+        dict: {"state", "url", "quietFor" (ms), "mutations", "matched" (selectors present)}
+    """
+    return driver.execute_script(_READINESS_SCRIPT, list(selectors or []))
+
+def wait_until(driver, condition, timeout=READY_TIMEOUT, description="condition"):
+    """
+    Poll condition(driver) until it returns a truthy value or timeout expires.
+
+    Returns:
+        The condition's last truthy value, or False on timeout.
+    """
+    try:
+        return WebDriverWait(
+            driver, timeout, poll_frequency=READY_POLL_INTERVAL,
+            ignored_exceptions=(JavascriptException,)
+        ).until(condition)
+    except TimeoutException:
+        print(f"[wait] Timed out after {timeout}s waiting for {description}")
+        return False
+
+def wait_for_page_settled(driver, timeout=READY_TIMEOUT, quiet_ms=DOM_QUIET_MS, selectors=None):
+    """
+    Wait until the document has loaded and the DOM has stopped changing for
+    quiet_ms. If selectors are given, at least one must also be present.
+    """
+    def settled(d):
+        state = probe(d, selectors)
+        if state["state"] == "loading" or state["quietFor"] < quiet_ms:
+            return False
+        if selectors and not state["matched"]:
+            return False
+        return state
+
+    return wait_until(driver, settled, timeout, "page to settle")
+
+def wait_for_dashboard(driver, timeout=READY_TIMEOUT):
+    """
+    Wait until a dashboard marker is rendered and the DOM is quiet.
+    """
+    return wait_for_page_settled(driver, timeout, selectors=DASHBOARD_READY_SELECTORS)
+
+def wait_for_url_change(driver, previous_url, timeout=READY_TIMEOUT):
+    """
+    Wait until the browser has navigated away from previous_url.
+    """
+    return wait_until(driver, lambda d: d.current_url != previous_url, timeout, "URL change")
+
+def wait_for_login_result(driver, previous_url, timeout=READY_TIMEOUT):
+    """
+    Wait for a submitted login form to take effect: the URL changes, the form
+    disappears or a dashboard marker appears. Then wait for the DOM to settle
+    within whatever is left of the timeout.
+    """
+    selectors = [USERNAME_SELECTOR] + list(DASHBOARD_READY_SELECTORS)
+
+    def login_resolved(d):
+        state = probe(d, selectors)
+        form_present = USERNAME_SELECTOR in state["matched"]
+        dashboard_present = len(state["matched"]) > (1 if form_present else 0)
+        return state["url"] != previous_url or not form_present or dashboard_present
+
+    started = time.monotonic()
+    if not wait_until(driver, login_resolved, timeout, "login to resolve"):
+        return False
+    remaining = max(READY_POLL_INTERVAL, timeout - (time.monotonic() - started))
+    return wait_for_page_settled(driver, timeout=remaining)
@@ -0,0 +1,108 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from scraper.strategies import CARD_SELECTORS
+
+
+def _empty_snapshot():
+    return {
+        "cards": [{"selector": selector, "texts": []} for selector in CARD_SELECTORS],
+        "table": [],
+        "list": [],
+        "generic": [],
+    }
+
+
+class SnapshotPageDriver:
+    """
+    Fake driver serving the readiness, fingerprint and snapshot scripts for a list layout
+    """
+
+    def __init__(self):
+        self.snapshot_requests = []
+
+    def execute_script(self, script, *args):
+        if "__scraperObserver" in script:
+            return {"state": "complete", "url": "http://x/homepage2", "quietFor": 1000, "mutations": 0, "matched": []}
+        if "window.location.pathname" in script:
+            return {"path": "/homepage2", "present": ["homepage2_items"]}
+        methods = args[4]
+        self.snapshot_requests.append(methods)
+        snapshot = _empty_snapshot()
+        snapshot["list"] = ["Mobile Service\n01/25/2021\n-$150"]
+        return {key: value for key, value in snapshot.items()
+                if {"cards": "card"}.get(key, key) in methods}
+
+
+class VirtualListDriver(SnapshotPageDriver):
+    """
+    List that only renders a 10-row window; each scroll moves it by 8 rows
+    """
+
+    def __init__(self, rows=25):
+        super().__init__()
+        self.rows = [f"Payment {i}\n01/25/2021\n-${i}" for i in range(rows)]
+        self.top = 0
+        self.scrolls = 0
+
+    def execute_script(self, script, *args):
+        if "paginationSelectors" in script:
+            if self.top + 10 >= len(self.rows):
+                return None
+            self.top += 8
+            self.scrolls += 1
+            return "scroll"
+        snapshot = super().execute_script(script, *args)
+        if isinstance(snapshot, dict) and "list" in snapshot:
+            snapshot["list"] = self.rows[self.top:self.top + 10]
+        return snapshot
+
+
+class PagedListDriver(SnapshotPageDriver):
+    """
+    List split over pages; each pagination click replaces the rows
+    """
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.page = 0
+
+    def execute_script(self, script, *args):
+        if "paginationSelectors" in script:
+            if self.page + 1 >= len(self.pages):
+                return None
+            self.page += 1
+            return "click"
+        snapshot = super().execute_script(script, *args)
+        if isinstance(snapshot, dict) and "list" in snapshot:
+            snapshot["list"] = self.pages[self.page]
+        return snapshot
+
+
+@pytest.fixture
+def empty_snapshot():
+    """
+    Snapshot payload (see scraper.extract.snapshot_page) with every section empty
+    """
+    return _empty_snapshot()
+
+
+@pytest.fixture
+def snapshot_driver():
+    return SnapshotPageDriver()
+
+
+@pytest.fixture
+def virtual_list_driver():
+    return VirtualListDriver()
+
+
+@pytest.fixture
+def paged_list_driver():
+    """
+    Factory: paged_list_driver(pages) with pages a list of row-text lists
+    """
+    return PagedListDriver
@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from urllib.request import urlopen
+from benchmarks.fixtures import FixtureServer
+from benchmarks.run_benchmarks import run_benchmarks
+from scraper.parse import extract_transactions_from_html
+
+
+def test_fixture_server_generates_requested_rows():
+    with FixtureServer() as server:
+        for layout in ("homepage1", "homepage2"):
+            with urlopen(server.url(layout, 25)) as response:
+                html = response.read().decode("utf-8")
+            assert len(extract_transactions_from_html(html)) == 25
+
+
+def test_html_backend_results_are_appended(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    run_benchmarks(sizes=[20], backends=["html"], results_path=path)
+    run_benchmarks(sizes=[20], backends=["html"], methods=["generic"], results_path=path)
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2 * 4 + 2
+    found = {(r["layout"], r["method"]): r["found"] for r in records}
+    assert found[("homepage1", "generic")] == 20
+    assert found[("homepage2", "list")] == 20
+    assert all(r["webdriver_commands"] == 0 and r["peak_python_bytes"] for r in records)
@@ -26,4 +26,119 @@ def test_browser_launch():
     # Close the browser instance
     close_browser(driver)
 
-    assert "Example" in title
\ No newline at end of file
+    assert "Example" in title
+
+class FakeDriver:
+    def __init__(self, user_data_dir):
+        self.user_data_dir = user_data_dir
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+def test_browser_pool_is_bounded_and_isolated(monkeypatch):
+    """
+    The pool launches at most `size` drivers, each with its own profile directory
+    """
+    import threading
+    import scraper.browser as browser
+
+    launched = []
+
+    def fake_launch(headless=True, user_data_dir=None):
+        driver = FakeDriver(user_data_dir)
+        launched.append(driver)
+        return driver
+
+    monkeypatch.setattr(browser, "launch_browser", fake_launch)
+
+    with browser.BrowserPool(size=2) as pool:
+        first = pool.acquire()
+        second = pool.acquire()
+        assert first.user_data_dir != second.user_data_dir
+
+        # A third worker waits until a driver is released
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+        waiter.start()
+        pool.release(first)
+        waiter.join()
+        assert got == [first]
+        assert len(launched) == 2
+
+    assert all(driver.closed for driver in launched)
+    assert not any(os.path.exists(driver.user_data_dir) for driver in launched)
+
+
+def test_scrape_profile_blocks_resources(monkeypatch):
+    """
+    The scrape profile uses eager loads and blocks configured resources through DevTools
+    """
+    import scraper.browser as browser
+
+    class RecordingChrome:
+        def __init__(self, service=None, options=None):
+            self.options = options
+            self.cdp = []
+
+        def execute_cdp_cmd(self, cmd, params):
+            self.cdp.append((cmd, params))
+
+    monkeypatch.setattr(browser.webdriver, "Chrome", RecordingChrome)
+
+    driver = browser.launch_browser(
+        scrape_profile=True, blocked_resources=["font"], blocked_urls=["*analytics*"]
+    )
+    assert driver.options.page_load_strategy == "eager"
+    assert "--disable-extensions" in driver.options.arguments
+    assert driver.cdp[-1] == ("Network.setBlockedURLs", {"urls": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*analytics*"]})
+
+    driver = browser.launch_browser(scrape_profile=False)
+    assert driver.options.page_load_strategy == "normal"
+    assert driver.cdp == []
+
+
+def test_open_browser_prefers_server_then_persistent_profile(monkeypatch, tmp_path):
+    import scraper.browser as browser
+
+    class RecordingChrome:
+        def __init__(self, service=None, options=None):
+            self.options = options
+
+        def execute_cdp_cmd(self, cmd, params):
+            pass
+
+    monkeypatch.setattr(browser.webdriver, "Chrome", RecordingChrome)
+    monkeypatch.setattr(browser, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(browser, "BROWSER_SERVER_PORT", 9222)
+
+    monkeypatch.setattr(browser, "browser_server_running", lambda port: True)
+    driver = browser.open_browser("john.doe@email.com")
+    assert driver.options.debugger_address == "127.0.0.1:9222"
+    assert driver.startup_seconds >= 0
+
+    monkeypatch.setattr(browser, "browser_server_running", lambda port: False)
+    driver = browser.open_browser("john.doe@email.com")
+    profile_arg = f"--user-data-dir={tmp_path / 'john.doe_email.com'}"
+    assert profile_arg in driver.options.arguments
+
+
+def test_browser_server_must_be_ours(monkeypatch, tmp_path):
+    """
+    A port that answers only counts as the browser server when the marker
+    written by start_browser_server names it and a live process
+    """
+    import scraper.browser as browser
+
+    monkeypatch.setattr(browser, "BROWSER_SERVER_MARKER", str(tmp_path / "browser_server.json"))
+    monkeypatch.setattr(browser, "_port_open", lambda port: True)
+    assert not browser.browser_server_running(9222)
+
+    browser._write_server_marker(9222, os.getpid())
+    assert browser.browser_server_running(9222)
+    assert not browser.browser_server_running(9223)
+
+    # Chrome died and something else took the port
+    browser._write_server_marker(9222, 2 ** 22 + 1)
+    assert not browser.browser_server_running(9222)
@@ -0,0 +1,198 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import re
+import subprocess
+from scraper.cli import parse_args
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY_MODULES = ("selenium", "pandas", "pyarrow", "lxml")
+# Generous ceiling for `import scraper.cli` alone; it is ~10ms without the heavy modules
+CLI_IMPORT_BUDGET_US = 150_000
+
+DASHBOARD_HTML = """
+<html><body><table>
+  <tr><th>Description</th><th>Amount</th><th>Date</th></tr>
+  <tr><td>Coffee Shop</td><td>-$4.50</td><td>01/25/2021</td></tr>
+  <tr><td>Salary</td><td>+$2,500.00</td><td>01/26/2021</td></tr>
+</table></body></html>
+"""
+
+
+def run_python(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return result.stdout, result.stderr
+
+
+def loaded_heavy_modules(stdout):
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+def test_cli_import_is_fast_and_loads_no_heavy_modules():
+    stdout, stderr = run_python(
+        "import json, sys; import scraper.cli; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    assert loaded_heavy_modules(stdout) == []
+    cumulative = re.search(r"\|\s*(\d+) \| scraper\.cli$", stderr, re.MULTILINE)
+    assert int(cumulative.group(1)) < CLI_IMPORT_BUDGET_US
+
+
+def test_extract_from_dump_to_json_needs_no_selenium_or_pandas(tmp_path):
+    dump = tmp_path / "page.html"
+    dump.write_text(DASHBOARD_HTML, encoding="utf-8")
+    out = tmp_path / "transactions.json"
+
+    stdout, _ = run_python(
+        "import json, sys; from scraper.cli import main; "
+        f"status = main(['extract-from-dump', {str(dump)!r}, '--json', {str(out)!r}]); "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    assert loaded_heavy_modules(stdout) == ["lxml"]
+    transactions = json.loads(out.read_text(encoding="utf-8"))
+    assert [t["description"] for t in transactions] == ["Coffee Shop", "Salary"]
+
+
+def test_legacy_flags_map_to_subcommands():
+    assert parse_args([]).command == "scrape"
+    assert parse_args(["--accounts", "all", "--incremental"]).accounts
+    args = parse_args(["--worker", "--workers", "2", "--drain"])
+    assert (args.command, args.workers, args.drain) == ("worker", 2, True)
+    assert parse_args(["--stop-browser-server"]).action == "stop"
+
+
+def test_http_pull_keeps_empty_results_and_exports_despite_failures(monkeypatch):
+    import scraper.cli as cli
+    import scraper.http_client as http_client
+
+    import types
+    import pytest
+    import scraper.browser as browser
+    import scraper.login as login
+
+    # An API endpoint answering with no transactions does not send us back to Chrome
+    cached = types.SimpleNamespace(api_urls=["http://localhost:28318/api/transactions"])
+    monkeypatch.setattr(http_client.SessionClient, "from_session", classmethod(lambda cls, username: cached))
+    monkeypatch.setattr(http_client, "fetch_transactions", lambda client: [])
+    assert cli.pull_account_over_http("john.doe@email.com") == []
+
+    # The fallback dashboard page coming back empty does, and fails if the login finds no endpoint either
+    logins = []
+    cached.api_urls = []
+    monkeypatch.setattr(browser, "open_browser", lambda username, **kwargs: object())
+    monkeypatch.setattr(browser, "close_browser", lambda driver: None)
+    monkeypatch.setattr(login, "perform_login", lambda driver, **kwargs: logins.append(driver) or True)
+    monkeypatch.setattr(http_client.SessionClient, "from_driver",
+                        classmethod(lambda cls, driver: types.SimpleNamespace(api_urls=[])))
+    with pytest.raises(RuntimeError, match="no API endpoint"):
+        cli.pull_account_over_http("john.doe@email.com")
+    assert len(logins) == 1
+
+    def pull(username):
+        if username == "jane.smith@email.com":
+            raise http_client.SessionExpired("401 after login")
+        return [{"description": "Coffee Shop", "amount": "-$4.50", "date": "01/25/2021", "account": username}]
+
+    exported = []
+    monkeypatch.setattr(cli, "pull_account_over_http", pull)
+    monkeypatch.setattr(cli, "_export", lambda transactions, incremental: exported.extend(transactions))
+
+    assert cli.main_http(["jane.smith@email.com", "john.doe@email.com"]) == 1
+    assert [t["account"] for t in exported] == ["john.doe@email.com"]
+
+
+def test_http_login_browser_captures_api_urls_with_default_config(monkeypatch, tmp_path):
+    import scraper.browser as browser
+    import scraper.cli as cli
+    import scraper.http_client as http_client
+    import scraper.login as login
+    import scraper.session as session
+
+    api_url = "http://localhost:28318/api/transactions"
+
+    class CapturingChrome:
+        def __init__(self, service=None, options=None):
+            self.capture = "goog:loggingPrefs" in options.to_capabilities()
+            self.current_url = cli.DASHBOARD_URL
+
+        def get_log(self, kind):
+            if not self.capture:
+                raise Exception("log type 'performance' not found")
+            message = {"message": {"method": "Network.responseReceived", "params": {
+                "requestId": "1", "response": {"url": api_url, "mimeType": "application/json"}}}}
+            return [{"message": json.dumps(message)}]
+
+        def execute_cdp_cmd(self, cmd, params):
+            if cmd == "Network.getResponseBody":
+                rows = [{"description": "Coffee Shop", "amount": -4.5, "date": "2021-01-25"}]
+                return {"body": json.dumps({"transactions": rows})}
+            return {}
+
+        def execute_script(self, script, *args):
+            return "test-agent" if "userAgent" in script else {"local": {}, "session": {}}
+
+        def get_cookies(self):
+            return []
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(browser.webdriver, "Chrome", CapturingChrome)
+    monkeypatch.setattr(browser, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(http_client.SessionClient, "from_session", classmethod(lambda cls, username: None))
+    monkeypatch.setattr(login, "perform_login", lambda driver, **kwargs: True)
+    monkeypatch.setattr(session, "update_session", lambda username, **fields: None)
+    fetched_from = []
+
+    def fetch(client):
+        fetched_from.extend(client.api_urls)
+        return [{"description": "Coffee Shop", "amount": "-$4.50", "date": "01/25/2021"}]
+
+    monkeypatch.setattr(http_client, "fetch_transactions", fetch)
+
+    assert len(cli.pull_account_over_http("john.doe@email.com")) == 1
+    assert fetched_from == [api_url]
+
+
+def test_single_scrape_exports_each_batch_as_it_is_yielded(monkeypatch, tmp_path):
+    import types
+    import pandas as pd
+    import scraper.browser as browser
+    import scraper.cli as cli
+    import scraper.extract as extract
+    import scraper.login as login
+    import scraper.pipeline as pipeline
+
+    monkeypatch.setattr(cli, "CSV_PATH", str(tmp_path / "transactions.csv"))
+    monkeypatch.setattr(cli, "PARQUET_PATH", str(tmp_path / "transactions.parquet"))
+    monkeypatch.setattr(cli, "EXTRACT_MODE", "snapshot")
+    monkeypatch.setattr(cli, "SCROLL_EXTRACTION", True)
+    monkeypatch.setattr(browser, "open_browser", lambda username, **kwargs: types.SimpleNamespace(
+        current_url=cli.DASHBOARD_URL, title="Dashboard"))
+    monkeypatch.setattr(browser, "close_browser", lambda driver: None)
+    monkeypatch.setattr(login, "perform_login", lambda driver, **kwargs: True)
+    monkeypatch.setattr(login, "is_real_dashboard_content", lambda driver: True)
+
+    submitted = []
+    submit = pipeline.Pipeline.submit
+    monkeypatch.setattr(pipeline.Pipeline, "submit",
+                        lambda self, transactions: submitted.append(len(transactions)) or submit(self, transactions))
+
+    def batches(driver):
+        for window in range(3):
+            # The previous scroll window is already on its way to the writers
+            assert submitted == [2] * window
+            yield [{"description": f"Payment {window}.{i}", "amount": "-$4.50", "date": "01/25/2021"}
+                   for i in range(2)]
+
+    monkeypatch.setattr(extract, "iter_transaction_batches", batches)
+
+    assert cli.main_single() == 0
+    df = pd.read_csv(tmp_path / "transactions.csv")
+    assert len(df) == 6
+    # Tagged like --accounts rows, so both modes share dedup keys
+    assert set(df["account"]) == {cli.DEFAULT_USERNAME}
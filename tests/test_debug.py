@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import gzip
+from scraper.debug import ArtifactCollector
+
+
+class PageDriver:
+    page_source = "<html><body>Dashboard</body></html>"
+
+    def get_screenshot_as_png(self):
+        return b"\x89PNG"
+
+
+class Draws:
+    """
+    Stand-in for random.Random returning fixed draws
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def random(self):
+        return self.values.pop(0)
+
+
+def test_failures_always_captured_successes_sampled(tmp_path):
+    draws = Draws([0.1, 0.5, 0.9, 0.2, 0.4, 0.7])
+    collector = ArtifactCollector(str(tmp_path), success_sample=3, max_artifacts=0, rng=draws)
+    driver = PageDriver()
+
+    captured = [collector.capture(driver, "login") for _ in range(6)]
+    failure = collector.capture(driver, "login", failure=True)
+    collector.flush()
+
+    assert [prefix is not None for prefix in captured] == [True, False, False, True, False, False]
+    with gzip.open(f"{failure}.html.gz", "rt") as f:
+        assert f.read() == PageDriver.page_source
+    assert open(f"{failure}.png", "rb").read() == b"\x89PNG"
+
+
+def test_retention_keeps_newest_captures_whole(tmp_path):
+    collector = ArtifactCollector(str(tmp_path), max_artifacts=4)
+    for i in range(5):
+        collector.capture(PageDriver(), f"error {i}", failure=True)
+    collector.flush()
+
+    names = os.listdir(tmp_path)
+    assert len(names) == 8
+    assert sorted(name.split("failure-")[1] for name in names if name.endswith(".png")) == [
+        f"error_{i}.png" for i in range(1, 5)
+    ]
+    assert sum(name.endswith(".html.gz") for name in names) == 4
+
+
+def test_one_success_per_run_is_still_sampled(tmp_path):
+    import random
+
+    # Each cron run is a new process with a fresh collector that sees one login
+    rng = random.Random(7)
+    captured = 0
+    for run in range(400):
+        collector = ArtifactCollector(str(tmp_path / str(run)), success_sample=20, max_artifacts=0, rng=rng)
+        captured += collector.capture(PageDriver(), "login") is not None
+    assert 5 <= captured <= 45
+
+
+def test_sampled_success_does_not_wait_for_the_browser(tmp_path):
+    import threading
+
+    class SlowDriver(PageDriver):
+        release = threading.Event()
+
+        def get_screenshot_as_png(self):
+            self.release.wait(5)
+            return super().get_screenshot_as_png()
+
+    collector = ArtifactCollector(str(tmp_path), success_sample=1, max_artifacts=0)
+    prefix = collector.capture(SlowDriver(), "login")
+    assert prefix is not None and not os.path.exists(f"{prefix}.png")
+
+    SlowDriver.release.set()
+    collector.flush()
+    assert os.path.exists(f"{prefix}.png") and os.path.exists(f"{prefix}.html.gz")
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scraper.dedup import TransactionIndex, transaction_key
+
+
+def _transaction(description, amount="-$4.50", date="01/02/2024", account="john.doe@email.com"):
+    return {"description": description, "amount": amount, "date": date, "account": account, "full_text": "x"}
+
+
+def test_key_ignores_whitespace_case_and_raw_text():
+    a = _transaction("Coffee  Shop")
+    b = dict(_transaction("coffee shop"), full_text="re-rendered")
+
+    assert transaction_key(a) == transaction_key(b)
+    assert transaction_key(a) != transaction_key(_transaction("Coffee Shop", account="jane.smith@email.com"))
+
+
+def test_only_new_transactions_survive_across_runs(tmp_path):
+    path = str(tmp_path / "index.txt")
+    first_run = [_transaction("Coffee"), _transaction("Coffee"), _transaction("Rent", "-$900")]
+
+    index = TransactionIndex(path)
+    # Identical rows on one page are kept apart by their occurrence
+    assert index.filter_new(first_run) == first_run
+    index.commit()
+
+    index = TransactionIndex(path)
+    second_run = first_run + [_transaction("Salary", "+$3000")]
+    assert index.filter_new(second_run) == [_transaction("Salary", "+$3000")]
+    assert len(index) == 3
+
+
+def test_uncommitted_keys_are_not_persisted(tmp_path):
+    path = str(tmp_path / "index.txt")
+    index = TransactionIndex(path)
+    index.filter_new([_transaction("Coffee")])
+    index.discard_pending()
+    index.commit()
+
+    assert TransactionIndex(path).filter_new([_transaction("Coffee")]) == [_transaction("Coffee")]
+
+
+def test_key_uses_normalized_amount_and_date():
+    extracted = _transaction("Rent", amount="-$150", date="25 Jan 2021")
+    exported = _transaction("Rent", amount="-150.0", date="2021-01-25")
+
+    assert transaction_key(extracted) == transaction_key(exported)
+    assert transaction_key(extracted) != transaction_key(_transaction("Rent", amount="$150", date="25 Jan 2021"))
+
+
+def test_old_format_index_is_rebuilt_from_export(tmp_path):
+    from scraper.export import export_transactions
+
+    path = str(tmp_path / "index.txt")
+    csv_path = str(tmp_path / "transactions.csv")
+    history = [_transaction("Coffee"), _transaction("Coffee"), _transaction("Rent", "-$900")]
+    export_transactions(history, csv_path)
+    with open(path, "w") as f:
+        f.write("0123456789abcdef0123456789abcdef\n")
+
+    index = TransactionIndex(path, export_path=csv_path)
+    assert len(index) == 3
+    assert index.filter_new(history + [_transaction("Salary", "+$3000")]) == [_transaction("Salary", "+$3000")]
+    index.commit()
+    assert len(TransactionIndex(path, export_path=csv_path)) == 4
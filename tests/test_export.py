@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from scraper.export import TransactionWriter, export_transactions, COLUMNS
+
+
+def _rows(count, start=0):
+    return [
+        {"description": f"Payment {i}", "amount": f"-${i}.50", "date": "01/02/2024"}
+        for i in range(start, start + count)
+    ]
+
+
+def test_parquet_is_written_in_row_groups(tmp_path):
+    path = str(tmp_path / "transactions.parquet")
+
+    with TransactionWriter(path, chunk_size=3) as writer:
+        writer.write(_rows(4))
+        writer.write(_rows(3, start=4))
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == 3
+    assert parquet.schema_arrow.names == COLUMNS
+    assert pq.read_table(path).column("amount").to_pylist()[-1] == -6.5
+
+
+def test_append_keeps_previous_rows(tmp_path):
+    for name in ("transactions.csv", "transactions.parquet"):
+        path = str(tmp_path / name)
+        export_transactions(_rows(2), path)
+        export_transactions(_rows(1, start=2), path, append=True)
+
+        if name.endswith(".csv"):
+            df = pd.read_csv(path)
+        else:
+            df = pq.read_table(path).to_pandas()
+        assert df["description"].tolist() == ["Payment 0", "Payment 1", "Payment 2"]
+
+
+def test_failed_export_leaves_target_untouched(tmp_path):
+    path = str(tmp_path / "transactions.csv")
+    export_transactions(_rows(2), path)
+    before = open(path).read()
+
+    with pytest.raises(RuntimeError):
+        with TransactionWriter(path, append=True, chunk_size=1) as writer:
+            writer.write(_rows(5))
+            raise RuntimeError("browser crashed")
+
+    assert open(path).read() == before
+    assert os.listdir(tmp_path) == ["transactions.csv"]
+
+
+def test_append_only_writes_new_rows(tmp_path):
+    csv_path = str(tmp_path / "transactions.csv")
+    parquet_path = str(tmp_path / "transactions.parquet")
+    for path in (csv_path, parquet_path):
+        export_transactions(_rows(2), path)
+    first_part = open(parquet_path, "rb").read()
+
+    for start in (2, 3):
+        for path in (csv_path, parquet_path):
+            export_transactions(_rows(1, start=start), path, append=True)
+
+    # The CSV grew in place; the Parquet export became a dataset of one part per run
+    assert pd.read_csv(csv_path)["description"].tolist() == [f"Payment {i}" for i in range(4)]
+    parts = sorted(os.listdir(parquet_path))
+    assert len(parts) == 3
+    assert open(os.path.join(parquet_path, parts[0]), "rb").read() == first_part
+    assert pq.read_table(parquet_path).column("description").to_pylist() == [f"Payment {i}" for i in range(4)]
+
+
+def test_raw_text_is_exported_as_last_column_when_kept(tmp_path):
+    rows = [dict(row, full_text=f"{row['description']}\n01/02/2024\n{row['amount']}") for row in _rows(2)]
+
+    for name in ("transactions.csv", "transactions.parquet"):
+        path = str(tmp_path / name)
+        export_transactions(rows, path)
+        assert "full_text" not in (pd.read_csv(path) if name.endswith(".csv") else pd.read_parquet(path)).columns
+
+        with TransactionWriter(path, keep_raw=True) as writer:
+            writer.write(rows)
+        df = pd.read_csv(path) if name.endswith(".csv") else pd.read_parquet(path)
+        assert list(df.columns) == COLUMNS + ["full_text"]
+        assert df["full_text"].tolist() == [row["full_text"] for row in rows]
+
+
+def test_append_moves_an_old_format_export_aside(tmp_path):
+    path = tmp_path / "transactions.csv"
+    # The header exports had before the typed columns
+    path.write_text('description,amount,date,full_text\nCoffee,-$4.50,01/25/2021,"Coffee -$4.50"\n')
+
+    export_transactions(_rows(2), str(path), append=True)
+    export_transactions(_rows(1, start=2), str(path), append=True)
+
+    assert list(pd.read_csv(path).columns) == COLUMNS
+    assert pd.read_csv(path)["amount"].tolist() == [-0.5, -1.5, -2.5]
+    (old,) = tmp_path.glob("transactions.*.old.csv")
+    assert old.read_text().startswith("description,amount,date,full_text\nCoffee")
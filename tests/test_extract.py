@@ -0,0 +1,155 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scraper.extract import extract_from_snapshot, snapshot_page, CARD_SELECTORS
+
+
+def test_snapshot_list_layout(empty_snapshot):
+    """
+    homepage2-style list items are parsed from the snapshot payload
+    """
+    snapshot = empty_snapshot
+    snapshot["list"] = [
+        "Spotify Subscription\n01/25/2021\n-$150",
+        "Freepik Sales\n01/25/2021\n+$750",
+        "",
+    ]
+
+    transactions, method = extract_from_snapshot(snapshot)
+
+    assert method == "list"
+    assert [t["description"] for t in transactions] == ["Spotify Subscription", "Freepik Sales"]
+    assert transactions[0]["date"] == "01/25/2021"
+
+
+def test_snapshot_table_skips_header_and_login_rows(empty_snapshot):
+    """
+    Table rows keep the cell order description/amount/date/category
+    """
+    snapshot = empty_snapshot
+    snapshot["table"] = [
+        [],
+        ["Coffee Shop", "$4.50", "01/02/2024", "Food"],
+        ["Forgot password", "", "", ""],
+    ]
+
+    transactions, method = extract_from_snapshot(snapshot)
+
+    assert method == "table"
+    assert transactions == [
+        {"description": "Coffee Shop", "amount": "$4.50", "date": "01/02/2024", "category": "Food"}
+    ]
+
+
+def test_snapshot_falls_through_to_generic(empty_snapshot):
+    snapshot = empty_snapshot
+    snapshot["cards"][0]["texts"] = ["Sign in to your account"]
+    snapshot["generic"] = ["Netflix\n$15.99", "Netflix\n$15.99"]
+
+    transactions, method = extract_from_snapshot(snapshot)
+
+    assert method == "generic"
+    assert len(transactions) == 1
+
+
+def test_snapshot_page_is_one_script_call(empty_snapshot):
+    class FakeDriver:
+        def __init__(self):
+            self.calls = 0
+
+        def execute_script(self, script, *args):
+            self.calls += 1
+            assert args[0] == CARD_SELECTORS
+            return empty_snapshot
+
+    driver = FakeDriver()
+    assert extract_from_snapshot(snapshot_page(driver)) == ([], None)
+    assert driver.calls == 1
+
+
+def test_layout_cache_goes_straight_to_winning_strategy(tmp_path, snapshot_driver):
+    from scraper.extract import extract_transactions, METHODS
+    from scraper.layout import LayoutCache
+
+    cache = LayoutCache(str(tmp_path / "layout_cache.json"))
+    driver = snapshot_driver
+
+    assert len(extract_transactions(driver, mode="snapshot", layout_cache=cache)) == 1
+    assert cache.get("/homepage2|homepage2_items") == {"strategy": "list", "selector": None}
+
+    # A new run (fresh cache object, same file) only collects the list section
+    cache = LayoutCache(str(tmp_path / "layout_cache.json"))
+    assert len(extract_transactions(driver, mode="snapshot", layout_cache=cache)) == 1
+    assert driver.snapshot_requests == [METHODS, ["list"]]
+
+
+def test_scroll_extraction_streams_each_row_once(tmp_path, virtual_list_driver):
+    from scraper.extract import iter_transaction_batches
+    from scraper.layout import LayoutCache
+
+    driver = virtual_list_driver
+    batches = list(iter_transaction_batches(
+        driver, mode="snapshot", layout_cache=LayoutCache(str(tmp_path / "layout_cache.json"))
+    ))
+
+    descriptions = [t["description"] for batch in batches for t in batch]
+    assert descriptions == [f"Payment {i}" for i in range(25)]
+    assert [len(batch) for batch in batches] == [10, 8, 7]
+    assert driver.scrolls == 2
+
+
+def test_identical_rows_on_later_pages_are_kept(tmp_path, paged_list_driver):
+    from scraper.extract import iter_transaction_batches
+    from scraper.layout import LayoutCache
+
+    coffee = "Coffee Shop\n01/25/2021\n-$4.50"
+    driver = paged_list_driver([
+        [coffee, "Salary\n01/24/2021\n$2000.00"],
+        [coffee, "Rent\n01/26/2021\n-$900.00"],
+    ])
+    batches = list(iter_transaction_batches(
+        driver, mode="snapshot", layout_cache=LayoutCache(str(tmp_path / "layout_cache.json"))
+    ))
+
+    assert [[t["description"] for t in batch] for batch in batches] == [
+        ["Coffee Shop", "Salary"], ["Coffee Shop", "Rent"]
+    ]
+
+
+def test_identical_rows_across_scroll_windows_are_kept(tmp_path, virtual_list_driver):
+    from scraper.extract import iter_transaction_batches
+    from scraper.layout import LayoutCache
+
+    driver = virtual_list_driver
+    # The same purchase again further down, outside the first window
+    driver.rows[15] = driver.rows[5]
+    batches = list(iter_transaction_batches(
+        driver, mode="snapshot", layout_cache=LayoutCache(str(tmp_path / "layout_cache.json"))
+    ))
+
+    descriptions = [t["description"] for batch in batches for t in batch]
+    assert len(descriptions) == 25
+    assert descriptions.count("Payment 5") == 2
+
+
+def test_webdriver_generic_resolves_parents_in_two_calls():
+    from scraper.extract import _extract_generic_transactions, MONEY_PARENT_XPATH
+
+    class ParentsDriver:
+        def __init__(self):
+            self.calls = []
+
+        def find_elements(self, by, value):
+            self.calls.append(value)
+            return ["row1", "row2", "row1-again"]
+
+        def execute_script(self, script, elements):
+            self.calls.append(len(elements))
+            return ["Netflix\n01/02/2024\n$15.99", "Rent\n01/03/2024\n$900", "Netflix\n01/02/2024\n$15.99 "]
+
+    driver = ParentsDriver()
+    transactions = _extract_generic_transactions(driver)
+
+    assert [t["description"] for t in transactions] == ["Netflix", "Rent"]
+    assert driver.calls == [MONEY_PARENT_XPATH, 3]
@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scraper.governor import DriverGovernor, process_tree_rss, _proc_tree_rss
+
+
+class PageDriver:
+    def __init__(self, user_data_dir):
+        self.user_data_dir = user_data_dir
+        self.closed = False
+        self.url = None
+
+    def get(self, url):
+        self.url = url
+
+    def quit(self):
+        self.closed = True
+
+
+def test_pool_recycles_driver_past_page_limit_on_same_profile(monkeypatch):
+    import scraper.browser as browser
+
+    launched = []
+
+    def fake_launch(headless=True, user_data_dir=None):
+        launched.append(PageDriver(user_data_dir))
+        return launched[-1]
+
+    monkeypatch.setattr(browser, "launch_browser", fake_launch)
+    governor = DriverGovernor(max_pages=3, max_age=None, max_rss_mb=None)
+
+    with browser.BrowserPool(size=1, governor=governor) as pool:
+        with pool.driver() as driver:
+            driver.get("http://localhost/homepage1")
+            driver.get("http://localhost/homepage2")
+        assert pool.acquire() is driver
+        driver.get("http://localhost/homepage1")
+        pool.release(driver)
+
+        # Third page load hit the limit: the next worker gets a fresh driver on the same profile
+        fresh = pool.acquire()
+        assert fresh is not driver and driver.closed
+        assert fresh.user_data_dir == driver.user_data_dir
+        assert governor.usage(fresh)["pages"] == 0
+        pool.release(fresh)
+
+    assert len(launched) == 2 and fresh.closed
+
+
+def test_age_limit_and_process_tree_rss():
+    governor = DriverGovernor(max_pages=None, max_age=0, max_rss_mb=None)
+    driver = governor.track(PageDriver(None))
+    assert governor.recycle_reason(driver).endswith("min old")
+
+    assert process_tree_rss(None) is None
+    if os.path.isdir("/proc"):
+        assert _proc_tree_rss(os.getpid()) > 1024 * 1024
+
+
+def test_recycle_keeps_slot_reserved_and_wakes_waiters_on_failure(monkeypatch):
+    import threading
+    import scraper.browser as browser
+
+    launched = []
+    relaunch_started = threading.Event()
+    finish_relaunch = threading.Event()
+    fail_relaunch = [False]
+
+    def fake_launch(headless=True, user_data_dir=None):
+        if launched:
+            relaunch_started.set()
+            finish_relaunch.wait(5)
+            if fail_relaunch[0]:
+                fail_relaunch[0] = False
+                raise RuntimeError("chrome crashed")
+        launched.append(PageDriver(user_data_dir))
+        return launched[-1]
+
+    monkeypatch.setattr(browser, "launch_browser", fake_launch)
+    governor = DriverGovernor(max_pages=1, max_age=None, max_rss_mb=None)
+
+    with browser.BrowserPool(size=1, governor=governor) as pool:
+        for failing in (False, True):
+            fail_relaunch[0] = failing
+            relaunch_started.clear()
+            finish_relaunch.clear()
+            driver = pool.acquire()
+            driver.get("http://localhost/homepage1")
+            releaser = threading.Thread(target=pool.release, args=(driver,))
+            releaser.start()
+            assert relaunch_started.wait(5)
+
+            # A worker asking while the replacement launches waits for it
+            got = []
+            waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+            waiter.start()
+            finish_relaunch.set()
+            releaser.join()
+            waiter.join()
+
+            # On failure the waiter is woken and launches into the freed slot itself
+            assert got == [launched[-1]] and not got[0].closed
+            pool.release(got[0])
+
+    assert len(launched) == 3
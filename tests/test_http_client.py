@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from benchmarks.fixtures import homepage2_html
+from scraper.http_client import SessionClient, SessionExpired, fetch_transactions
+
+API_PAYLOAD = {"transactions": [{"name": "Coffee Shop", "amount": -4.5, "date": "2024-01-02"}]}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Dashboard stand-in that only answers requests carrying the session."""
+
+    def do_GET(self):
+        authenticated = ("authToken=abc" in self.headers.get("Cookie", "")
+                         and self.headers.get("Authorization") == "Bearer tok")
+        if self.path == "/homepage2" and not authenticated:
+            self.send_response(302)
+            self.send_header("Location", "/login")
+            self.end_headers()
+            return
+        if not authenticated:
+            self.send_response(401)
+            self.end_headers()
+            return
+        if self.path == "/api/transactions":
+            body, content_type = json.dumps(API_PAYLOAD).encode(), "application/json"
+        else:
+            body, content_type = homepage2_html(3).encode(), "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _session(**storage):
+    return {
+        "cookies": [{"name": "authToken", "value": "abc", "domain": "127.0.0.1", "path": "/"},
+                    {"name": "other", "value": "x", "domain": "example.com", "path": "/"}],
+        "local_storage": storage,
+    }
+
+
+def test_copied_session_pulls_html_and_json(server):
+    client = SessionClient.from_session_data(_session(authToken="tok"))
+    assert client.cookie_header(server + "/api/transactions") == "authToken=abc"
+
+    transactions = fetch_transactions(client, [server + "/homepage2", server + "/api/transactions"])
+
+    assert len(transactions) == 4
+    assert transactions[-1] == {"description": "Coffee Shop", "amount": "-4.5", "date": "2024-01-02"}
+
+
+def test_rejected_session_raises(server):
+    client = SessionClient.from_session_data(_session())
+
+    with pytest.raises(SessionExpired, match="login page"):
+        client.get(server + "/homepage2")
+    with pytest.raises(SessionExpired, match="401"):
+        client.get(server + "/api/transactions")
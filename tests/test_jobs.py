@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+from scraper.jobs import JobQueue, run_worker
+
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), **kwargs)
+
+
+def test_leases_are_exclusive_and_expire(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.2)
+    first = queue.enqueue("john_doe", "homepage1")
+    second = queue.enqueue("jane_smith", "homepage2", {"incremental": True})
+
+    a = queue.lease("node-a")
+    b = queue.lease("node-b")
+    assert (a.id, b.id) == (first, second)
+    assert b.options == {"incremental": True}
+    assert queue.lease("node-c") is None
+
+    # node-a dies; its lease runs out and another node picks the job up
+    time.sleep(0.3)
+    assert queue.heartbeat(second, "node-b")
+    reclaimed = queue.lease("node-c")
+    assert (reclaimed.id, reclaimed.attempts) == (first, 2)
+    assert not queue.complete(first, "node-a", {"transactions": []})
+    assert queue.complete(first, "node-c", {"transactions": []})
+
+
+def test_failed_attempts_retry_then_fail(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    job_id = queue.enqueue("john_doe")
+
+    queue.lease("node")
+    queue.fail(job_id, "node", "timeout", retry_delay=0)
+    assert queue.get(job_id).status == "queued"
+
+    queue.lease("node")
+    queue.fail(job_id, "node", RuntimeError("timeout again"), retry_delay=0)
+    job = queue.get(job_id)
+    assert (job.status, job.attempts, job.error) == ("failed", 2, "timeout again")
+    assert queue.lease("node") is None
+
+
+def test_worker_drains_queue_and_results_are_collected(tmp_path):
+    queue = make_queue(tmp_path)
+    for account in ("john_doe", "jane_smith", "bob_wilson"):
+        queue.enqueue(account)
+    queue.enqueue("broken", max_attempts=1)
+
+    def handler(job):
+        if job.account == "broken":
+            raise RuntimeError("login failed")
+        return {"transactions": [{"description": job.account, "amount": "$1.00", "date": ""}]}
+
+    assert run_worker(queue, handler, slots=2, stop_when_idle=True, heartbeat_interval=0.05) == 3
+    done = queue.jobs("done")
+    assert sorted(job.result["transactions"][0]["description"] for job in done) == [
+        "bob_wilson", "jane_smith", "john_doe"
+    ]
+    assert queue.jobs("failed")[0].error == "login failed"
+
+    queue.collect([job.id for job in done])
+    assert queue.counts() == {"collected": 3, "failed": 1}
+
+
+def test_draining_worker_waits_for_retries(tmp_path):
+    queue = make_queue(tmp_path, retry_delay=0.2)
+    queue.enqueue("john_doe")
+    queue.enqueue("flaky")
+    attempts = []
+
+    def handler(job):
+        attempts.append(job.account)
+        if job.account == "flaky" and job.attempts == 1:
+            raise RuntimeError("session expired")
+        return {"transactions": []}
+
+    started = time.monotonic()
+    # The retry is due long before the next poll; the worker wakes up for it
+    assert run_worker(queue, handler, slots=2, stop_when_idle=True, poll_interval=5, heartbeat_interval=0.05) == 2
+    assert time.monotonic() - started < 3
+    assert sorted(attempts) == ["flaky", "flaky", "john_doe"]
+    assert queue.counts() == {"done": 2}
+
+
+def test_shared_database_uses_a_rollback_journal(tmp_path):
+    import sqlite3
+
+    def journal_mode(queue):
+        with queue._connection() as db:
+            return db.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert journal_mode(make_queue(tmp_path)) == "wal"
+    # The same file switched over for workers on other hosts
+    queue = make_queue(tmp_path, shared=True)
+    queue.enqueue("john_doe")
+    assert journal_mode(queue) == "delete"
+    assert not os.path.exists(str(tmp_path / "jobs.sqlite3-wal"))
+    assert sqlite3.connect(str(tmp_path / "jobs.sqlite3")).execute("PRAGMA journal_mode").fetchone()[0] == "delete"
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scraper.login import is_real_dashboard_content, LOGIN_INDICATORS, DASHBOARD_INDICATORS
+
+
+class ProbeDriver:
+    """
+    Fake driver answering the dashboard probe script with a fixed result
+    """
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.result
+
+
+def test_dashboard_check_is_one_round_trip():
+    driver = ProbeDriver({
+        "login": [], "score": 3, "cached": False,
+        "evidence": [{"indicator": DASHBOARD_INDICATORS[0], "text": "-$150"}],
+    })
+
+    assert is_real_dashboard_content(driver)
+    assert driver.calls == [(LOGIN_INDICATORS, DASHBOARD_INDICATORS)]
+
+
+def test_login_form_or_low_score_is_not_dashboard():
+    assert not is_real_dashboard_content(ProbeDriver({"login": ["input#email"], "score": 0, "evidence": []}))
+    assert not is_real_dashboard_content(ProbeDriver({"login": [], "score": 1, "evidence": []}))
+
+
+class LoginDriver:
+    """
+    Fake driver for perform_login with stubbed strategies
+    """
+    current_url = "http://localhost:28318/login"
+
+    def get(self, url):
+        self.current_url = url
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script, *args):
+        return {"url": self.current_url, "title": "Dashboard", "user": None, "rememberMe": None}
+
+
+def test_stats_rank_fastest_successful_strategy_first(tmp_path):
+    from scraper.login_stats import LoginStats
+
+    stats = LoginStats(str(tmp_path / "login_stats.json"))
+    stats.record("bank", "form", False, 5.0)
+    stats.record("bank", "spam", True, 40.0)
+    stats.record("bank", "inject", True, 2.0)
+    assert stats.order("bank", ["session", "form", "spam", "inject"]) == ["inject", "spam", "session", "form"]
+    # Untouched targets keep the configured order; stats survive a reload
+    assert stats.order("other", ["form", "inject"]) == ["form", "inject"]
+    assert LoginStats(stats.path).get("bank", "inject")["successes"] == 1
+
+
+def test_stats_from_concurrent_workers_are_merged(tmp_path):
+    from scraper.login_stats import LoginStats
+
+    # Two worker processes, each loaded the file before the other recorded
+    first = LoginStats(str(tmp_path / "login_stats.json"))
+    second = LoginStats(first.path)
+    first.record("bank", "form", True, 3.0)
+    second.record("bank", "form", False, 5.0)
+    second.record("bank", "inject", True, 2.0)
+
+    merged = LoginStats(first.path)
+    assert merged.get("bank", "form")["attempts"] == 2
+    assert merged.get("bank", "inject")["successes"] == 1
+
+
+def test_perform_login_learns_working_strategy(tmp_path, monkeypatch):
+    from scraper import login
+    from scraper.login_stats import LoginStats
+
+    calls = []
+
+    def strategy(name, result):
+        def run(driver, username, password):
+            calls.append(name)
+            return result
+        return run
+
+    monkeypatch.setattr(login, "LOGIN_STRATEGIES", {
+        "form": strategy("form", False), "spam": strategy("spam", False), "inject": strategy("inject", True),
+    })
+    monkeypatch.setattr(login, "capture_artifacts", lambda *args, **kwargs: None)
+    stats = LoginStats(str(tmp_path / "login_stats.json"))
+    names = ["form", "spam", "inject"]
+
+    assert login.perform_login(LoginDriver(), use_session_cache=False, strategies=names, stats=stats)
+    assert login.perform_login(LoginDriver(), use_session_cache=False, strategies=names, stats=stats)
+    assert calls == ["form", "spam", "inject", "inject"]
@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from scraper.network import extract_from_network, reset_network_capture, transactions_from_payload
+from scraper.normalize import normalize_transactions
+
+PAYLOAD = {
+    "user": {"name": "John Doe", "balance": 1200},
+    "data": {
+        "transactions": [
+            {"id": 1, "merchant": "Spotify", "amount": -15.99, "currency": "usd",
+             "postedAt": "2021-01-25T10:00:00Z", "category": "Subscription"},
+            {"id": 2, "description": "Freepik Sales", "amount": "+$750", "date": "01/26/2021"},
+        ],
+        "pages": [{"page": 1}],
+    },
+}
+
+
+def _log_entry(request_id, url, mime_type="application/json"):
+    message = {"message": {"method": "Network.responseReceived", "params": {
+        "requestId": request_id, "response": {"url": url, "mimeType": mime_type}}}}
+    return {"message": json.dumps(message)}
+
+
+class NetworkDriver:
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.log = [_log_entry(request_id, url) for request_id, (url, _) in bodies.items()]
+        self.log.append(_log_entry("img", "http://localhost/api/logo.png", "image/png"))
+        self.fetched = []
+
+    def get_log(self, name):
+        log, self.log = self.log, []
+        return log
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.fetched.append(params["requestId"])
+        return {"body": json.dumps(self.bodies[params["requestId"]][1]), "base64Encoded": False}
+
+
+def test_payload_walk_maps_transaction_fields():
+    transactions = transactions_from_payload(PAYLOAD)
+
+    assert transactions == [
+        {"description": "Spotify", "amount": "-15.99 USD", "date": "2021-01-25", "category": "Subscription"},
+        {"description": "Freepik Sales", "amount": "+$750", "date": "01/26/2021"},
+    ]
+    df = normalize_transactions(transactions)
+    assert df["amount"].tolist() == [-15.99, 750.0]
+    assert df["currency"].tolist() == ["USD", "USD"]
+
+
+def test_matching_responses_are_fetched_once_and_reset_per_account():
+    driver = NetworkDriver({
+        "1": ("http://localhost/api/transactions?page=1", PAYLOAD),
+        "2": ("http://localhost/api/profile", {"name": "John"}),
+    })
+
+    assert len(extract_from_network(driver)) == 2
+    assert len(extract_from_network(driver)) == 2
+    assert driver.fetched == ["1", "2"]
+
+    reset_network_capture(driver)
+    assert extract_from_network(driver) == []
+
+
+def test_network_mode_falls_back_to_dom(tmp_path, snapshot_driver):
+    from scraper.extract import extract_transactions
+    from scraper.layout import LayoutCache
+
+    cache = LayoutCache(str(tmp_path / "layout_cache.json"))
+    transactions = extract_transactions(snapshot_driver, mode="network", layout_cache=cache)
+
+    assert [t["description"] for t in transactions] == ["Mobile Service"]
+    assert cache.get("/homepage2|homepage2_items") == {"strategy": "list", "selector": None}
@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+from scraper.normalize import normalize_transactions
+
+
+def test_amounts_are_signed_floats_with_currency():
+    df = normalize_transactions([
+        {"description": "Coffee", "amount": "$4.50", "date": "01/02/2024"},
+        {"description": "Refund", "amount": "(£20.00)", "date": "2024-03-05"},
+        {"description": "Sale", "amount": "1,234.5 EUR", "date": "Jan 5, 2024"},
+        # The field regex picked up a bare number; the row text has the real amount
+        {"description": "Spotify", "amount": "\n25", "date": "", "full_text": "Spotify\n25 Jan 2021\n-$150"},
+    ])
+
+    assert df["amount"].dtype == "float64"
+    assert df["amount"].tolist() == [4.5, -20.0, 1234.5, -150.0]
+    assert df["currency"].tolist() == ["USD", "GBP", "EUR", "USD"]
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df["date"].tolist() == [
+        pd.Timestamp("2024-01-02"), pd.Timestamp("2024-03-05"),
+        pd.Timestamp("2024-01-05"), pd.Timestamp("2021-01-25"),
+    ]
+
+
+def test_raw_text_dropped_unless_requested():
+    rows = [{"description": "Netflix", "amount": "$15.99", "date": "", "full_text": "Netflix $15.99"}]
+
+    assert "full_text" not in normalize_transactions(rows).columns
+    assert normalize_transactions(rows, keep_raw=True)["full_text"].tolist() == ["Netflix $15.99"]
+
+
+def test_unparseable_values_become_missing():
+    df = normalize_transactions([{"description": "Pending", "amount": "", "date": "soon"}])
+
+    assert df["amount"].isna().all()
+    assert df["date"].isna().all()
+
+
+def test_records_without_raw_text_normalize_like_dicts_with_it():
+    from scraper.strategies import transaction_from_text
+    from scraper.transaction import Transaction
+
+    text = "Spotify\n25 Jan 2021\n-$150"
+    record = transaction_from_text(text)
+
+    # Amount and date come from the text at extraction time; the text is not kept
+    assert isinstance(record, Transaction) and "full_text" not in record
+    assert (record["amount"], record["date"]) == ("-$150", "25 Jan 2021")
+    assert not hasattr(record, "__dict__")
+
+    record["account"] = "john_doe"
+    legacy = {"description": "Spotify", "amount": "\n25", "date": "", "full_text": text, "account": "john_doe"}
+    pd.testing.assert_frame_equal(normalize_transactions([record]), normalize_transactions([legacy]))
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scraper.parse import snapshot_html, extract_transactions_from_html, extract_transactions_from_dumps
+
+HOMEPAGE1_HTML = """
+<html><head><title>Dashboard</title><script>var x = "$999";</script></head>
+<body>
+  <div class="shadow-neumorphism rounded">
+    <div id="transaction-1" class="flex">
+      <div id="transaction-1-name">Spotify Subscription</div>
+      <div id="transaction-1-date">01/25/2021</div>
+      <div id="transaction-1-amount">-$150</div>
+    </div>
+    <div id="transaction-2" class="flex">
+      <div id="transaction-2-name">Freepik Sales</div>
+      <div id="transaction-2-date">01/26/2021</div>
+      <div id="transaction-2-amount">+$750</div>
+    </div>
+  </div>
+</body></html>
+"""
+
+HOMEPAGE2_HTML = """
+<html><body>
+  <ul>
+    <li><span class="font-bold">Mobile Service</span> <span class="text-gray-400">Verizon</span>
+        <span class="text-right">-$150</span></li>
+    <li><span class="font-bold">Emilly Wilson</span> <span class="text-gray-400">Transfer</span>
+        <span class="text-right">+$780</span></li>
+  </ul>
+</body></html>
+"""
+
+
+def test_homepage1_uses_generic_parents():
+    """
+    div-based rows have no card/list markup, so the money-symbol parents are used
+    """
+    snapshot = snapshot_html(HOMEPAGE1_HTML)
+
+    # The <script> match resolves to <head>, which renders no text
+    assert snapshot["generic"] == [
+        "",
+        "Spotify Subscription\n01/25/2021\n-$150",
+        "Freepik Sales\n01/26/2021\n+$750",
+    ]
+    transactions = extract_transactions_from_html(HOMEPAGE1_HTML)
+    assert [t["description"] for t in transactions] == ["Spotify Subscription", "Freepik Sales"]
+
+
+def test_homepage2_uses_list_items():
+    transactions = extract_transactions_from_html(HOMEPAGE2_HTML)
+
+    assert [t["description"] for t in transactions] == [
+        "Mobile Service Verizon -$150",
+        "Emilly Wilson Transfer +$780",
+    ]
+
+
+def test_extract_from_dumps(tmp_path):
+    (tmp_path / "a.html").write_text(HOMEPAGE1_HTML, encoding="utf-8")
+    (tmp_path / "b.html").write_text(HOMEPAGE2_HTML, encoding="utf-8")
+
+    results = extract_transactions_from_dumps(str(tmp_path / "*.html"))
+
+    assert [len(v) for v in results.values()] == [2, 2]
@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import pandas as pd
+import pytest
+from scraper.dedup import TransactionIndex
+from scraper.export import TransactionWriter
+from scraper.pipeline import Pipeline
+
+
+def _rows(count, account="john.doe@email.com"):
+    return [
+        {"description": f"Payment {i}", "amount": f"-${i}.50", "date": "01/02/2024", "account": account}
+        for i in range(count)
+    ]
+
+
+class BlockingWriter:
+    """Writer that holds the export stage until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.frames = []
+        self.aborted = False
+
+    def write_frame(self, df):
+        self.release.wait(5)
+        self.frames.append(df)
+
+    def finalize(self):
+        pass
+
+    def abort(self):
+        self.aborted = True
+
+
+def test_batches_flow_to_every_writer(tmp_path):
+    csv_path = str(tmp_path / "transactions.csv")
+    index = TransactionIndex(str(tmp_path / "index.txt"))
+    pipeline = Pipeline([TransactionWriter(csv_path), TransactionWriter(str(tmp_path / "t.parquet"))], index, batch_size=2)
+
+    pipeline.submit(_rows(5))
+    pipeline.submit(_rows(1, account="jane.smith@email.com"))
+
+    assert pipeline.close() == 6
+    df = pd.read_csv(csv_path)
+    assert df["amount"].tolist() == [-0.5, -1.5, -2.5, -3.5, -4.5, -0.5]
+    assert len(TransactionIndex(str(tmp_path / "index.txt"))) == 6
+
+
+def test_identical_rows_in_later_batches_are_numbered_per_account(tmp_path):
+    def run():
+        csv_path = str(tmp_path / "transactions.csv")
+        pipeline = Pipeline([TransactionWriter(csv_path, append=True)], TransactionIndex(str(tmp_path / "index.txt")))
+        # The same coffee in two scroll windows of one account, and once for another account
+        pipeline.submit(_rows(2))
+        pipeline.submit(_rows(1, account="jane.smith@email.com"))
+        pipeline.submit(_rows(1))
+        return pipeline.close()
+
+    assert run() == 4
+    assert run() == 0
+
+
+def test_submit_blocks_when_stages_fall_behind():
+    writer = BlockingWriter()
+    pipeline = Pipeline([writer], queue_size=1, batch_size=1)
+    submitter = threading.Thread(target=pipeline.submit, args=(_rows(10),))
+    submitter.start()
+
+    submitter.join(0.5)
+    assert submitter.is_alive()
+
+    writer.release.set()
+    submitter.join(5)
+    assert pipeline.close() == 10
+
+
+def test_stage_failure_aborts_outputs():
+    class FailingWriter(BlockingWriter):
+        def write_frame(self, df):
+            raise OSError("disk full")
+
+    writer = FailingWriter()
+    pipeline = Pipeline([writer], queue_size=1, batch_size=1)
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        pipeline.submit(_rows(10))
+        pipeline.close()
+    pipeline.abort()
+    assert writer.aborted
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import scraper.session as session
+
+
+class StorageDriver:
+    """
+    Fake driver with cookies and web storage for one origin
+    """
+
+    def __init__(self, cookies=None, local=None, session_storage=None):
+        self.cookies = list(cookies or [])
+        self.local = dict(local or {})
+        self.session = dict(session_storage or {})
+        self.current_url = "http://localhost:28318/homepage1"
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+        if "__scraperObserver" in script:
+            return {"state": "complete", "url": self.current_url, "quietFor": 1000, "mutations": 0, "matched": []}
+        if "storage.key" in script:
+            return {"local": dict(self.local), "session": dict(self.session)}
+        if "clear()" in script:
+            self.local.clear()
+            self.session.clear()
+        elif "setItem" in script:
+            self.local.update(args[0] or {})
+            self.session.update(args[1] or {})
+
+
+def test_save_and_restore_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "SESSION_DIR", str(tmp_path))
+    source = StorageDriver(
+        cookies=[{"name": "authToken", "value": "abc", "path": "/"}],
+        local={"isLoggedIn": "true"},
+        session_storage={"user": "{}"},
+    )
+    session.save_session(source, "john.doe@email.com")
+
+    target = StorageDriver(local={"user": "previous account"})
+    assert session.restore_session(target, "john.doe@email.com")
+
+    assert target.cookies == source.cookies
+    assert target.local == {"isLoggedIn": "true"}
+    assert target.session == {"user": "{}"}
+    assert target.visited[-1] == session.DASHBOARD_URL
+    # Another user has no cached session
+    assert not session.restore_session(StorageDriver(), "jane.smith@email.com")
+
+
+def test_previous_account_state_is_cleared_before_the_page_loads():
+    class RecordingDriver(StorageDriver):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.loaded_with = []
+
+        def get(self, url):
+            self.loaded_with.append((url, dict(self.local), list(self.cookies)))
+            super().get(url)
+
+    # Already on the site: cleared in place, then loaded once
+    driver = RecordingDriver(cookies=[{"name": "authToken", "value": "abc"}], local={"user": "previous account"})
+    session.load_clean(driver, session.LOGIN_URL)
+    assert driver.loaded_with == [(session.LOGIN_URL, {}, [])]
+
+    # Elsewhere: the site's storage is cleared through CDP before it loads
+    driver = RecordingDriver(local={"user": "previous account"})
+    driver.current_url = "about:blank"
+    driver.cdp = []
+    driver.execute_cdp_cmd = lambda cmd, params: driver.cdp.append((cmd, params["origin"]))
+    session.load_clean(driver, session.LOGIN_URL)
+    assert driver.cdp == [("Storage.clearDataForOrigin", "http://localhost:28318")]
+    assert driver.visited == [session.LOGIN_URL]
+
+
+def test_expired_session_is_discarded(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "SESSION_DIR", str(tmp_path))
+    path = session.session_path("john.doe@email.com")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time() - 3600, "cookies": []}, f)
+
+    assert session.load_session("john.doe@email.com", max_age=60) is None
+    assert not os.path.exists(path)
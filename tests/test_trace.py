@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import pytest
+from scraper import trace
+
+
+class FakeDriver:
+    def execute(self, driver_command, params=None):
+        return {"value": driver_command}
+
+
+def test_spans_and_driver_commands_are_traced(tmp_path):
+    driver = trace.instrument_driver(trace.instrument_driver(FakeDriver()))
+    trace.start_trace("test")
+    try:
+        with trace.span("login.attempt", attempt=1):
+            driver.execute("executeScript", {"script": "return 1"})
+            driver.execute("executeScript", {"script": "return 2"})
+        with pytest.raises(ValueError):
+            with trace.span("extract"):
+                driver.execute("findElements")
+                raise ValueError("no layout")
+    finally:
+        path = trace.finish_trace(str(tmp_path / "run.json"))
+
+    with open(path) as f:
+        data = json.load(f)
+
+    phases = [event for event in data["traceEvents"] if event["cat"] == "phase"]
+    assert [event["name"] for event in phases] == ["login.attempt", "extract"]
+    assert phases[0]["args"] == {"attempt": 1}
+    assert phases[1]["args"]["error"] == "ValueError: no layout"
+    assert data["summary"]["webdriver_commands"] == 3
+    assert data["summary"]["commands"]["executeScript"]["count"] == 2
+
+
+def test_spans_are_noops_without_a_trace():
+    driver = trace.instrument_driver(FakeDriver())
+    with trace.span("extract"):
+        assert driver.execute("getTitle") == {"value": "getTitle"}
+    assert trace.get_tracer() is None
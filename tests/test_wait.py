@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+from scraper.wait import wait_for_page_settled, wait_for_login_result
+
+
+class ScriptedDriver:
+    """
+    Fake driver whose readiness probe returns a scripted sequence of states
+    """
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        state = self.states[min(self.calls, len(self.states)) - 1]
+        return dict({"state": "complete", "url": "http://x/login", "mutations": 0, "matched": []}, **state)
+
+
+def test_page_settled_resolves_once_dom_is_quiet():
+    driver = ScriptedDriver([{"quietFor": 0}, {"quietFor": 100}, {"quietFor": 500}])
+
+    started = time.monotonic()
+    assert wait_for_page_settled(driver, timeout=5, quiet_ms=300)
+    assert time.monotonic() - started < 1
+    assert driver.calls == 3
+
+
+def test_page_settled_times_out_instead_of_hanging():
+    driver = ScriptedDriver([{"state": "loading", "quietFor": 1000}])
+
+    assert wait_for_page_settled(driver, timeout=0.3) is False
+
+
+def test_login_result_waits_for_url_change():
+    driver = ScriptedDriver([
+        {"quietFor": 1000, "matched": ["input#email"]},
+        {"quietFor": 1000, "matched": ["input#email"], "url": "http://x/homepage1"},
+    ])
+
+    assert wait_for_login_result(driver, "http://x/login", timeout=5)
+
+
+def test_observer_watches_visibility_attributes():
+    import json
+    import shutil
+    import subprocess
+    import pytest
+    from scraper.wait import OBSERVER_INSTALL_JS
+
+    if not shutil.which("node"):
+        pytest.skip("node is not installed")
+    # Just enough of a browser to run the install script and report the observer options
+    page = """
+    var window = {}, document = {documentElement: {}}, performance = {now: function () { return 0; }};
+    function MutationObserver(callback) {}
+    MutationObserver.prototype.observe = function (target, options) { window.options = options; };
+    """
+    script = page + OBSERVER_INSTALL_JS + "console.log(JSON.stringify(window.options));"
+    result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+
+    options = json.loads(result.stdout)
+    assert options["childList"] and options["subtree"] and options["attributes"]
+    assert set(options["attributeFilter"]) == {"class", "style", "hidden"}